@@ -0,0 +1,129 @@
+"""Measures rotating the API keys of many corpora one request per key versus in batches.
+
+* one_per_request: create_api_key, enable_api_key and delete_api_key called once per
+  corpus, one after another: a new key per corpus is created, then the old keys are
+  disabled and deleted.
+* batched: the same rotation with manage_api_keys.create_api_keys, enable_api_keys and
+  delete_api_keys, packing --batch-size keys per request with --max-workers requests in
+  flight.
+
+The stand-in answers every request after --latency-ms. The output holds the wall
+seconds and the number of requests of each step.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import example_paths
+
+example_paths.add(example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from api_key import create_api_key
+from api_key import delete_api_key
+from api_key import enable_api_key
+from api_key import manage_api_keys
+from utils import vectara_client
+
+import stand_in
+
+_CUSTOMER_ID = 1
+_TOKEN = "token"
+
+
+def _one_per_request(old_key_ids: list[str], corpus_ids: list[int],
+                     client: vectara_client.VectaraClient) -> dict:
+    """Returns the wall seconds of each step, calling the single-key functions."""
+    timings = {}
+    start = time.perf_counter()
+    for corpus_id in corpus_ids:
+        _, ok = create_api_key.create_api_key(_CUSTOMER_ID, corpus_id, _TOKEN,
+                                              client=client)
+        if not ok:
+            raise RuntimeError(f"CreateApiKey failed for corpus {corpus_id}")
+    timings["create_secs"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key_id in old_key_ids:
+        enable_api_key.enable_api_key(_CUSTOMER_ID, key_id, _TOKEN, False, client=client)
+    timings["disable_secs"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key_id in old_key_ids:
+        delete_api_key.delete_api_key(_CUSTOMER_ID, key_id, _TOKEN, client=client)
+    timings["delete_secs"] = time.perf_counter() - start
+    return timings
+
+
+def _batched(old_key_ids: list[str], corpus_ids: list[int], batch_size: int,
+             max_workers: int, client: vectara_client.VectaraClient) -> dict:
+    """Returns the wall seconds of each step, calling the batched functions."""
+    timings = {}
+    keys = [manage_api_keys.NewApiKey(corpus_ids=(corpus_id,)) for corpus_id in corpus_ids]
+    steps = (
+        ("create_secs", lambda: manage_api_keys.create_api_keys(
+            _CUSTOMER_ID, keys, _TOKEN, batch_size, max_workers, client)),
+        ("disable_secs", lambda: manage_api_keys.enable_api_keys(
+            _CUSTOMER_ID, old_key_ids, _TOKEN, False, batch_size, max_workers, client)),
+        ("delete_secs", lambda: manage_api_keys.delete_api_keys(
+            _CUSTOMER_ID, old_key_ids, _TOKEN, batch_size, max_workers, client)),
+    )
+    for name, step in steps:
+        start = time.perf_counter()
+        results = step()
+        timings[name] = time.perf_counter() - start
+        if not all(result.ok for result in results):
+            raise RuntimeError(f"{name[:-5]} failed: {results}")
+    return timings
+
+
+def main():
+    """Rotates the keys of the corpora each way and prints the timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpora", type=int, default=500,
+                        help="Number of corpora whose key is rotated.")
+    parser.add_argument("--batch-size", type=int,
+                        default=manage_api_keys.DEFAULT_BATCH_SIZE,
+                        help="Maximum number of keys per batched request.")
+    parser.add_argument("--max-workers", type=int, default=4,
+                        help="Maximum number of batched requests in flight.")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Simulated server latency per request.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    corpus_ids = list(range(1, args.corpora + 1))
+    faults = stand_in.Faults(latency_secs=args.latency_ms / 1000)
+    address, server = stand_in.start_rest_process(faults=faults)
+    client = vectara_client.VectaraClient(address, pool_maxsize=args.max_workers)
+    results = {"corpora": args.corpora}
+    try:
+        for name in ("one_per_request", "batched"):
+            # The keys rotated out are created in batches before each run.
+            old_keys = manage_api_keys.create_api_keys(
+                _CUSTOMER_ID,
+                [manage_api_keys.NewApiKey(corpus_ids=(corpus_id,))
+                 for corpus_id in corpus_ids],
+                _TOKEN, client=client)
+            old_key_ids = [result.key_id for result in old_keys]
+            if name == "one_per_request":
+                timings = _one_per_request(old_key_ids, corpus_ids, client)
+                requests_per_step = args.corpora
+            else:
+                timings = _batched(old_key_ids, corpus_ids, args.batch_size,
+                                   args.max_workers, client)
+                requests_per_step = -(-args.corpora // args.batch_size)
+            results[name] = {key: round(value, 3) for key, value in timings.items()}
+            results[name]["requests_per_step"] = requests_per_step
+    finally:
+        client.close()
+        server.terminate()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Measures the memory held by the records of large admin listings.
+
+Each listing parses a JSON response holding --records users, API keys or corpora, the
+way list_users, list_api_key and read_corpora do, and keeps the records after the
+message is dropped.
+
+* before: frozen dataclasses with a __dict__ per instance, repeated strings such as
+  statuses and key types copied into every record.
+* after: the same records declaring __slots__, with repeated strings interned.
+
+The output holds the bytes per record left allocated by each listing.
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import tracemalloc
+
+import example_paths
+
+example_paths.add(example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order,protected-access
+from api_key import list_api_key
+from corpus import data_objects
+from corpus import read_corpus
+from user import list_users
+from utils import slots
+
+
+def _users_message(count: int) -> str:
+    """Returns a list-users response holding count users."""
+    return json.dumps({"user": [
+        {"id": user_id, "handle": f"user{user_id}", "email": f"user{user_id}@example.com",
+         "type": "USER_TYPE__USER", "comment": "", "userStatus": "ACTIVE"}
+        for user_id in range(count)]})
+
+
+def _api_keys_message(count: int) -> str:
+    """Returns a list-api-keys response holding count keys, each serving one of 10 corpora."""
+    return json.dumps({"keyData": [
+        {"apiKey": {"id": f"zqt_{key_id:040d}", "description": "",
+                    "keyType": "API_KEY_TYPE__SERVING", "enabled": True},
+         "corpus": [{"id": key_id % 10, "name": f"corpus{key_id % 10}"}]}
+        for key_id in range(count)]})
+
+
+def _corpora_message(count: int) -> str:
+    """Returns a read-corpus response holding count corpora, each with one API key."""
+    return json.dumps({"corpora": [
+        {"corpus": {"id": corpus_id, "name": f"corpus{corpus_id}", "description": "",
+                    "dtProvision": 1704067200, "enabled": True},
+         "corpusStatus": "OK", "size": {"epochSecs": 1704067200, "size": 1 << 20},
+         "sizeStatus": "OK",
+         "apiKey": [{"id": f"zqt_{corpus_id:040d}", "description": "",
+                     "keyType": "API_KEY_TYPE__SERVING", "enabled": True}],
+         "apiKeyStatus": "OK"}
+        for corpus_id in range(count)]})
+
+
+# (module, names of its record classes, response builder, parser) of every listing.
+_LISTINGS = {
+    "users": (list_users, ["UserData"], _users_message,
+              list_users._users_from_message),
+    "api_keys": (list_api_key, ["KeyData", "CorpusData"], _api_keys_message,
+                 list_api_key._keys_from_message),
+    "corpora": (data_objects, ["Corpus", "CorpusSize", "ApiKey", "CorpusInfo"],
+                _corpora_message,
+                lambda message: [read_corpus._corpus_info_from_message(corpus_info)
+                                 for corpus_info in message["corpora"]]),
+}
+
+
+def _without_slots(cls: type) -> type:
+    """Returns a frozen dataclass with the fields of cls, without __slots__."""
+    return dataclasses.make_dataclass(
+        cls.__name__, [(field.name, field.type) for field in dataclasses.fields(cls)],
+        frozen=True)
+
+
+def _retained_bytes(text: str, parse) -> int:
+    """Returns the bytes left allocated by parsing text, once the message is dropped."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        message = json.loads(text)
+        records = parse(message)
+        del message
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del records
+    return retained
+
+
+def main():
+    """Measures every listing before and after and prints the bytes per record as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000,
+                        help="Number of records per listing.")
+    args = parser.parse_args()
+
+    results = {"records": args.records}
+    intern = slots.intern
+    for name, (module, class_names, build, parse) in _LISTINGS.items():
+        text = build(args.records)
+        classes = {class_name: getattr(module, class_name) for class_name in class_names}
+        try:
+            for class_name, cls in classes.items():
+                setattr(module, class_name, _without_slots(cls))
+            slots.intern = lambda value: value
+            before = _retained_bytes(text, parse)
+        finally:
+            for class_name, cls in classes.items():
+                setattr(module, class_name, cls)
+            slots.intern = intern
+        after = _retained_bytes(text, parse)
+        results[name] = {
+            "before_bytes_per_record": round(before / args.records),
+            "after_bytes_per_record": round(after / args.records),
+            "saved_percent": round(100 * (1 - after / before), 1),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
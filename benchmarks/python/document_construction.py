@@ -0,0 +1,137 @@
+"""Measures the cost of building IndexDocumentRequests, per construction strategy.
+
+* merge_from: builds a Document, then copies it into a request with MergeFrom, the way
+  grpc_basic_operations.index() used to.
+* constructor: builds a Document, then passes it as IndexDocumentRequest(document=...),
+  which copies it as well.
+* in_place: grpc_document_builder.DocumentBuilder writes the sections of a generator
+  straight into the request.
+
+For each number of sections the output holds:
+
+* us_per_doc: the median time to build one request.
+* request_bytes: the serialized size of the request.
+* document_copy_bytes: the serialized size of the intermediate Document handed to
+  MergeFrom or the constructor, 0 for in_place. It is the size of what is copied, not a
+  measured allocation.
+* traced_peak_bytes_per_doc: the peak of the memory allocated while building one
+  request, measured with tracemalloc. tracemalloc only sees allocations made through
+  the Python allocator: it includes the buffer the upb protobuf backend serializes a
+  message to when copying it, but not the C arenas holding the messages.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import example_paths
+
+example_paths.add(example_paths.GRPC_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import grpc_document_builder
+import indexing_pb2
+import services_pb2
+
+
+def _texts(num_sections: int, section_bytes: int):
+    """Yields the section texts of a document."""
+    for i in range(num_sections):
+        prefix = f"Section {i}. "
+        yield prefix + "x" * max(section_bytes - len(prefix), 0)
+
+
+def _document(num_sections: int, section_bytes: int) -> indexing_pb2.Document:
+    """Returns a standalone document, built the way the examples used to."""
+    document = indexing_pb2.Document(document_id="doc-1", title="A title",
+                                     metadata_json='{"author": "Someone"}')
+    for text in _texts(num_sections, section_bytes):
+        section = indexing_pb2.Section()
+        section.text = text
+        document.section.extend([section])
+    return document
+
+
+def _merge_from(num_sections: int, section_bytes: int):
+    """Returns the request and the Document copied into it, if any."""
+    document = _document(num_sections, section_bytes)
+    request = services_pb2.IndexDocumentRequest(customer_id=1, corpus_id=1)
+    request.document.MergeFrom(document)
+    return request, document
+
+
+def _constructor(num_sections: int, section_bytes: int):
+    """Returns the request and the Document copied into it, if any."""
+    document = _document(num_sections, section_bytes)
+    request = services_pb2.IndexDocumentRequest(customer_id=1, corpus_id=1,
+                                                document=document)
+    return request, document
+
+
+def _in_place(num_sections: int, section_bytes: int):
+    """Returns the request and the Document copied into it, if any."""
+    builder = grpc_document_builder.DocumentBuilder(1, 1, "doc-1", title="A title",
+                                                    metadata='{"author": "Someone"}')
+    builder.add_sections(_texts(num_sections, section_bytes))
+    return builder.request, None
+
+
+def _traced_peak_bytes(strategy, num_sections: int, section_bytes: int) -> int:
+    """Returns the tracemalloc peak of building one request with strategy."""
+    tracemalloc.start()
+    try:
+        strategy(num_sections, section_bytes)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+STRATEGIES = {
+    "merge_from": _merge_from,
+    "constructor": _constructor,
+    "in_place": _in_place,
+}
+
+
+def main():
+    """Runs every strategy and prints its statistics as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[1, 100, 1000, 5000],
+                        help="Numbers of sections per document.")
+    parser.add_argument("--section-bytes", type=int, default=1000,
+                        help="Size of the text of each section.")
+    parser.add_argument("--iterations", type=int, default=50,
+                        help="Requests built per strategy and number of sections.")
+    args = parser.parse_args()
+
+    results = {}
+    for num_sections in args.sections:
+        results[num_sections] = {}
+        for name, strategy in STRATEGIES.items():
+            # Warms up, and checks that every strategy builds the same request.
+            request, copied = strategy(num_sections, args.section_bytes)
+            copy_bytes = copied.ByteSize() if copied is not None else 0
+            expected, _ = _in_place(num_sections, args.section_bytes)
+            if request != expected:
+                raise RuntimeError(f"{name} built a different request.")
+
+            timings = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                strategy(num_sections, args.section_bytes)
+                timings.append(time.perf_counter() - start)
+            results[num_sections][name] = {
+                "us_per_doc": round(statistics.median(timings) * 1e6, 1),
+                "request_bytes": request.ByteSize(),
+                "document_copy_bytes": copy_bytes,
+                "traced_peak_bytes_per_doc": _traced_peak_bytes(
+                    strategy, num_sections, args.section_bytes),
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
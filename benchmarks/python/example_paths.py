@@ -0,0 +1,22 @@
+"""Makes the Python examples importable from the benchmark scripts.
+
+The examples are plain scripts that import their siblings by module name, so their
+directories are added to sys.path instead of being installed as packages.
+"""
+
+import os
+import sys
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+GRPC_EXAMPLES = os.path.join(_ROOT, "language-examples", "python", "vectara-grpc")
+REST_EXAMPLES = os.path.join(_ROOT, "language-examples", "python", "vectara-rest")
+FEATURE_EXAMPLES = os.path.join(_ROOT, "feature-examples", "python")
+COMMON = os.path.join(_ROOT, "language-examples", "python", "vectara-common")
+
+
+def add(*paths: str):
+    """Prepends the given example directories to sys.path."""
+    for path in reversed(paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
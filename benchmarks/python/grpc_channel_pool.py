@@ -0,0 +1,86 @@
+"""Measures the connections opened while indexing over gRPC, per channel strategy.
+
+A local grpc_stand_in.GrpcStandIn records the peer address of every call; each distinct
+peer is one TCP connection and therefore one TLS + HTTP/2 handshake against the real
+service.
+
+The "per-call" strategy opens a channel for every document, the way the examples used to.
+The "shared" strategy runs grpc_basic_operations.index(), which reuses grpc_channels.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import example_paths
+
+example_paths.add(example_paths.GRPC_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import grpc
+
+import grpc_basic_operations
+import grpc_channels
+import grpc_stand_in
+import services_pb2_grpc
+
+
+def _index_per_call(address: str, num_docs: int, credentials):
+    """Indexes num_docs documents opening a fresh channel for each one."""
+    packed_customer_id = b"\x00" * 8
+    for request in _requests(num_docs):
+        with grpc.secure_channel(address, credentials) as channel:
+            stub = services_pb2_grpc.IndexServiceStub(channel)
+            stub.Index(request,
+                       credentials=grpc.access_token_call_credentials("token"),
+                       metadata=[("customer-id-bin", packed_customer_id)])
+
+
+def _index_shared(address: str, num_docs: int, credentials):
+    """Indexes num_docs documents through the shared channel used by the examples."""
+    grpc_channels.get_channel(address, credentials)
+    docs_per_call = len(grpc_basic_operations.INDEXING_DATA)
+    for _ in range(0, num_docs, docs_per_call):
+        _, ok = grpc_basic_operations.index(0, 1, address, "token")
+        if not ok:
+            raise RuntimeError("Indexing against the local server failed.")
+    grpc_channels.close_all()
+
+
+def _requests(num_docs: int):
+    """Yields num_docs example index requests."""
+    examples = list(grpc_basic_operations.generate_index_requests(0, 1))
+    for i in range(num_docs):
+        yield examples[i % len(examples)]
+
+
+def main():
+    """Runs both strategies and prints handshakes per 1000 documents as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-docs", type=int, default=1000,
+                        help="Number of documents indexed per strategy.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    credentials = grpc_stand_in.channel_credentials()
+    results = {}
+    for name, strategy in (("per-call", _index_per_call), ("shared", _index_shared)):
+        with grpc_stand_in.GrpcStandIn(max_workers=8) as server:
+            start = time.perf_counter()
+            strategy(server.address, args.num_docs, credentials)
+            elapsed = time.perf_counter() - start
+            calls = server.state.calls["Index"]
+            results[name] = {
+                "documents": calls,
+                "handshakes": len(server.state.peers),
+                "handshakes_per_1000_docs": 1000 * len(server.state.peers) / calls,
+                "seconds": round(elapsed, 3),
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
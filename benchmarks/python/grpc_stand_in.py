@@ -0,0 +1,211 @@
+"""Local stand-in for the Vectara gRPC services, with latency and error injection.
+
+Serves IndexService, QueryService and AdminService over local TCP credentials, keeping
+corpora and documents in memory like stand_in.RestStandIn.
+
+Usage:
+    with grpc_stand_in.GrpcStandIn() as server:
+        grpc_channels.get_channel(server.address, grpc_stand_in.channel_credentials())
+        grpc_basic_operations.query(1, 1, server.address, "token", "q")
+"""
+
+import multiprocessing
+from concurrent import futures
+from typing import Optional
+
+import example_paths
+
+example_paths.add(example_paths.GRPC_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import grpc
+
+import admin_pb2
+import common_pb2
+import services_pb2
+import services_pb2_grpc
+import serving_pb2
+import status_pb2
+import stand_in
+
+
+def channel_credentials() -> grpc.ChannelCredentials:
+    """Returns the credentials of a channel to a GrpcStandIn.
+
+    Register a channel with them through grpc_channels.get_channel before calling the
+    examples, which then reuse it instead of opening a TLS channel.
+    """
+    return grpc.local_channel_credentials(grpc.LocalConnectionType.LOCAL_TCP)
+
+
+class GrpcStandIn:
+    """Stand-in for the gRPC IndexService, QueryService and AdminService."""
+
+    def __init__(self,
+                 faults: stand_in.Faults = stand_in.NO_FAULTS,
+                 method_faults: Optional[dict] = None,
+                 max_workers: int = 16,
+                 seed: Optional[int] = None,
+                 port: int = 0):
+        """Creates the stand-in. Call start() or use it as a context manager.
+
+        Args:
+            faults: Faults injected into every call.
+            method_faults: Faults overriding `faults` for some methods, e.g., "Query".
+            max_workers: Number of threads serving calls.
+            seed: Seed of the random latency jitter and errors.
+            port: Port to listen on, 0 for any free port.
+        """
+        self.state = stand_in.State()
+        self._injector = stand_in.FaultInjector(faults, method_faults, seed)
+        self._max_workers = max_workers
+        self._port = port
+        self._server = None
+        self.address = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self) -> str:
+        """Starts serving and returns the address, e.g., localhost:50051."""
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=self._max_workers))
+        services_pb2_grpc.add_IndexServiceServicer_to_server(
+            _IndexServicer(self.state, self._injector), self._server)
+        services_pb2_grpc.add_QueryServiceServicer_to_server(
+            _QueryServicer(self.state, self._injector), self._server)
+        services_pb2_grpc.add_AdminServiceServicer_to_server(
+            _AdminServicer(self.state, self._injector), self._server)
+        port = self._server.add_secure_port(
+            f"localhost:{self._port}",
+            grpc.local_server_credentials(grpc.LocalConnectionType.LOCAL_TCP))
+        self._server.start()
+        self.address = f"localhost:{port}"
+        return self.address
+
+    def wait(self):
+        """Blocks until the server stops."""
+        self._server.wait_for_termination()
+
+    def stop(self):
+        """Stops serving, cancelling calls in progress."""
+        if self._server is not None:
+            self._server.stop(None)
+            self._server = None
+
+
+def _serve(kwargs: dict, addresses):
+    """Runs a GrpcStandIn forever, reporting its address through the queue."""
+    server = GrpcStandIn(**kwargs)
+    addresses.put(server.start())
+    server.wait()
+
+
+def start_grpc_process(**kwargs) -> tuple[str, multiprocessing.Process]:
+    """Starts a GrpcStandIn in a separate process.
+
+    The process is spawned rather than forked, since gRPC does not support forking a
+    process that has already used it.
+
+    Args:
+        **kwargs: Arguments of GrpcStandIn.
+
+    Returns:
+        The address of the stand-in and its process, to be terminated by the caller.
+    """
+    context = multiprocessing.get_context("spawn")
+    addresses = context.Queue()
+    process = context.Process(target=_serve, args=(kwargs, addresses), daemon=True)
+    process.start()
+    return addresses.get(), process
+
+
+def _begin(state: stand_in.State, injector: stand_in.FaultInjector, method: str, context):
+    """Records a gRPC call and aborts it if an error is injected."""
+    state.record(method, context.peer())
+    faults = injector.inject(method)
+    if faults is not None:
+        if faults.retry_after_secs is not None:
+            context.set_trailing_metadata(
+                (("grpc-retry-pushback-ms", str(int(faults.retry_after_secs * 1000))),))
+        context.abort(faults.grpc_code, "Injected error")
+
+
+def _status(code_name: str = "OK") -> status_pb2.Status:
+    return status_pb2.Status(code=status_pb2.StatusCode.Value(code_name))
+
+
+class _IndexServicer(services_pb2_grpc.IndexServiceServicer):
+    """IndexService backed by the shared state."""
+
+    def __init__(self, state: stand_in.State, injector: stand_in.FaultInjector):
+        self._state = state
+        self._injector = injector
+
+    def Index(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "Index", context)
+        created = self._state.index(request.corpus_id, request.document.document_id)
+        return services_pb2.IndexDocumentResponse(
+            status=_status("OK" if created else "ALREADY_EXISTS"))
+
+    def Delete(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "Delete", context)
+        with self._state.lock:
+            corpus = self._state.corpora.get(request.corpus_id)
+            if corpus:
+                corpus["documents"].discard(request.document_id)
+        return common_pb2.DeleteDocumentResponse()
+
+
+class _QueryServicer(services_pb2_grpc.QueryServiceServicer):
+    """QueryService answering every query with synthetic results."""
+
+    def __init__(self, state: stand_in.State, injector: stand_in.FaultInjector):
+        self._state = state
+        self._injector = injector
+
+    def Query(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "Query", context)
+        response = serving_pb2.BatchQueryResponse()
+        for query in request.query:
+            response_set = response.response_set.add()
+            positions = stand_in.query_positions(query.start, query.num_results or 10)
+            for i, position in enumerate(positions):
+                result = response_set.response.add(
+                    text=f"Result {position} for {query.query}.",
+                    score=1.0 / (position + 1),
+                    document_index=i)
+                result.metadata.add(name="lang", value="en")
+                document = response_set.document.add(id=f"doc-{position}")
+                document.metadata.add(name="title", value=f"Doc {position}")
+        return response
+
+
+class _AdminServicer(services_pb2_grpc.AdminServiceServicer):
+    """AdminService creating, deleting and resetting corpora in the shared state."""
+
+    def __init__(self, state: stand_in.State, injector: stand_in.FaultInjector):
+        self._state = state
+        self._injector = injector
+
+    def CreateCorpus(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "CreateCorpus", context)
+        corpus_id = self._state.add_corpus(request.corpus.name, request.corpus.description)
+        return admin_pb2.CreateCorpusResponse(corpus_id=corpus_id, status=_status())
+
+    def DeleteCorpus(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "DeleteCorpus", context)
+        with self._state.lock:
+            found = self._state.corpora.pop(request.corpus_id, None)
+        return admin_pb2.DeleteCorpusResponse(status=_status("OK" if found else "NOT_FOUND"))
+
+    def ResetCorpus(self, request, context):  # pylint: disable=invalid-name
+        _begin(self._state, self._injector, "ResetCorpus", context)
+        with self._state.lock:
+            corpus = self._state.corpora.get(request.corpus_id)
+            if corpus:
+                corpus["documents"].clear()
+        return admin_pb2.ResetCorpusResponse(status=_status("OK" if corpus else "NOT_FOUND"))
@@ -0,0 +1,156 @@
+"""Measures the per-call cost of the metrics and tracing hooks of the examples.
+
+The same operations run against local stand-ins with:
+
+* disabled: rest_metrics, grpc_metrics and utils.metrics not enabled, the default.
+* metrics: every call recorded in a registry.
+* tracing: metrics plus an OpenTelemetry span per call, only if opentelemetry-api is
+  installed. Spans go to whatever tracer provider is configured, a no-op one by default.
+
+The stand-ins answer without delay so that the hooks are not hidden by server latency,
+and the modes take turns in several rounds so that drift of the machine affects them all
+alike. The output holds the p50 and p99 microseconds per call and the change of p50
+against disabled, plus hooks_us: the microseconds spent recording one call in-process,
+which network noise cannot hide. --prometheus prints the recorded metrics instead.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+import example_paths
+
+example_paths.add(example_paths.GRPC_EXAMPLES, example_paths.REST_EXAMPLES,
+                  example_paths.FEATURE_EXAMPLES, example_paths.COMMON)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from user import list_users
+from utils import metrics
+from utils import vectara_client
+
+import grpc_basic_operations
+import grpc_channels
+import grpc_metrics
+import grpc_stand_in
+import rest_metrics
+import rest_query
+import stand_in
+import vectara_metrics
+
+_CUSTOMER_ID = 1
+_CORPUS_ID = 1
+_TOKEN = "token"
+
+_METRICS_MODULES = (rest_metrics, grpc_metrics, metrics)
+
+
+def _operations(rest_address: str, grpc_address: str,
+                client: vectara_client.VectaraClient) -> dict:
+    """Returns an operation per kind of instrumented call."""
+    return {
+        "rest.query": lambda: rest_query.query(_CUSTOMER_ID, _CORPUS_ID, rest_address,
+                                               _TOKEN, "What is it?"),
+        "grpc.query": lambda: grpc_basic_operations.query(_CUSTOMER_ID, _CORPUS_ID,
+                                                          grpc_address, _TOKEN,
+                                                          "What is it?"),
+        "user.list_users": lambda: list_users.list_users(_CUSTOMER_ID, _TOKEN,
+                                                         num_results=10, client=client),
+    }
+
+
+def _time(operation, iterations: int, warmup: int) -> list:
+    """Returns the seconds taken by each call of operation."""
+    for _ in range(warmup):
+        operation()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _hooks_us(mode: str, registries: dict, iterations: int) -> float:
+    """Returns the microseconds rest_metrics spends starting and finishing one call."""
+    _enable(mode, registries)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call = rest_metrics.start("query")
+        if call is not None:
+            call.finish("200", 1000, 10000)
+    return round((time.perf_counter() - start) * 1e6 / iterations, 3)
+
+
+def _enable(mode: str, registries: dict):
+    """Enables the hooks of every example tree for a mode, recording in registries."""
+    for module in _METRICS_MODULES:
+        if mode == "disabled":
+            module.disable()
+        else:
+            module.enable(registries[module], tracing=mode == "tracing")
+
+
+def main():
+    """Runs every operation in every mode and prints the statistics as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Measured calls per operation and mode.")
+    parser.add_argument("--warmup", type=int, default=200,
+                        help="Unmeasured calls per operation and mode.")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="Turns taken by each mode, splitting the iterations.")
+    parser.add_argument("--prometheus", action="store_true",
+                        help="Print the recorded metrics instead of the statistics.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    modes = ["disabled", "metrics"] + (["tracing"] if vectara_metrics.trace else [])
+    rest_address, rest_server = stand_in.start_rest_process(users=10)
+    grpc_address, grpc_server = grpc_stand_in.start_grpc_process()
+    grpc_channels.get_channel(grpc_address, grpc_stand_in.channel_credentials())
+    client = vectara_client.VectaraClient(rest_address)
+
+    registries = {module: module.Registry() for module in _METRICS_MODULES}
+    latencies = {}
+    try:
+        operations = _operations(rest_address, grpc_address, client)
+        for _ in range(args.rounds):
+            for mode in modes:
+                _enable(mode, registries)
+                for name, operation in operations.items():
+                    latencies.setdefault((name, mode), []).extend(
+                        _time(operation, args.iterations // args.rounds,
+                              args.warmup // args.rounds))
+    finally:
+        _enable("disabled", registries)
+        grpc_channels.close_all()
+        client.close()
+        rest_server.terminate()
+        grpc_server.terminate()
+
+    if args.prometheus:
+        print("".join(registry.prometheus_text() for registry in registries.values()))
+        return
+
+    results = {"hooks_us": {mode: _hooks_us(mode, registries, args.iterations * 10)
+                            for mode in modes}}
+    _enable("disabled", registries)
+    for (name, mode), values in latencies.items():
+        cut_points = statistics.quantiles(values, n=100, method="inclusive")
+        results.setdefault(name, {})[mode] = {
+            "p50_us": round(cut_points[49] * 1e6, 1),
+            "p99_us": round(cut_points[98] * 1e6, 1),
+        }
+    for name in operations:
+        disabled = results[name]["disabled"]["p50_us"]
+        for mode in modes[1:]:
+            results[name][mode]["p50_change_us"] = round(
+                results[name][mode]["p50_us"] - disabled, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Measures latency, throughput, CPU time and allocations of each example operation.
+
+The REST and gRPC language examples and the feature examples (through a
+utils.vectara_client.VectaraClient) are covered.
+
+Every operation runs sequentially against local stand-ins (see stand_in.py and
+grpc_stand_in.py) started in separate processes, so the CPU time and allocations
+reported belong to the client alone:
+
+* latency_ms: p50, p95, p99, mean and max wall time of one call.
+* ops_per_sec: calls completed per second of wall time.
+* cpu_ms_per_op: CPU time of this process per call, including library threads.
+* alloc_peak_kib_per_op: mean peak of Python memory allocated during one call, measured
+  in a separate pass with tracemalloc since tracing slows every allocation.
+
+The JSON output is stable between runs so that two versions can be diffed, and
+--baseline adds the change against an earlier output.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import example_paths
+
+example_paths.add(example_paths.GRPC_EXAMPLES, example_paths.REST_EXAMPLES,
+                  example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from api_key import list_api_key
+from corpus import compute_corpus_size
+from corpus import read_corpus
+from corpus import read_usage_metrics
+from user import list_users
+from utils import vectara_client
+
+import grpc_basic_operations
+import grpc_channels
+import grpc_stand_in
+import rest_create_corpus
+import rest_delete_document
+import rest_index_document
+import rest_query
+import rest_upload_file
+import stand_in
+
+_CUSTOMER_ID = 1
+_TOKEN = "token"
+
+Operation = Callable[[], None]
+
+
+def _expect_ok(name: str, result):
+    """Raises if an example returned (error, False)."""
+    error, ok = result
+    if not ok:
+        raise RuntimeError(f"{name} against the local stand-in failed: {error}")
+
+
+def _rest_operations(address: str) -> dict[str, Operation]:
+    """Returns the REST example operations, run against the stand-in at address."""
+    message, ok = rest_create_corpus.create_corpus(_CUSTOMER_ID, address, _TOKEN)
+    _expect_ok("rest.create_corpus", (message, ok))
+    corpus_id = message["corpusId"]
+
+    return {
+        "rest.create_corpus": lambda: _expect_ok(
+            "rest.create_corpus",
+            rest_create_corpus.create_corpus(_CUSTOMER_ID, address, _TOKEN)),
+        "rest.delete_document": lambda: _expect_ok(
+            "rest.delete_document",
+            rest_delete_document.delete_document(_CUSTOMER_ID, corpus_id, address, _TOKEN,
+                                                 "doc-id-2")),
+        "rest.index_document": lambda: _expect_ok(
+            "rest.index_document",
+            rest_index_document.index_document(_CUSTOMER_ID, corpus_id, address, _TOKEN)),
+        "rest.query": lambda: _expect_ok(
+            "rest.query",
+            rest_query.query(_CUSTOMER_ID, corpus_id, address, _TOKEN, "What is it?")),
+        "rest.upload_file": lambda: _expect_ok(
+            "rest.upload_file",
+            rest_upload_file.upload_file(_CUSTOMER_ID, corpus_id, address, _TOKEN)),
+    }
+
+
+def _feature_operations(client: vectara_client.VectaraClient) -> dict[str, Operation]:
+    """Returns the feature example operations, run against the stand-in of the client."""
+    message, ok = rest_create_corpus.create_corpus(_CUSTOMER_ID, client.base_url, _TOKEN)
+    _expect_ok("rest.create_corpus", (message, ok))
+    corpus_id = message["corpusId"]
+
+    # The feature examples raise an exception on failure.
+    return {
+        "api_key.list_api_keys": lambda: list_api_key.list_api_keys(
+            _CUSTOMER_ID, _TOKEN, num_results=100, client=client),
+        "corpus.compute_corpus_size": lambda: compute_corpus_size.compute_corpus_size(
+            _CUSTOMER_ID, corpus_id, _TOKEN, client=client),
+        "corpus.read_corpus": lambda: read_corpus.read_corpus(
+            _CUSTOMER_ID, corpus_id, _TOKEN, client=client),
+        "corpus.read_usage_metrics": lambda: read_usage_metrics.read_usage_metrics(
+            _CUSTOMER_ID, corpus_id, _TOKEN, client=client),
+        "user.list_users": lambda: list_users.list_users(
+            _CUSTOMER_ID, _TOKEN, num_results=100, client=client),
+    }
+
+
+def _grpc_operations(address: str) -> dict[str, Operation]:
+    """Returns the gRPC example operations, run against the stand-in at address."""
+    grpc_channels.get_channel(address, grpc_stand_in.channel_credentials())
+    corpus_id, ok = grpc_basic_operations.create_corpus(_CUSTOMER_ID, address, _TOKEN)
+    _expect_ok("grpc.create_corpus", (corpus_id, ok))
+
+    return {
+        "grpc.create_corpus": lambda: _expect_ok(
+            "grpc.create_corpus",
+            grpc_basic_operations.create_corpus(_CUSTOMER_ID, address, _TOKEN)),
+        # Indexes every document of grpc_basic_operations.INDEXING_DATA.
+        "grpc.index": lambda: _expect_ok(
+            "grpc.index",
+            grpc_basic_operations.index(_CUSTOMER_ID, corpus_id, address, _TOKEN)),
+        "grpc.query": lambda: _expect_ok(
+            "grpc.query",
+            grpc_basic_operations.query(_CUSTOMER_ID, corpus_id, address, _TOKEN,
+                                        "What is it?")),
+    }
+
+
+def measure(operation: Operation, iterations: int, warmup: int,
+            alloc_iterations: int) -> dict:
+    """Runs an operation sequentially and returns its statistics."""
+    for _ in range(warmup):
+        operation()
+
+    latencies = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    wall_secs = time.perf_counter() - wall_start
+    cpu_secs = time.process_time() - cpu_start
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / wall_secs, 1),
+        "latency_ms": {
+            "p50": round(cut_points[49] * 1000, 3),
+            "p95": round(cut_points[94] * 1000, 3),
+            "p99": round(cut_points[98] * 1000, 3),
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "cpu_ms_per_op": round(cpu_secs * 1000 / iterations, 3),
+        "alloc_peak_kib_per_op": round(statistics.fmean(peaks) / 1024, 2) if peaks else None,
+    }
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Returns the change in percent of p50, p99 and ops/sec against a baseline output."""
+    def change(new, old):
+        return round(100 * (new - old) / old, 1) if old else None
+
+    comparison = {}
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        comparison[name] = {
+            "p50_change_pct": change(result["latency_ms"]["p50"], old["latency_ms"]["p50"]),
+            "p99_change_pct": change(result["latency_ms"]["p99"], old["latency_ms"]["p99"]),
+            "ops_per_sec_change_pct": change(result["ops_per_sec"], old["ops_per_sec"]),
+        }
+    return comparison
+
+
+def main():
+    """Runs the selected operations and prints their statistics as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500,
+                        help="Measured calls per operation.")
+    parser.add_argument("--warmup", type=int, default=50,
+                        help="Unmeasured calls per operation before measuring.")
+    parser.add_argument("--alloc-iterations", type=int, default=50,
+                        help="Calls per operation traced for allocations.")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Simulated server latency per call.")
+    parser.add_argument("--operations", nargs="*", default=[],
+                        help="Only run operations starting with one of these prefixes, "
+                             "e.g., rest. or grpc.query.")
+    parser.add_argument("--baseline", help="Earlier JSON output to compare against.")
+    parser.add_argument("--output", help="File to write the JSON output to.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    faults = stand_in.Faults(latency_secs=args.latency_ms / 1000)
+    rest_address, rest_server = stand_in.start_rest_process(faults=faults, users=100,
+                                                            api_keys=100)
+    grpc_address, grpc_server = grpc_stand_in.start_grpc_process(faults=faults)
+
+    client = vectara_client.VectaraClient(rest_address)
+    results = {}
+    try:
+        operations = {**_rest_operations(rest_address),
+                      **_feature_operations(client),
+                      **_grpc_operations(grpc_address)}
+        for name in sorted(operations):
+            if args.operations and not name.startswith(tuple(args.operations)):
+                continue
+            results[name] = measure(operations[name], args.iterations, args.warmup,
+                                    args.alloc_iterations)
+    finally:
+        grpc_channels.close_all()
+        client.close()
+        rest_server.terminate()
+        grpc_server.terminate()
+
+    output = {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "alloc_iterations": args.alloc_iterations,
+            "latency_ms": args.latency_ms,
+        },
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            output["comparison"] = compare(results, json.load(baseline_file))
+
+    text = json.dumps(output, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(text + "\n")
+    print(text, file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Measures the CPU cost of encoding REST request bodies, per encoder.
+
+* baseline: json.dumps with the default separators, the way the examples used to.
+* json and orjson: rest_json.dumps with each encoder (orjson only if it is installed).
+* orjson+template / json+template: query requests encoded by rest_query with
+  rest_json.QueryTemplate, which only encodes the query text per request.
+
+Index requests carry a metadata_json field and a number of sections, like a typical
+ingested document. The output holds the median microseconds and the bytes per request.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import example_paths
+
+example_paths.add(example_paths.REST_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import rest_json
+import rest_query
+
+
+def _metadata(num_fields: int) -> dict:
+    """Returns the metadata of a document."""
+    return {f"field-{i}": f"Value number {i} of the document" for i in range(num_fields)}
+
+
+def _index_request(metadata_json: str, num_sections: int, section_bytes: int) -> dict:
+    """Returns an index request, see rest_index_document._get_index_request_json."""
+    return {
+        "customer_id": 1,
+        "corpus_id": 1,
+        "document": {
+            "document_id": "doc-1",
+            "title": "A title",
+            "metadata_json": metadata_json,
+            "section": [{"text": f"Section {i}. " + "x" * section_bytes}
+                        for i in range(num_sections)],
+        },
+    }
+
+
+def _query_request(query_value: str) -> dict:
+    """Returns a query request, see rest_query._get_query_request."""
+    return {
+        "query": [{
+            "query": query_value,
+            "num_results": 10,
+            "corpus_key": [{"customer_id": 1, "corpus_id": 1}],
+        }],
+    }
+
+
+def _time(function, iterations: int) -> float:
+    """Returns the median microseconds of a call."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1e6, 2)
+
+
+def main():
+    """Runs every encoder and prints its statistics as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metadata-fields", type=int, default=20,
+                        help="Number of metadata fields of each document.")
+    parser.add_argument("--sections", type=int, default=10,
+                        help="Number of sections of each document.")
+    parser.add_argument("--section-bytes", type=int, default=1000,
+                        help="Size of the text of each section.")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Requests encoded per encoder.")
+    args = parser.parse_args()
+
+    metadata = _metadata(args.metadata_fields)
+    query_value = "What is the answer to the ultimate question of life?"
+
+    def baseline_index():
+        return json.dumps(_index_request(json.dumps(metadata), args.sections,
+                                         args.section_bytes)).encode()
+
+    def fast_index():
+        return rest_json.dumps(_index_request(rest_json.metadata_json(metadata),
+                                              args.sections, args.section_bytes))
+
+    def baseline_query():
+        return json.dumps(_query_request(query_value)).encode()
+
+    def fast_query():
+        return rest_json.dumps(_query_request(query_value))
+
+    def template_query():
+        # pylint: disable=protected-access
+        return rest_query._get_query_json(1, 1, query_value)
+
+    results = {
+        "baseline": {
+            "index_us": _time(baseline_index, args.iterations),
+            "index_bytes": len(baseline_index()),
+            "query_us": _time(baseline_query, args.iterations),
+            "query_bytes": len(baseline_query()),
+        },
+    }
+    encoders = [rest_json.JSON] + ([rest_json.ORJSON] if rest_json.orjson else [])
+    default = rest_json.encoder()
+    try:
+        for name in encoders:
+            rest_json.use(name)
+            results[name] = {
+                "index_us": _time(fast_index, args.iterations),
+                "index_bytes": len(fast_index()),
+                "query_us": _time(fast_query, args.iterations),
+                "query_bytes": len(fast_query()),
+            }
+            rest_json.QUERY_TEMPLATE = rest_json.QueryTemplate()
+            results[f"{name}+template"] = {
+                "query_us": _time(template_query, args.iterations),
+                "query_bytes": len(template_query()),
+            }
+    finally:
+        rest_json.use(default)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compares query throughput of the sync and async REST examples against a local stand-in.
+
+The sync side runs rest_query.query() from a pool of threads, one per concurrent request.
+The async side runs AsyncRestClient.query() as asyncio tasks sharing one connection pool.
+The stand-in runs in a separate process so that it does not compete for the GIL.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from concurrent import futures
+
+import example_paths
+
+example_paths.add(example_paths.REST_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import rest_async_client
+import rest_query
+import stand_in
+
+def _run_sync(address: str, num_queries: int, concurrency: int) -> float:
+    """Runs the queries with the sync example and returns the elapsed seconds."""
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _, ok in pool.map(lambda _: rest_query.query(1, 1, address, "token", "q"),
+                              range(num_queries)):
+            if not ok:
+                raise RuntimeError("Query against the local stand-in failed.")
+    return time.perf_counter() - start
+
+
+async def _run_async(address: str, num_queries: int, concurrency: int) -> float:
+    """Runs the queries with the async client and returns the elapsed seconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_query(client):
+        async with semaphore:
+            _, ok = await client.query(1, 1, address, "token", "q")
+            if not ok:
+                raise RuntimeError("Query against the local stand-in failed.")
+
+    async with rest_async_client.AsyncRestClient(max_connections=concurrency) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one_query(client) for _ in range(num_queries)))
+        return time.perf_counter() - start
+
+
+def main():
+    """Runs both clients at each concurrency level and prints queries per second as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-queries", type=int, default=2000,
+                        help="Number of queries per run.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128],
+                        help="Concurrency levels to measure.")
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Simulated server latency per request.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    address, server = stand_in.start_rest_process(
+        faults=stand_in.Faults(latency_secs=args.latency_ms / 1000))
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            sync_secs = _run_sync(address, args.num_queries, concurrency)
+            async_secs = asyncio.run(_run_async(address, args.num_queries, concurrency))
+            results.append({
+                "concurrency": concurrency,
+                "sync_qps": round(args.num_queries / sync_secs, 1),
+                "async_qps": round(args.num_queries / async_secs, 1),
+            })
+    finally:
+        server.terminate()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
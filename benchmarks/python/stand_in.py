@@ -0,0 +1,551 @@
+"""Local stand-in for the Vectara REST API, with latency and error injection.
+
+The stand-in keeps a small in-memory model of corpora, documents, users and API keys, and
+answers the calls made by the examples with responses of the same shape as the real
+service. It is meant for measuring the client side, not for checking API semantics.
+
+Usage:
+    with stand_in.RestStandIn(faults=stand_in.Faults(latency_secs=0.005)) as rest:
+        rest_query.query(1, 1, rest.address, "token", "q")
+
+A stand-in started in the benchmark process competes with the client for the GIL.
+start_rest_process() runs one in a separate process instead. See grpc_stand_in.py for
+the gRPC services.
+"""
+
+import collections
+import dataclasses
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http import server
+from typing import Optional
+
+import grpc
+
+# Number of results matching any query, paged through with start and num_results.
+QUERY_HITS = 10000
+
+
+@dataclasses.dataclass(frozen=True)
+class Faults:
+    """Latency and errors injected into every call of a stand-in.
+
+    Attributes:
+        latency_secs: Delay added before answering.
+        jitter_secs: Upper bound of a random delay added on top of latency_secs.
+        error_rate: Fraction of calls, between 0 and 1, answered with an error.
+        http_status: HTTP status of injected REST errors.
+        grpc_code: Status code of injected gRPC errors.
+        retry_after_secs: If set, injected errors ask the client to wait this long,
+            through Retry-After or grpc-retry-pushback-ms.
+    """
+    latency_secs: float = 0.0
+    jitter_secs: float = 0.0
+    error_rate: float = 0.0
+    http_status: int = 503
+    grpc_code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE
+    retry_after_secs: Optional[float] = None
+
+
+NO_FAULTS = Faults()
+
+
+class FaultInjector:
+    """Applies the Faults of each call, with a seedable random generator."""
+
+    def __init__(self, faults: Faults, call_faults: Optional[dict], seed: Optional[int]):
+        self._faults = faults
+        self._call_faults = call_faults or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def inject(self, call: str) -> Optional[Faults]:
+        """Sleeps for the latency of a call and returns its Faults if it must fail."""
+        faults = self._call_faults.get(call, self._faults)
+        with self._lock:
+            jitter = self._random.uniform(0, faults.jitter_secs) if faults.jitter_secs else 0
+            fail = faults.error_rate > 0 and self._random.random() < faults.error_rate
+        delay = faults.latency_secs + jitter
+        if delay > 0:
+            time.sleep(delay)
+        return faults if fail else None
+
+
+class State:
+    """In-memory corpora, documents, users and API keys shared by the handlers.
+
+    calls counts the calls per path or method, and peers holds the address of every
+    client connection seen.
+    """
+
+    def __init__(self, corpora: int = 0, users: int = 0, api_keys: int = 0):
+        self.lock = threading.Lock()
+        self.corpora = {}
+        self.users = {}
+        self.api_keys = {}
+        self.calls = collections.Counter()
+        self.peers = set()
+        self._next_id = 1
+        for i in range(corpora):
+            self.add_corpus(f"corpus-{i}", "")
+        for i in range(users):
+            self.add_user(f"user-{i}", f"user-{i}@example.com")
+        for i in range(api_keys):
+            self.add_api_key(f"key-{i}", [])
+
+    def new_id(self) -> int:
+        """Returns an unused ID. Must hold self.lock."""
+        self._next_id += 1
+        return self._next_id
+
+    def add_corpus(self, name: str, description: str) -> int:
+        """Creates a corpus and returns its ID."""
+        with self.lock:
+            corpus_id = self.new_id()
+            self.corpora[corpus_id] = {
+                "name": name,
+                "description": description,
+                "enabled": True,
+                "dtProvision": str(int(time.time())),
+                "documents": set(),
+            }
+            return corpus_id
+
+    def add_user(self, handle: str, email: str) -> int:
+        """Creates a user and returns its ID."""
+        with self.lock:
+            user_id = self.new_id()
+            self.users[user_id] = {
+                "id": user_id,
+                "handle": handle,
+                "email": email,
+                "type": "USER_TYPE__USER",
+                "comment": "",
+                "userStatus": "USER_STATUS__ACTIVE",
+            }
+            return user_id
+
+    def add_api_key(self, description: str, corpus_ids: list) -> str:
+        """Creates an API key and returns its ID."""
+        with self.lock:
+            key_id = f"zqt_{self.new_id():016x}"
+            self.api_keys[key_id] = {
+                "description": description,
+                "keyType": "API_KEY_TYPE__SERVING",
+                "enabled": True,
+                "corpusId": list(corpus_ids),
+            }
+            return key_id
+
+    def index(self, corpus_id: int, document_id: str) -> bool:
+        """Adds a document and returns False if it already existed."""
+        with self.lock:
+            documents = self.corpora.setdefault(
+                corpus_id, {"name": "", "description": "", "enabled": True,
+                            "dtProvision": "0", "documents": set()})["documents"]
+            if document_id in documents:
+                return False
+            documents.add(document_id)
+            return True
+
+    def record(self, call: str, peer: str):
+        """Counts a call and the connection it came from."""
+        with self.lock:
+            self.calls[call] += 1
+            self.peers.add(peer)
+
+
+def query_positions(start: int, num_results: int) -> range:
+    """Returns the positions of the results of a query page, out of QUERY_HITS."""
+    return range(min(start, QUERY_HITS), min(start + num_results, QUERY_HITS))
+
+
+def _page(items: list, request: dict) -> tuple[list, str]:
+    """Returns one page of items and the key of the next page, given pageKey/numResults."""
+    start = int(_field(request, "pageKey") or 0)
+    end = start + int(_field(request, "numResults") or 10)
+    return items[start:end], str(end) if end < len(items) else ""
+
+
+def _field(request: dict, name: str, default=None):
+    """Returns a request field given in either lowerCamelCase or its snake_case form.
+
+    The REST API parses requests as protobuf JSON, which accepts both spellings.
+    """
+    snake = re.sub(r"([A-Z])", lambda match: "_" + match.group(1).lower(), name)
+    value = request.get(name, request.get(snake))
+    return default if value is None else value
+
+
+def _ok() -> dict:
+    """Returns a successful status."""
+    return {"code": "OK"}
+
+
+def _rest_response_set(query: dict) -> dict:
+    """Returns a response set with the synthetic results of one query, from start."""
+    corpus_key = (_field(query, "corpusKey") or [{}])[0]
+    positions = query_positions(int(_field(query, "start") or 0),
+                                int(_field(query, "numResults") or 10))
+    return {
+        "response": [{
+            "text": f"Result {position} for {query.get('query', '')}.",
+            "score": 1.0 / (position + 1),
+            "metadata": [{"name": "lang", "value": "en"}],
+            "documentIndex": i,
+            "corpusKey": corpus_key,
+        } for i, position in enumerate(positions)],
+        "status": [],
+        "document": [{"id": f"doc-{position}",
+                      "metadata": [{"name": "title", "value": f"Doc {position}"}]}
+                     for position in positions],
+    }
+
+
+def _rest_query(state: State, request: dict, params: dict) -> dict:
+    del state, params  # Unused.
+    return {"responseSet": [_rest_response_set(query) for query in request["query"]],
+            "status": []}
+
+
+def _rest_index(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    created = state.index(int(_field(request, "corpusId", 0)),
+                          _field(request.get("document", {}), "documentId", ""))
+    return {"status": _ok() if created else {"code": "ALREADY_EXISTS"}}
+
+
+def _rest_upload(state: State, request: dict, params: dict) -> dict:
+    del request  # Unused, the uploaded file is not parsed.
+    state.index(int(params.get("o", 0)), f"upload-{time.monotonic_ns()}")
+    return {"response": {"status": None, "quotaConsumed": {"numChars": 0}}}
+
+
+def _rest_delete_doc(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        corpus = state.corpora.get(int(_field(request, "corpusId", 0)))
+        if corpus:
+            corpus["documents"].discard(_field(request, "documentId"))
+    return {}
+
+
+def _rest_create_corpus(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    corpus = request.get("corpus", {})
+    corpus_id = state.add_corpus(corpus.get("name", ""), corpus.get("description", ""))
+    return {"corpusId": corpus_id, "status": _ok()}
+
+
+def _rest_delete_corpus(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        found = state.corpora.pop(int(_field(request, "corpusId", 0)), None)
+    return {"status": _ok() if found else {"code": "NOT_FOUND"}}
+
+
+def _rest_reset_corpus(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        corpus = state.corpora.get(int(_field(request, "corpusId", 0)))
+        if corpus:
+            corpus["documents"].clear()
+    return {"status": _ok() if corpus else {"code": "NOT_FOUND"}}
+
+
+def _rest_read_corpus(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    corpora = []
+    with state.lock:
+        for corpus_id in _field(request, "corpusId", []):
+            corpus = state.corpora.get(int(corpus_id))
+            if corpus is None:
+                continue
+            corpora.append({
+                "corpus": {
+                    "id": corpus_id,
+                    "name": corpus["name"],
+                    "description": corpus["description"],
+                    "dtProvision": corpus["dtProvision"],
+                    "enabled": corpus["enabled"],
+                },
+                "corpusStatus": _ok(),
+                "size": {"epochSecs": int(time.time()), "size": len(corpus["documents"])},
+                "sizeStatus": _ok(),
+                "apiKey": [],
+                "apiKeyStatus": _ok(),
+            })
+    return {"corpora": corpora}
+
+
+def _rest_compute_corpus_size(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        corpus = state.corpora.get(int(_field(request, "corpusId", 0)))
+        size = len(corpus["documents"]) if corpus else 0
+    return {"status": _ok(), "size": {"epochSecs": int(time.time()), "size": size}}
+
+
+def _rest_update_corpus_enablement(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        corpus = state.corpora.get(int(_field(request, "corpusId", 0)))
+        if corpus:
+            corpus["enabled"] = bool(request.get("enable"))
+    return {"status": _ok() if corpus else {"code": "NOT_FOUND"}}
+
+
+def _rest_get_usage_metrics(state: State, request: dict, params: dict) -> dict:
+    del state, params  # Unused.
+    window = request.get("window", {})
+    start = int(window.get("startEpochSecs") or 0)
+    end = int(window.get("endEpochSecs") or start)
+    interval = max(int(request.get("aggreagationIntervalSecs") or 3600), 1)
+    # int64 fields are strings in the JSON mapping of proto3, as in the real responses.
+    return {
+        "status": _ok(),
+        "values": [{"servingValue": {"rowsRead": "100", "queryCount": "10",
+                                     "startEpochSecs": str(bucket)}}
+                   for bucket in range(start, end, interval)][:100000],
+    }
+
+
+def _rest_list_users(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        users = list(state.users.values())
+    page, page_key = _page(users, request)
+    return {"status": _ok(), "user": page, "pageKey": page_key}
+
+
+def _rest_manage_user(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    responses = []
+    for action in request.get("userAction", []):
+        user = action.get("user", {})
+        action_type = action.get("userActionType")
+        if action_type == "USER_ACTION_TYPE__ADD":
+            user_id = state.add_user(user.get("handle", ""), user.get("email", ""))
+            responses.append({"status": _ok(), "user": {"id": user_id}})
+            continue
+        with state.lock:
+            found = state.users.get(user.get("id"))
+            if found and action_type == "USER_ACTION_TYPE__DELETE":
+                del state.users[user["id"]]
+            elif found and action_type == "USER_ACTION_TYPE__DISABLE":
+                found["userStatus"] = "USER_STATUS__DISABLED"
+        responses.append({"status": _ok() if found else {"code": "NOT_FOUND"},
+                          "user": {"id": user.get("id")}})
+    return {"response": responses}
+
+
+def _rest_list_api_keys(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    with state.lock:
+        keys = [{
+            "apiKey": {"id": key_id, "description": key["description"],
+                       "keyType": key["keyType"], "enabled": key["enabled"]},
+            "corpus": [{"id": corpus_id,
+                        "name": state.corpora.get(corpus_id, {}).get("name", "")}
+                       for corpus_id in key["corpusId"]],
+        } for key_id, key in state.api_keys.items()]
+    page, page_key = _page(keys, request)
+    return {"status": _ok(), "keyData": page, "pageKey": page_key}
+
+
+def _rest_create_api_key(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    return {"response": [
+        {"keyId": state.add_api_key(data.get("description", ""), data.get("corpusId", [])),
+         "status": _ok()}
+        for data in request.get("apiKeyData", [])
+    ]}
+
+
+def _rest_delete_api_key(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    statuses = []
+    with state.lock:
+        for key_id in request.get("keyId", []):
+            found = state.api_keys.pop(key_id, None)
+            statuses.append(_ok() if found else {"code": "NOT_FOUND"})
+    return {"status": statuses}
+
+
+def _rest_enable_api_key(state: State, request: dict, params: dict) -> dict:
+    del params  # Unused.
+    statuses = []
+    with state.lock:
+        for enablement in request.get("keyEnablement", []):
+            key = state.api_keys.get(enablement.get("keyId"))
+            if key:
+                key["enabled"] = bool(enablement.get("enable"))
+            statuses.append(_ok() if key else {"code": "NOT_FOUND"})
+    return {"status": statuses}
+
+
+_REST_ROUTES = {
+    "/v1/query": _rest_query,
+    "/v1/index": _rest_index,
+    "/v1/upload": _rest_upload,
+    "/v1/delete-doc": _rest_delete_doc,
+    "/v1/create-corpus": _rest_create_corpus,
+    "/v1/delete-corpus": _rest_delete_corpus,
+    "/v1/reset-corpus": _rest_reset_corpus,
+    "/v1/read-corpus": _rest_read_corpus,
+    "/v1/compute-corpus-size": _rest_compute_corpus_size,
+    "/v1/update-corpus-enablement": _rest_update_corpus_enablement,
+    "/v1/get-usage-metrics": _rest_get_usage_metrics,
+    "/v1/list-users": _rest_list_users,
+    "/v1/manage-user": _rest_manage_user,
+    "/v1/list-api-keys": _rest_list_api_keys,
+    "/v1/create-api-key": _rest_create_api_key,
+    "/v1/delete-api-key": _rest_delete_api_key,
+    "/v1/enable-api-key": _rest_enable_api_key,
+}
+
+
+class _RestHandler(server.BaseHTTPRequestHandler):
+    """Routes each POST to the handler of its path."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        url = urllib.parse.urlsplit(self.path)
+        body = self._read_body()
+        route = _REST_ROUTES.get(url.path)
+        if route is None:
+            self._reply(404, {"message": f"Unknown path {url.path}"})
+            return
+
+        self.server.state.record(url.path, self.client_address)
+        faults = self.server.injector.inject(url.path)
+        if faults is not None:
+            headers = {}
+            if faults.retry_after_secs is not None:
+                headers["Retry-After"] = f"{faults.retry_after_secs:g}"
+            self._reply(faults.http_status, {"message": "Injected error"}, headers)
+            return
+
+        params = dict(urllib.parse.parse_qsl(url.query))
+        request = {} if url.path == "/v1/upload" else json.loads(body or b"{}")
+        self._reply(200, route(self.server.state, request, params))
+
+    def _read_body(self) -> bytes:
+        """Reads the request body, draining large uploads in chunks."""
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 1024 * 1024:
+            return self.rfile.read(length)
+        while length > 0:
+            length -= len(self.rfile.read(min(length, 1024 * 1024)))
+        return b""
+
+    def _reply(self, status: int, message: dict, headers: Optional[dict] = None):
+        data = json.dumps(message).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _RestServer(server.ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog large enough for load benchmarks."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, state: State, injector: FaultInjector):
+        super().__init__(address, _RestHandler)
+        self.state = state
+        self.injector = injector
+
+
+class RestStandIn:
+    """Stand-in for the REST API, served from a background thread."""
+
+    def __init__(self,
+                 faults: Faults = NO_FAULTS,
+                 path_faults: Optional[dict] = None,
+                 corpora: int = 0,
+                 users: int = 0,
+                 api_keys: int = 0,
+                 seed: Optional[int] = None,
+                 port: int = 0):
+        """Creates the stand-in. Call start() or use it as a context manager.
+
+        Args:
+            faults: Faults injected into every call.
+            path_faults: Faults overriding `faults` for some paths, e.g., "/v1/query".
+            corpora: Number of corpora created up front.
+            users: Number of users created up front.
+            api_keys: Number of API keys created up front.
+            seed: Seed of the random latency jitter and errors.
+            port: Port to listen on, 0 for any free port.
+        """
+        self.state = State(corpora, users, api_keys)
+        self._injector = FaultInjector(faults, path_faults, seed)
+        self._port = port
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def address(self) -> str:
+        """Returns the address to pass to the examples, e.g., http://localhost:8080."""
+        return f"http://localhost:{self._server.server_port}"
+
+    def start(self) -> str:
+        """Starts serving and returns the address."""
+        self._server = _RestServer(("localhost", self._port), self.state, self._injector)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self):
+        """Stops serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+def _serve_rest(kwargs: dict, ports: multiprocessing.Queue):
+    """Runs a RestStandIn forever, reporting its port through the queue."""
+    stand_in = RestStandIn(**kwargs)
+    ports.put(stand_in.start())
+    threading.Event().wait()
+
+
+def start_rest_process(**kwargs) -> tuple[str, multiprocessing.Process]:
+    """Starts a RestStandIn in a separate process.
+
+    Args:
+        **kwargs: Arguments of RestStandIn.
+
+    Returns:
+        The address of the stand-in and its process, to be terminated by the caller.
+    """
+    addresses = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_rest, args=(kwargs, addresses),
+                                      daemon=True)
+    process.start()
+    return addresses.get(), process
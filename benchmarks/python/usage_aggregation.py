@@ -0,0 +1,145 @@
+"""Measures aggregating hourly usage metrics held as dataclasses versus as columns.
+
+* dataclasses: a list of data_objects.QueryUsageData per corpus, aggregated with loops.
+* columns: usage_columns.UsageColumns, aggregated with NumPy.
+* columns_without_numpy: UsageColumns, aggregated with loops over its arrays.
+
+Each computes daily sums per corpus, weekly sums per corpus, totals per corpus and the
+95th percentile of rows read. The output holds the milliseconds of each aggregation and
+the bytes allocated to hold the metrics.
+"""
+
+import argparse
+import collections
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+import example_paths
+
+example_paths.add(example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from corpus import data_objects
+from corpus import usage_columns
+
+_START_EPOCH_SECS = 1672531200  # 2023-01-01T00:00:00Z
+
+
+def _build_dataclasses(num_corpora: int, hours: int) -> dict:
+    """Returns random usage as a list of QueryUsageData per corpus."""
+    rng = random.Random(1)
+    return {corpus_id: [data_objects.QueryUsageData(rows_read=rng.randrange(1000),
+                                                    query_count=rng.randrange(50),
+                                                    start_time=_START_EPOCH_SECS + hour * 3600)
+                        for hour in range(hours)]
+            for corpus_id in range(1, num_corpora + 1)}
+
+
+def _build_columns(num_corpora: int, hours: int) -> usage_columns.UsageColumns:
+    """Returns the same random usage as _build_dataclasses as columns."""
+    rng = random.Random(1)
+    columns = usage_columns.UsageColumns()
+    for corpus_id in range(1, num_corpora + 1):
+        for hour in range(hours):
+            rows_read, query_count = rng.randrange(1000), rng.randrange(50)
+            columns.append(corpus_id, _START_EPOCH_SECS + hour * 3600, rows_read, query_count)
+    return columns
+
+
+def _dataclass_rollup(usage: dict, period_secs: int, origin_epoch_secs: int = 0) -> dict:
+    """Returns the sums per (corpus ID, period) of QueryUsageData lists."""
+    sums = collections.defaultdict(lambda: [0, 0])
+    for corpus_id, intervals in usage.items():
+        for data in intervals:
+            period = data.start_time - (data.start_time - origin_epoch_secs) % period_secs
+            total = sums[(corpus_id, period)]
+            total[0] += data.rows_read
+            total[1] += data.query_count
+    return sums
+
+
+def _dataclass_aggregations(usage: dict) -> dict:
+    """Returns the aggregations of QueryUsageData lists."""
+    return {
+        "daily": lambda: _dataclass_rollup(usage, usage_columns.DAY_SECS),
+        "weekly": lambda: _dataclass_rollup(usage, usage_columns.WEEK_SECS,
+                                            usage_columns.MONDAY_EPOCH_SECS),
+        "totals": lambda: {corpus_id: (sum(data.rows_read for data in intervals),
+                                       sum(data.query_count for data in intervals))
+                           for corpus_id, intervals in usage.items()},
+        "p95_rows_read": lambda: statistics.quantiles(
+            [data.rows_read for intervals in usage.values() for data in intervals],
+            n=100, method="inclusive")[94],
+    }
+
+
+def _column_aggregations(columns: usage_columns.UsageColumns) -> dict:
+    """Returns the aggregations of UsageColumns."""
+    return {
+        "daily": lambda: columns.rollup(usage_columns.DAY_SECS),
+        "weekly": lambda: columns.rollup(usage_columns.WEEK_SECS,
+                                         usage_columns.MONDAY_EPOCH_SECS),
+        "totals": columns.totals,
+        "p95_rows_read": lambda: columns.percentile("rows_read", 95),
+    }
+
+
+def _allocated_bytes(build) -> tuple[object, int]:
+    """Returns the result of build and the bytes it left allocated."""
+    tracemalloc.start()
+    try:
+        result = build()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
+
+def _time_ms(function, iterations: int) -> float:
+    """Returns the median milliseconds of a call."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def main():
+    """Runs every aggregation of every representation and prints the timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpora", type=int, default=100,
+                        help="Number of corpora.")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Days of hourly metrics per corpus.")
+    parser.add_argument("--iterations", type=int, default=5,
+                        help="Runs of each aggregation.")
+    args = parser.parse_args()
+    hours = args.days * 24
+
+    usage, dataclass_bytes = _allocated_bytes(lambda: _build_dataclasses(args.corpora, hours))
+    columns, column_bytes = _allocated_bytes(lambda: _build_columns(args.corpora, hours))
+
+    results = {"rows": len(columns), "dataclasses": {"bytes": dataclass_bytes}}
+    for name, aggregate in _dataclass_aggregations(usage).items():
+        results["dataclasses"][f"{name}_ms"] = _time_ms(aggregate, args.iterations)
+
+    numpy = usage_columns.numpy
+    modes = (["columns"] if numpy is not None else []) + ["columns_without_numpy"]
+    try:
+        for mode in modes:
+            usage_columns.numpy = numpy if mode == "columns" else None
+            results[mode] = {"bytes": column_bytes}
+            for name, aggregate in _column_aggregations(columns).items():
+                results[mode][f"{name}_ms"] = _time_ms(aggregate, args.iterations)
+    finally:
+        usage_columns.numpy = numpy
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
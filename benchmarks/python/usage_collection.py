@@ -0,0 +1,92 @@
+"""Measures collecting hourly usage metrics of many corpora, day after day.
+
+* full_download: read_usage_metrics called once per corpus for the whole range, one
+  corpus after another, the way a daily job re-downloads everything.
+* collector_first_run: usage_metrics_collector.collect into an empty UsageStore, with
+  the range split into windows read concurrently.
+* collector_next_day: collect again one day later, reading only the new day.
+
+The stand-in answers every request after --latency-ms. The output holds the wall
+seconds and the number of intervals transferred by each.
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+import example_paths
+
+example_paths.add(example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from corpus import read_usage_metrics
+from corpus import usage_metrics_collector
+from utils import vectara_client
+
+import stand_in
+
+_CUSTOMER_ID = 1
+_TOKEN = "token"
+_DAY_SECS = 24 * 3600
+
+
+def main():
+    """Runs each way of collecting and prints its statistics as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpora", type=int, default=20,
+                        help="Number of corpora collected.")
+    parser.add_argument("--days", type=int, default=90,
+                        help="Days of hourly metrics collected.")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Simulated server latency per request.")
+    parser.add_argument("--max-workers", type=int, default=8,
+                        help="Maximum number of requests in flight of the collector.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    now = int(time.time())
+    end = now - now % _DAY_SECS - _DAY_SECS
+    start = end - args.days * _DAY_SECS
+    corpus_ids = list(range(1, args.corpora + 1))
+
+    faults = stand_in.Faults(latency_secs=args.latency_ms / 1000)
+    address, server = stand_in.start_rest_process(faults=faults)
+    client = vectara_client.VectaraClient(address, pool_maxsize=args.max_workers)
+    results = {}
+    try:
+        wall_start = time.perf_counter()
+        intervals = sum(len(read_usage_metrics.read_usage_metrics(
+            _CUSTOMER_ID, corpus_id, _TOKEN, start, end, client=client))
+                        for corpus_id in corpus_ids)
+        results["full_download"] = {
+            "wall_secs": round(time.perf_counter() - wall_start, 3),
+            "intervals": intervals,
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "usage.csv")
+            for name, run_end in (("collector_first_run", end),
+                                  ("collector_next_day", end + _DAY_SECS)):
+                wall_start = time.perf_counter()
+                with usage_metrics_collector.UsageStore(path) as store:
+                    appended = usage_metrics_collector.collect(
+                        _CUSTOMER_ID, corpus_ids, _TOKEN, store, start, run_end,
+                        max_workers=args.max_workers, client=client)
+                results[name] = {
+                    "wall_secs": round(time.perf_counter() - wall_start, 3),
+                    "intervals": sum(appended.values()),
+                }
+            results["store_bytes"] = os.path.getsize(path)
+    finally:
+        client.close()
+        server.terminate()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measures onboarding and offboarding many users one request per user versus in batches.
+
+* one_per_request: create_user, disable_user and delete_user called once per user, one
+  user after another.
+* batched: manage_users.create_users, disable_users and delete_users, packing
+  --batch-size users per manage-user request with --max-workers requests in flight.
+
+The stand-in answers every request after --latency-ms. The output holds the wall
+seconds and the number of requests of each step.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import example_paths
+
+example_paths.add(example_paths.FEATURE_EXAMPLES)
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from user import create_user
+from user import delete_user
+from user import disable_user
+from user import manage_users
+from utils import vectara_client
+
+import stand_in
+
+_CUSTOMER_ID = 1
+_TOKEN = "token"
+
+
+def _one_per_request(num_users: int, client: vectara_client.VectaraClient) -> dict:
+    """Returns the wall seconds of each step, calling the single-user functions."""
+    timings = {}
+    start = time.perf_counter()
+    user_ids = [create_user.create_user(_CUSTOMER_ID, _TOKEN, client=client)
+                for _ in range(num_users)]
+    timings["create_secs"] = time.perf_counter() - start
+    for name, manage in (("disable_secs", disable_user.disable_user),
+                         ("delete_secs", delete_user.delete_user)):
+        start = time.perf_counter()
+        for user_id in user_ids:
+            manage(_CUSTOMER_ID, user_id, _TOKEN, client=client)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def _batched(num_users: int, batch_size: int, max_workers: int,
+             client: vectara_client.VectaraClient) -> dict:
+    """Returns the wall seconds of each step, calling the batched functions."""
+    timings = {}
+    users = (manage_users.NewUser(handle=f"user{index}", email=f"user{index}@example.com")
+             for index in range(num_users))
+    start = time.perf_counter()
+    created = manage_users.create_users(_CUSTOMER_ID, users, _TOKEN, batch_size,
+                                        max_workers, client)
+    timings["create_secs"] = time.perf_counter() - start
+    user_ids = [result.user_id for result in created if result.ok]
+    if len(user_ids) != num_users:
+        raise RuntimeError(f"Created {len(user_ids)} of {num_users} users")
+    for name, manage in (("disable_secs", manage_users.disable_users),
+                         ("delete_secs", manage_users.delete_users)):
+        start = time.perf_counter()
+        results = manage(_CUSTOMER_ID, user_ids, _TOKEN, batch_size, max_workers, client)
+        timings[name] = time.perf_counter() - start
+        if not all(result.ok for result in results):
+            raise RuntimeError(f"{name[:-5]} failed: {results}")
+    return timings
+
+
+def main():
+    """Provisions users each way and prints the timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000,
+                        help="Number of users created, disabled and deleted.")
+    parser.add_argument("--batch-size", type=int, default=manage_users.DEFAULT_BATCH_SIZE,
+                        help="Maximum number of users per batched request.")
+    parser.add_argument("--max-workers", type=int, default=4,
+                        help="Maximum number of batched requests in flight.")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Simulated server latency per request.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    faults = stand_in.Faults(latency_secs=args.latency_ms / 1000)
+    address, server = stand_in.start_rest_process(faults=faults)
+    client = vectara_client.VectaraClient(address, pool_maxsize=args.max_workers)
+    requests_per_step = {
+        "one_per_request": args.users,
+        "batched": -(-args.users // args.batch_size),
+    }
+    results = {"users": args.users}
+    try:
+        for name, timings in (
+                ("one_per_request", _one_per_request(args.users, client)),
+                ("batched", _batched(args.users, args.batch_size, args.max_workers,
+                                     client))):
+            results[name] = {key: round(value, 3) for key, value in timings.items()}
+            results[name]["requests_per_step"] = requests_per_step[name]
+    finally:
+        client.close()
+        server.terminate()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
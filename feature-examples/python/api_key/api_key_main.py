@@ -9,7 +9,9 @@ from api_key import create_api_key
 from api_key import delete_api_key
 from api_key import enable_api_key
 from api_key import list_api_key
+from api_key import manage_api_keys
 from utils import utils
+from utils import vectara_client
 
 
 def main() -> None:
@@ -39,6 +41,30 @@ def main() -> None:
     parser.add_argument(
         "--auth-url", required=True, help="The auth url for this customer."
     )
+    parser.add_argument(
+        "--base-url",
+        default=vectara_client.DEFAULT_BASE_URL,
+        help="Base URL of the Vectara REST API, e.g., a local stand-in server.",
+    )
+    parser.add_argument(
+        "--rotate-corpus-ids",
+        type=int,
+        nargs="+",
+        help="Create a query API key for each of these corpora in batches, then disable "
+        "and delete the new keys.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=manage_api_keys.DEFAULT_BATCH_SIZE,
+        help="Maximum number of API keys per request of --rotate-corpus-ids.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of requests of --rotate-corpus-ids in flight.",
+    )
 
     args = parser.parse_args()
 
@@ -49,10 +75,16 @@ def main() -> None:
         logging.error("Failed to get JWT token.")
         sys.exit(1)
 
+    client = vectara_client.VectaraClient(args.base_url, pool_maxsize=args.max_workers)
+
+    if args.rotate_corpus_ids:
+        _rotate_api_keys(args, jwt_token, client)
+        return
+
     response = Optional[str]
 
     response, status = create_api_key.create_api_key(
-        args.customer_id, args.corpus_id, jwt_token
+        args.customer_id, args.corpus_id, jwt_token, client=client
     )
     logging.info("CreateApiKey response: %s, status: %s", response, status)
 
@@ -61,17 +93,41 @@ def main() -> None:
 
     api_key: str = response
     response, status = enable_api_key.enable_api_key(
-        args.customer_id, api_key, jwt_token, False  # Disable the API key.
+        args.customer_id, api_key, jwt_token, False, client=client  # Disable the API key.
     )
     logging.info("DisableApiKey response: %s, status: %s", response, status)
 
-    response, status = delete_api_key.delete_api_key(args.customer_id, api_key, jwt_token)
+    response, status = delete_api_key.delete_api_key(args.customer_id, api_key, jwt_token,
+                                                     client=client)
     logging.info("DeleteApiKey response: %s, status: %s", response, status)
 
-    keys = list_api_key.list_api_keys(args.customer_id, jwt_token)
+    keys = list_api_key.list_api_keys(args.customer_id, jwt_token, client=client)
     logging.info("ListApiKeys response: %s", keys)
 
 
+def _rotate_api_keys(args: argparse.Namespace, jwt_token: utils.Token,
+                     client: vectara_client.VectaraClient) -> None:
+    """Creates, disables and deletes a key per corpus of --rotate-corpus-ids in batches."""
+    keys = [manage_api_keys.NewApiKey(corpus_ids=(corpus_id,),
+                                      description=f"Key of corpus {corpus_id}")
+            for corpus_id in args.rotate_corpus_ids]
+    created = manage_api_keys.create_api_keys(args.customer_id, keys, jwt_token,
+                                              args.batch_size, args.max_workers, client)
+    key_ids = [result.key_id for result in created if result.ok]
+    disabled = manage_api_keys.enable_api_keys(args.customer_id, key_ids, jwt_token, False,
+                                               args.batch_size, args.max_workers, client)
+    deleted = manage_api_keys.delete_api_keys(args.customer_id, key_ids, jwt_token,
+                                              args.batch_size, args.max_workers, client)
+
+    for name, results in (("CreateApiKeys", created), ("DisableApiKeys", disabled),
+                          ("DeleteApiKeys", deleted)):
+        logging.info("%s succeeded for %d of %d keys", name,
+                     sum(result.ok for result in results), len(results))
+        for result in results:
+            logging.info("%s %s: key %s, status %s", name, result.key, result.key_id,
+                         result.status)
+
+
 if __name__ == "__main__":
     logging.basicConfig(
         format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO
@@ -1,28 +1,33 @@
 """Example of using the Vectara REST API to create an API Key."""
 
 import logging
+from typing import Optional
 
-import requests
+from utils import utils
+from utils import vectara_client
 
 
 def create_api_key(
     customer_id: int,
     corpus_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> tuple[str, bool]:
     """Creates an API key.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: Corpus ID to which API key will be created.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         (apiKey, True) in case of success and returns (error, False) in case of failure.
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # A request can contain multiple api keys. We are creating only one.
@@ -36,12 +41,11 @@ def create_api_key(
         ]
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/create-api-key",
+    response = vectara_client.resolve(client).post(
+        "/v1/create-api-key",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
@@ -3,38 +3,41 @@
 import logging
 from typing import Optional
 
-import requests
+from utils import utils
+from utils import vectara_client
 
 
 def delete_api_key(
     customer_id: int,
     key_id: str,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> tuple[Optional[str], bool]:
     """Deletes an API key.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         key_id: API key ID to be deleted.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         (None, True) in case of success and returns (error, False) in case of failure.
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # A request can contain multiple API keys. We are deleting only one.
     request = {"keyId": [key_id]}
 
-    response = requests.post(
-        "https://api.vectara.io/v1/delete-api-key",
+    response = vectara_client.resolve(client).post(
+        "/v1/delete-api-key",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
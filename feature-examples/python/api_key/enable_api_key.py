@@ -3,29 +3,33 @@
 import logging
 from typing import Optional
 
-import requests
+from utils import utils
+from utils import vectara_client
 
 
 def enable_api_key(
     customer_id: int,
     key_id: str,
-    jwt_token: str,
+    jwt_token: utils.Token,
     enable: bool,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> tuple[Optional[str], bool]:
     """Enables or disables an API key.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         key_id: API key ID to be enabled or disabled.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
         enable: True to enable, False to disable.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         (None, True) in case of success and returns (error, False) in case of failure.
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # A request can contain enable/disable request for multiple api keys.
@@ -38,12 +42,11 @@ def enable_api_key(
         ]
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/enable-api-key",
+    response = vectara_client.resolve(client).post(
+        "/v1/enable-api-key",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
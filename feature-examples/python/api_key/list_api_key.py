@@ -2,22 +2,30 @@
 
 import dataclasses
 import logging
+from typing import Iterator, Optional
 
-import requests
+from utils import pagination
+from utils import slots
+from utils import utils
+from utils import vectara_client
 
 
 @dataclasses.dataclass(frozen=True)
-class CorpusData:
+class CorpusData(slots.FrozenSlots):
     """Corpus id and name."""
 
+    __slots__ = ("corpus_id", "corpus_name")
+
     corpus_id: int
     corpus_name: str
 
 
 @dataclasses.dataclass(frozen=True)
-class KeyData:
+class KeyData(slots.FrozenSlots):
     """API Key data such as id, type, list of corpora etc."""
 
+    __slots__ = ("key_id", "description", "key_type", "enabled", "corpora")
+
     key_id: str
     description: str
     key_type: str
@@ -30,13 +38,20 @@ class ListApiKeyException(Exception):
 
 def list_api_keys(
     customer_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    num_results: int = 10,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> list[KeyData]:
-    """Retrieves the list of API keys.
+    """Retrieves the first page of API keys.
+
+    Use iterate_api_keys to enumerate every API key.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        num_results: Maximum number of API keys to retrieve.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         list of KeyData objects.
@@ -44,19 +59,63 @@ def list_api_keys(
     Raises:
         Exception: In case of any error.
     """
+    keys, _ = _list_api_keys_page(customer_id, jwt_token, num_results, None, client)
+    return keys
+
+
+def iterate_api_keys(
+    customer_id: int,
+    jwt_token: utils.Token,
+    page_size: int = 100,
+    prefetch: bool = False,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> Iterator[KeyData]:
+    """Streams every API key, requesting one page at a time.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        page_size: Number of API keys requested per page.
+        prefetch: Whether to request the next page while the current one is consumed.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Yields:
+        KeyData objects.
+
+    Raises:
+        Exception: In case of any error.
+    """
+    return pagination.iterate_pages(
+        lambda page_key: _list_api_keys_page(
+            customer_id, jwt_token, page_size, page_key, client),
+        prefetch=prefetch,
+    )
+
+
+def _list_api_keys_page(
+    customer_id: int,
+    jwt_token: utils.Token,
+    num_results: int,
+    page_key: Optional[str],
+    client: Optional[vectara_client.VectaraClient],
+) -> tuple[list[KeyData], Optional[str]]:
+    """Helper function to retrieve one page of API keys and the key of the next page."""
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
-    request = {"numResults": 10, "readCorporaInfo": True}
+    request = {"numResults": num_results, "readCorporaInfo": True}
+    if page_key:
+        request["pageKey"] = page_key
 
-    response = requests.post(
-        "https://api.vectara.io/v1/list-api-keys",
+    response = vectara_client.resolve(client).post(
+        "/v1/list-api-keys",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
+        idempotent=True,
     )
 
     if response.status_code != 200:
@@ -72,25 +131,34 @@ def list_api_keys(
     if message["status"]:
         status = message["status"]
         if status["code"] == "OK":
-            result: list[KeyData] = []
-            for key in message["keyData"]:
-                result.append(
-                    KeyData(
-                        key_id=key["apiKey"]["id"],
-                        description=key["apiKey"]["description"],
-                        key_type=key["apiKey"]["keyType"],
-                        enabled=key["apiKey"]["enabled"],
-                        corpora=[
-                            CorpusData(
-                                corpus_id=corpus["id"], corpus_name=corpus["name"]
-                            )
-                            for corpus in key["corpus"]
-                        ],
-                    )
-                )
-            return result
+            return _keys_from_message(message), message.get("pageKey")
 
         logging.error("ListApiKeys failed with status %s", status)
         raise ListApiKeyException(str(status))
 
     raise Exception(str(message))
+
+
+def _keys_from_message(message: dict) -> list[KeyData]:
+    """Helper function to parse the response message.
+
+    Keys of a page sharing a corpus share its CorpusData.
+    """
+    corpora: dict[tuple, CorpusData] = {}
+
+    def corpus_data(corpus: dict) -> CorpusData:
+        key = (corpus["id"], corpus["name"])
+        if key not in corpora:
+            corpora[key] = CorpusData(corpus_id=corpus["id"], corpus_name=corpus["name"])
+        return corpora[key]
+
+    return [
+        KeyData(
+            key_id=key["apiKey"]["id"],
+            description=key["apiKey"]["description"],
+            key_type=slots.intern(key["apiKey"]["keyType"]),
+            enabled=key["apiKey"]["enabled"],
+            corpora=[corpus_data(corpus) for corpus in key["corpus"]],
+        )
+        for key in message["keyData"]
+    ]
@@ -0,0 +1,236 @@
+"""Example of creating, enabling, disabling and deleting many API keys in batches.
+
+The create-api-key, enable-api-key and delete-api-key requests each hold any number of
+keys and their responses hold the status of each, in order. The functions below pack the
+keys into requests of up to batch_size keys, send the requests concurrently and return
+one ApiKeyResult per key, so rotating the keys of hundreds of corpora takes a handful of
+requests.
+
+Usage:
+    created = manage_api_keys.create_api_keys(
+        customer_id,
+        [manage_api_keys.NewApiKey(corpus_ids=(corpus_id,)) for corpus_id in corpus_ids],
+        jwt_token)
+    manage_api_keys.enable_api_keys(customer_id, old_key_ids, jwt_token, enable=False)
+"""
+
+import dataclasses
+import logging
+from typing import Callable, Iterable, Optional, Union
+
+import requests
+
+from utils import batching
+from utils import utils
+from utils import vectara_client
+
+DEFAULT_BATCH_SIZE = 100
+
+
+@dataclasses.dataclass(frozen=True)
+class NewApiKey:
+    """API key to be created for one or more corpora."""
+
+    corpus_ids: tuple[int, ...]
+    description: str = ""
+    api_key_type: int = 1  # 1 - Query, 2 - Query & Indexing
+
+
+@dataclasses.dataclass(frozen=True)
+class ApiKeyResult:
+    """Outcome of the action on one API key.
+
+    key is the NewApiKey or key ID passed in. key_id is the ID of the key, or None if a
+    NewApiKey was not created. status is the status returned for the key, e.g.,
+    {"code": "OK"}, or {"code": batching.REQUEST_FAILED, ...} if the request holding it
+    failed.
+    """
+
+    key: Union[NewApiKey, str]
+    key_id: Optional[str]
+    status: dict
+
+    @property
+    def ok(self) -> bool:
+        """Whether the action succeeded."""
+        return self.status.get("code") == "OK"
+
+
+def create_api_keys(
+    customer_id: int,
+    keys: Iterable[NewApiKey],
+    jwt_token: utils.Token,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[ApiKeyResult]:
+    """Creates API keys in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        keys: API keys to be created.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        batch_size: Maximum number of keys per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One ApiKeyResult per key, in order, holding the ID of the created key.
+    """
+    def request(batch: list[NewApiKey]) -> dict:
+        return {"apiKeyData": [{"description": key.description,
+                                "apiKeyType": key.api_key_type,
+                                "corpusId": list(key.corpus_ids)}
+                               for key in batch]}
+
+    def statuses(message: dict) -> list[tuple[Optional[str], dict]]:
+        return [(key_response.get("keyId"), key_response["status"])
+                for key_response in message.get("response") or []]
+
+    return _manage_api_keys("CreateApiKeys", "/v1/create-api-key", customer_id, keys,
+                            jwt_token, request, statuses, batch_size, max_workers,
+                            idempotent=False, client=client)
+
+
+def enable_api_keys(
+    customer_id: int,
+    key_ids: Iterable[str],
+    jwt_token: utils.Token,
+    enable: bool,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[ApiKeyResult]:
+    """Enables or disables API keys in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        key_ids: IDs of the API keys to be enabled or disabled.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        enable: True to enable, False to disable.
+        batch_size: Maximum number of keys per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One ApiKeyResult per key, in order.
+    """
+    def request(batch: list[str]) -> dict:
+        return {"keyEnablement": [{"keyId": key_id, "enable": enable} for key_id in batch]}
+
+    # Enabling or disabling a key again has no effect, so failed requests can be retried.
+    return _manage_api_keys("EnableApiKeys" if enable else "DisableApiKeys",
+                            "/v1/enable-api-key", customer_id, key_ids, jwt_token,
+                            request, _statuses, batch_size, max_workers,
+                            idempotent=True, client=client)
+
+
+def delete_api_keys(
+    customer_id: int,
+    key_ids: Iterable[str],
+    jwt_token: utils.Token,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[ApiKeyResult]:
+    """Deletes API keys in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        key_ids: IDs of the API keys to be deleted.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        batch_size: Maximum number of keys per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One ApiKeyResult per key, in order.
+    """
+    return _manage_api_keys("DeleteApiKeys", "/v1/delete-api-key", customer_id, key_ids,
+                            jwt_token, lambda batch: {"keyId": list(batch)}, _statuses,
+                            batch_size, max_workers, idempotent=False, client=client)
+
+
+def _statuses(message: dict) -> list[tuple[None, dict]]:
+    """Helper function to read the statuses of an enable or delete response."""
+    return [(None, status) for status in message.get("status") or []]
+
+
+def _manage_api_keys(
+    name: str,
+    path: str,
+    customer_id: int,
+    keys: Iterable[Union[NewApiKey, str]],
+    jwt_token: utils.Token,
+    request: Callable[[list], dict],
+    statuses: Callable[[dict], list[tuple[Optional[str], dict]]],
+    batch_size: int,
+    max_workers: int,
+    idempotent: bool,
+    client: Optional[vectara_client.VectaraClient],
+) -> list[ApiKeyResult]:
+    """Helper function to send keys in concurrent batches.
+
+    request builds the request of a batch of keys, and statuses reads the (key ID,
+    status) of every key from the response message.
+    """
+    def send(batch: list[Union[NewApiKey, str]]) -> list[ApiKeyResult]:
+        post_headers = {
+            "customer-id": f"{customer_id}",
+            "Authorization": utils.authorization(jwt_token),
+        }
+        try:
+            response = vectara_client.resolve(client).post(
+                path,
+                idempotent=idempotent,
+                json=request(batch),
+                verify=True,
+                headers=post_headers,
+            )
+            if response.status_code != 200:
+                logging.error(
+                    "%s failed with code %d, reason %s, text %s",
+                    name,
+                    response.status_code,
+                    response.reason,
+                    response.text,
+                )
+                return _failed(batch, str(response))
+
+            message = response.json()
+            key_statuses = statuses(message)
+            if len(key_statuses) != len(batch):
+                logging.error("%s returned %d statuses for %d keys: %s",
+                              name, len(key_statuses), len(batch), message)
+                return _failed(batch, str(message))
+
+            # A malformed status fails the whole batch rather than the other batches too.
+            results = []
+            for key, (key_id, status) in zip(batch, key_statuses):
+                created = status.get("code") == "OK"
+                if isinstance(key, str):
+                    key_id = key
+                elif not created:
+                    key_id = None
+                results.append(ApiKeyResult(key=key, key_id=key_id, status=status))
+            return results
+        except (requests.RequestException, ValueError, KeyError, AttributeError,
+                TypeError) as error:
+            return _failed(batch, str(error))
+
+    results = batching.send_all(keys, batch_size, max_workers, send)
+    failed = sum(not result.ok for result in results)
+    if failed:
+        logging.warning("%s failed for %d of %d keys", name, failed, len(results))
+    return results
+
+
+def _failed(batch: list[Union[NewApiKey, str]], detail: str) -> list[ApiKeyResult]:
+    """Helper function to mark every key of a failed request REQUEST_FAILED."""
+    status = {"code": batching.REQUEST_FAILED, "statusDetail": detail}
+    return [ApiKeyResult(key=key, key_id=key if isinstance(key, str) else None,
+                         status=status)
+            for key in batch]
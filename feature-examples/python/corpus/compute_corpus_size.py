@@ -1,23 +1,27 @@
 """Example of using the Vectara REST API to compute corpus size."""
 import logging
-
-import requests
+from typing import Optional
 
 from corpus import data_objects
 from corpus import exceptions
+from utils import utils
+from utils import vectara_client
 
 
 def compute_corpus_size(
     customer_id: int,
     corpus_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> data_objects.CorpusSize:
     """Computes a corpus size.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: Corpus ID for which size needs to be computed.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         CorpusSize object
@@ -27,17 +31,17 @@ def compute_corpus_size(
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     request = {"corpusId": corpus_id}
 
-    response = requests.post(
-        "https://api.vectara.io/v1/compute-corpus-size",
+    response = vectara_client.resolve(client).post(
+        "/v1/compute-corpus-size",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
+        idempotent=True,
     )
 
     if response.status_code != 200:
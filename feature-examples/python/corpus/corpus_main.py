@@ -8,7 +8,10 @@ from corpus import compute_corpus_size
 from corpus import disable_corpus
 from corpus import read_corpus
 from corpus import read_usage_metrics
+from corpus import report_corpora
+from corpus import usage_metrics_collector
 from utils import utils
+from utils import vectara_client
 
 
 def main() -> None:
@@ -23,12 +26,18 @@ def main() -> None:
         required=True,
         help="Unique customer ID in Vectara platform.",
     )
-    parser.add_argument(
+    corpus_group = parser.add_mutually_exclusive_group(required=True)
+    corpus_group.add_argument(
         "--corpus-id",
         type=int,
-        required=True,
         help="Corpus ID on which operations will be performed.",
     )
+    corpus_group.add_argument(
+        "--report-corpus-ids",
+        type=int,
+        nargs="+",
+        help="Only report the info, size and usage metrics of these corpora.",
+    )
     parser.add_argument(
         "--app-client-id",
         required=True,
@@ -38,6 +47,28 @@ def main() -> None:
     parser.add_argument(
         "--auth-url", required=True, help="The auth url for this customer."
     )
+    parser.add_argument(
+        "--base-url",
+        default=vectara_client.DEFAULT_BASE_URL,
+        help="Base URL of the Vectara REST API, e.g., a local stand-in server.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent calls when reporting on many corpora.",
+    )
+    parser.add_argument(
+        "--usage-store",
+        help="Collect the hourly usage metrics of the corpus into this file, reading "
+        "only the intervals completed since the last run.",
+    )
+    parser.add_argument(
+        "--usage-start-epoch-secs",
+        type=int,
+        default=read_usage_metrics.DEFAULT_START_EPOCH_SECS,
+        help="Start of the usage metrics collected into a new --usage-store.",
+    )
 
     args = parser.parse_args()
 
@@ -48,20 +79,49 @@ def main() -> None:
         logging.error("Failed to get JWT token.")
         sys.exit(1)
 
-    usage_metrics = read_usage_metrics.read_usage_metrics(args.customer_id,
-                                                          args.corpus_id,
-                                                          jwt_token)
-    logging.info("ReadUsageMetrics response: %s", usage_metrics)
+    client = vectara_client.VectaraClient(args.base_url, pool_maxsize=args.max_workers)
+
+    if args.report_corpus_ids:
+        reports = report_corpora.report_corpora(args.customer_id,
+                                                args.report_corpus_ids,
+                                                jwt_token,
+                                                args.max_workers,
+                                                client)
+        for report in reports:
+            logging.info("Corpus report: %s", report)
+        return
+
+    if args.usage_store:
+        with usage_metrics_collector.UsageStore(args.usage_store) as store:
+            appended = usage_metrics_collector.collect(args.customer_id,
+                                                       [args.corpus_id],
+                                                       jwt_token,
+                                                       store,
+                                                       args.usage_start_epoch_secs,
+                                                       max_workers=args.max_workers,
+                                                       client=client)
+            columns = store.read_columns([args.corpus_id])
+            logging.info("Collected %d new usage intervals, %d stored.",
+                         appended[args.corpus_id], len(columns))
+            logging.info("Total (rows read, queries) of the stored usage: %s",
+                         columns.totals().get(args.corpus_id))
+    else:
+        usage_metrics = read_usage_metrics.read_usage_metrics(args.customer_id,
+                                                              args.corpus_id,
+                                                              jwt_token,
+                                                              client=client)
+        logging.info("ReadUsageMetrics response: %s", usage_metrics)
 
-    corpus = read_corpus.read_corpus(args.customer_id, args.corpus_id, jwt_token)
+    corpus = read_corpus.read_corpus(args.customer_id, args.corpus_id, jwt_token, client)
     logging.info("ReadCorpus response: %s", corpus)
 
     corpus_size = compute_corpus_size.compute_corpus_size(args.customer_id,
                                                           args.corpus_id,
-                                                          jwt_token)
+                                                          jwt_token,
+                                                          client)
     logging.info("ComputeCorpusSize response: %s", corpus_size)
 
-    disable_corpus.disable_corpus(args.customer_id, args.corpus_id, jwt_token)
+    disable_corpus.disable_corpus(args.customer_id, args.corpus_id, jwt_token, client)
     logging.info("DisableCorpus corpus id: %d", args.corpus_id)
 
 
@@ -1,10 +1,15 @@
 """Data objects for corpus module. """
 import dataclasses
+from typing import Optional
+
+from utils import slots
 
 
 @dataclasses.dataclass(frozen=True)
-class Corpus:
+class Corpus(slots.FrozenSlots):
     """Basic Corpus data."""
+
+    __slots__ = ("corpus_id", "name", "description", "dt_provisioned", "enabled")
     corpus_id: int
     name: str
     description: str
@@ -13,15 +18,19 @@ class Corpus:
 
 
 @dataclasses.dataclass(frozen=True)
-class CorpusSize:
+class CorpusSize(slots.FrozenSlots):
     """Corpus Size information"""
+
+    __slots__ = ("epoch_secs", "size")
     epoch_secs: int
     size: int
 
 
 @dataclasses.dataclass(frozen=True)
-class ApiKey:
+class ApiKey(slots.FrozenSlots):
     """API Key information"""
+
+    __slots__ = ("api_key", "description", "key_type", "enabled")
     api_key: str
     description: str
     key_type: str
@@ -29,8 +38,10 @@ class ApiKey:
 
 
 @dataclasses.dataclass(frozen=True)
-class CorpusInfo:
+class CorpusInfo(slots.FrozenSlots):
     """All corpus data such as id, name, size, associated api keys etc."""
+
+    __slots__ = ("corpus", "status", "size", "size_status", "api_keys", "api_keys_status")
     corpus: Corpus
     status: str
     size: CorpusSize
@@ -40,8 +51,25 @@ class CorpusInfo:
 
 
 @dataclasses.dataclass(frozen=True)
-class QueryUsageData:
+class QueryUsageData(slots.FrozenSlots):
     """Query usage information"""
+
+    __slots__ = ("rows_read", "query_count", "start_time")
     rows_read: int
     query_count: int
     start_time: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CorpusReport(slots.FrozenSlots):
+    """Corpus information together with its freshly computed size and usage metrics.
+
+    computed_size and usage_metrics are None when the corresponding call failed, in
+    which case errors holds the reason.
+    """
+
+    __slots__ = ("corpus_info", "computed_size", "usage_metrics", "errors")
+    corpus_info: CorpusInfo
+    computed_size: Optional[CorpusSize]
+    usage_metrics: Optional[list[QueryUsageData]]
+    errors: list[str]
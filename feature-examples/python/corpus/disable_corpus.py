@@ -1,40 +1,43 @@
 """Example of using the Vectara REST API to disable a Corpus."""
 
 import logging
-
-import requests
+from typing import Optional
 
 from corpus import exceptions
+from utils import utils
+from utils import vectara_client
 
 
 def disable_corpus(
     customer_id: int,
     corpus_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> None:
     """Disables a Corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to be disabled.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Raises:
         CorpusException: In case of any error.
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     request = {"corpusId": corpus_id, "enable": False}
 
-    response = requests.post(
-        "https://api.vectara.io/v1/update-corpus-enablement",
+    response = vectara_client.resolve(client).post(
+        "/v1/update-corpus-enablement",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
@@ -1,24 +1,29 @@
 """Example of using the Vectara REST API to read the corpus info."""
 
 import logging
-
-import requests
+from typing import Optional
 
 from corpus import data_objects
 from corpus import exceptions
+from utils import slots
+from utils import utils
+from utils import vectara_client
 
 
 def read_corpus(
     customer_id: int,
     corpus_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> data_objects.CorpusInfo:
     """Retrieves the Corpus information.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: Corpus ID to be read.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         CorpusInfo object.
@@ -26,14 +31,54 @@ def read_corpus(
     Raises:
         CorpusException: In case of any error.
     """
+    message = _read(customer_id, [corpus_id], jwt_token, client)
+    if message["corpora"] is None or len(message["corpora"]) == 0:
+        raise exceptions.CorpusException("Corpus not found")
+
+    return _corpus_info_from_message(message["corpora"][0])
+
+
+def read_corpora(
+    customer_id: int,
+    corpus_ids: list[int],
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[data_objects.CorpusInfo]:
+    """Retrieves the information of many corpora with a single request.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_ids: IDs of the corpora to be read.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        CorpusInfo objects of the corpora found, in the order returned by the server.
+
+    Raises:
+        CorpusException: In case of any error.
+    """
+    message = _read(customer_id, corpus_ids, jwt_token, client)
+    return [_corpus_info_from_message(corpus_info)
+            for corpus_info in message["corpora"] or []]
+
+
+def _read(
+    customer_id: int,
+    corpus_ids: list[int],
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient],
+) -> dict:
+    """Helper function to send a read-corpus request and return its response message."""
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
-    # A request can contain multiple corpus ids, but we are only interested in one.
+    # A single request can read any number of corpora.
     request = {
-        "corpusId": [corpus_id],
+        "corpusId": corpus_ids,
         "readBasicInfo": True,
         "readSize": True,
         "readApiKeys": True,
@@ -41,12 +86,12 @@ def read_corpus(
         "readFilterAttributes": False,
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/read-corpus",
+    response = vectara_client.resolve(client).post(
+        "/v1/read-corpus",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
+        idempotent=True,
     )
 
     if response.status_code != 200:
@@ -58,11 +103,11 @@ def read_corpus(
         )
         raise exceptions.CorpusException(str(response))
 
-    message = response.json()
-    if message["corpora"] is None or len(message["corpora"]) == 0:
-        raise exceptions.CorpusException("Corpus not found")
+    return response.json()
+
 
-    corpus_info = message["corpora"][0]
+def _corpus_info_from_message(corpus_info: dict) -> data_objects.CorpusInfo:
+    """Helper function to parse one corpus of the response message."""
     corpus = corpus_info["corpus"]
 
     return data_objects.CorpusInfo(
@@ -73,20 +118,20 @@ def read_corpus(
             dt_provisioned=corpus["dtProvision"],
             enabled=corpus["enabled"],
         ),
-        status=corpus_info["corpusStatus"],
+        status=slots.intern(corpus_info["corpusStatus"]),
         size=data_objects.CorpusSize(
             epoch_secs=corpus_info["size"]["epochSecs"],
             size=corpus_info["size"]["size"],
         ),
-        size_status=corpus_info["sizeStatus"],
+        size_status=slots.intern(corpus_info["sizeStatus"]),
         api_keys=[
             data_objects.ApiKey(
                 api_key=api_key["id"],
                 description=api_key["description"],
-                key_type=api_key["keyType"],
+                key_type=slots.intern(api_key["keyType"]),
                 enabled=api_key["enabled"],
             )
             for api_key in corpus_info["apiKey"]
         ],
-        api_keys_status=corpus_info["apiKeyStatus"],
+        api_keys_status=slots.intern(corpus_info["apiKeyStatus"]),
     )
@@ -1,24 +1,41 @@
 """Example of using the Vectara REST API to read usage metrics."""
 
 import logging
-
-import requests
+from typing import Optional
 
 from corpus import data_objects
 from corpus import exceptions
+from corpus import usage_columns
+from utils import utils
+from utils import vectara_client
+
+# Window read when none is given.
+DEFAULT_START_EPOCH_SECS = 1703462400  # 2023-12-25T00:00:00.00Z
+DEFAULT_END_EPOCH_SECS = 1704196800  # 2024-01-02T12:00:00.00Z
+
+DEFAULT_INTERVAL_SECS = 3600  # 1 Hour
 
 
 def read_usage_metrics(
     customer_id: int,
     corpus_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    start_epoch_secs: int = DEFAULT_START_EPOCH_SECS,
+    end_epoch_secs: int = DEFAULT_END_EPOCH_SECS,
+    interval_secs: int = DEFAULT_INTERVAL_SECS,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> list[data_objects.QueryUsageData]:
     """Reads usage metrics for a corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: Corpus ID for which usage metrics are to be read.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        start_epoch_secs: Start of the window to read, inclusive.
+        end_epoch_secs: End of the window to read, exclusive.
+        interval_secs: Length of the intervals the metrics are aggregated by.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         List of UsageData objects aggregated by interval.
@@ -26,28 +43,78 @@ def read_usage_metrics(
     Raises:
         CorpusException: In case of any error.
     """
+    # The values are int64 fields, which the JSON mapping of proto3 encodes as strings.
+    return [
+        data_objects.QueryUsageData(
+            rows_read=int(usage["servingValue"]["rowsRead"]),
+            query_count=int(usage["servingValue"]["queryCount"]),
+            start_time=int(usage["servingValue"]["startEpochSecs"]),
+        )
+        for usage in _read_values(customer_id, corpus_id, jwt_token, start_epoch_secs,
+                                  end_epoch_secs, interval_secs, client)
+    ]
+
+
+def read_usage_columns(
+    customer_id: int,
+    corpus_id: int,
+    jwt_token: utils.Token,
+    start_epoch_secs: int = DEFAULT_START_EPOCH_SECS,
+    end_epoch_secs: int = DEFAULT_END_EPOCH_SECS,
+    interval_secs: int = DEFAULT_INTERVAL_SECS,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> usage_columns.UsageColumns:
+    """Reads usage metrics for a corpus into columns, without an object per interval.
+
+    See read_usage_metrics for the arguments.
+
+    Returns:
+        UsageColumns holding the usage of every interval.
+
+    Raises:
+        CorpusException: In case of any error.
+    """
+    columns = usage_columns.UsageColumns()
+    for usage in _read_values(customer_id, corpus_id, jwt_token, start_epoch_secs,
+                              end_epoch_secs, interval_secs, client):
+        value = usage["servingValue"]
+        columns.append(corpus_id, int(value["startEpochSecs"]), int(value["rowsRead"]),
+                       int(value["queryCount"]))
+    return columns
+
+
+def _read_values(
+    customer_id: int,
+    corpus_id: int,
+    jwt_token: utils.Token,
+    start_epoch_secs: int,
+    end_epoch_secs: int,
+    interval_secs: int,
+    client: Optional[vectara_client.VectaraClient],
+) -> list[dict]:
+    """Helper function to send the request and return the usage values of the response."""
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # corpusId in request can be left unset to retrieve usage metrics for all the corpora.
     request = {
         "corpusId": corpus_id,
         "window": {
-            "startEpochSecs": 1703462400, # 2023-12-25T00:00:00.00Z
-            "endEpochSecs": 1704196800 # 2024-01-02T12:00:00.00Z
+            "startEpochSecs": start_epoch_secs,
+            "endEpochSecs": end_epoch_secs,
         },
         "type": "METRICTYPE__SERVING",
-        "aggreagationIntervalSecs": "3600",  # 1 Hour
+        "aggreagationIntervalSecs": f"{interval_secs}",
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/get-usage-metrics",
+    response = vectara_client.resolve(client).post(
+        "/v1/get-usage-metrics",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
+        idempotent=True,
     )
 
     if response.status_code != 200:
@@ -64,13 +131,6 @@ def read_usage_metrics(
         if message["status"]["code"] != "OK":
             raise exceptions.CorpusException(str(message["status"]))
 
-        return [
-            data_objects.QueryUsageData(
-                rows_read=usage["servingValue"]["rowsRead"],
-                query_count=usage["servingValue"]["queryCount"],
-                start_time=usage["servingValue"]["startEpochSecs"],
-            )
-            for usage in message["values"]
-        ]
+        return message["values"]
 
     raise exceptions.CorpusException(str(message))
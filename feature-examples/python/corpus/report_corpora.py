@@ -0,0 +1,90 @@
+"""Example of reporting on many corpora with a single read-corpus call."""
+
+import logging
+from concurrent import futures
+from typing import Optional
+
+import requests
+
+from corpus import compute_corpus_size
+from corpus import data_objects
+from corpus import exceptions
+from corpus import read_corpus
+from corpus import read_usage_metrics
+from utils import utils
+from utils import vectara_client
+
+
+def report_corpora(
+    customer_id: int,
+    corpus_ids: list[int],
+    jwt_token: utils.Token,
+    max_workers: int = 8,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[data_objects.CorpusReport]:
+    """Reads the info, computed size and usage metrics of many corpora.
+
+    The info of every corpus comes from one batched read-corpus request. The size and
+    usage metric calls of all corpora then run concurrently on at most max_workers
+    threads, so the report takes roughly len(corpus_ids) / max_workers round trips
+    instead of three per corpus.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_ids: IDs of the corpora to report on.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        max_workers: Maximum number of size and usage metric calls in flight.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One CorpusReport per corpus found, in the order returned by read-corpus. A
+        failed size or usage metric call is recorded in the errors of its report.
+
+    Raises:
+        CorpusException: If the read-corpus call fails.
+    """
+    corpora = read_corpus.read_corpora(customer_id, corpus_ids, jwt_token, client)
+    missing = set(corpus_ids) - {info.corpus.corpus_id for info in corpora}
+    if missing:
+        logging.warning("ReadCorpus did not return corpora: %s", sorted(missing))
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = [
+            (
+                info,
+                executor.submit(compute_corpus_size.compute_corpus_size,
+                                customer_id, info.corpus.corpus_id, jwt_token, client),
+                executor.submit(read_usage_metrics.read_usage_metrics,
+                                customer_id, info.corpus.corpus_id, jwt_token,
+                                client=client),
+            )
+            for info in corpora
+        ]
+        return [_report(info, size_future, usage_future)
+                for info, size_future, usage_future in pending]
+
+
+def _report(
+    info: data_objects.CorpusInfo,
+    size_future: futures.Future,
+    usage_future: futures.Future,
+) -> data_objects.CorpusReport:
+    """Helper function to build the report of one corpus once its calls complete."""
+    errors = []
+    computed_size = usage_metrics = None
+    try:
+        computed_size = size_future.result()
+    except (exceptions.CorpusException, requests.RequestException) as error:
+        errors.append(f"ComputeCorpusSize: {error}")
+    try:
+        usage_metrics = usage_future.result()
+    except (exceptions.CorpusException, requests.RequestException) as error:
+        errors.append(f"ReadUsageMetrics: {error}")
+
+    return data_objects.CorpusReport(
+        corpus_info=info,
+        computed_size=computed_size,
+        usage_metrics=usage_metrics,
+        errors=errors,
+    )
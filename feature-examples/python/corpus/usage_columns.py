@@ -0,0 +1,205 @@
+"""Columnar usage metrics for aggregating many corpora and long date ranges.
+
+UsageColumns holds one array of 64-bit integers per field instead of one QueryUsageData
+per interval: a year of hourly metrics of a corpus takes 8760 * 32 bytes. Rollups and
+percentiles are computed with NumPy when it is installed (pip3 install numpy), and with
+plain loops over the arrays otherwise. Columns are handed to NumPy, pandas and Arrow
+without copying.
+
+Usage:
+    columns = read_usage_metrics.read_usage_columns(customer_id, corpus_id, jwt_token)
+    daily = columns.rollup(usage_columns.DAY_SECS)
+    frame = daily.to_pandas()
+"""
+
+import array
+import collections
+import math
+from typing import Iterable, Optional
+
+from corpus import data_objects
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DAY_SECS = 24 * 3600
+WEEK_SECS = 7 * DAY_SECS
+
+# Origin of weekly rollups starting on Mondays: 1970-01-05T00:00:00Z.
+MONDAY_EPOCH_SECS = 4 * DAY_SECS
+
+COLUMNS = ("corpus_id", "start_time", "rows_read", "query_count")
+
+# Type code of signed 64-bit integers.
+_TYPECODE = "q"
+
+
+class UsageColumns:
+    """Usage metrics of intervals of one or more corpora, one array per field.
+
+    While a NumPy, pandas or Arrow view of the columns is alive, appending raises
+    BufferError, since the arrays cannot move in memory while they are shared.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self):
+        self.corpus_id = array.array(_TYPECODE)
+        self.start_time = array.array(_TYPECODE)
+        self.rows_read = array.array(_TYPECODE)
+        self.query_count = array.array(_TYPECODE)
+
+    @classmethod
+    def from_usage(cls, corpus_id: int,
+                   usage: Iterable[data_objects.QueryUsageData]) -> "UsageColumns":
+        """Returns the columns of the usage of a corpus."""
+        columns = cls()
+        for data in usage:
+            columns.append(corpus_id, data.start_time, data.rows_read, data.query_count)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.start_time)
+
+    def append(self, corpus_id: int, start_time: int, rows_read: int, query_count: int):
+        """Appends the usage of one interval."""
+        self.corpus_id.append(corpus_id)
+        self.start_time.append(start_time)
+        self.rows_read.append(rows_read)
+        self.query_count.append(query_count)
+
+    def extend(self, other: "UsageColumns"):
+        """Appends every interval of other."""
+        for name in COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_usage(self) -> list[data_objects.QueryUsageData]:
+        """Returns one QueryUsageData per interval, dropping the corpus IDs."""
+        return [data_objects.QueryUsageData(rows_read=rows_read, query_count=query_count,
+                                            start_time=start_time)
+                for start_time, rows_read, query_count
+                in zip(self.start_time, self.rows_read, self.query_count)]
+
+    def to_numpy(self) -> dict:
+        """Returns an int64 NumPy array per column, sharing memory with the columns.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        _require_numpy()
+        return {name: numpy.frombuffer(getattr(self, name), dtype=numpy.int64)
+                for name in COLUMNS}
+
+    def to_pandas(self):
+        """Returns a pandas.DataFrame with a column per field, sharing memory with the columns.
+
+        Raises:
+            ImportError: If pandas is not installed.
+        """
+        import pandas  # pylint: disable=import-outside-toplevel
+        return pandas.DataFrame(self.to_numpy(), copy=False)
+
+    def to_arrow(self):
+        """Returns a pyarrow.Table with a column per field, sharing memory with the columns.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        arrays = self.to_numpy()
+        return pyarrow.table({name: pyarrow.array(values) for name, values in arrays.items()})
+
+    def rollup(self, period_secs: int, origin_epoch_secs: int = 0) -> "UsageColumns":
+        """Returns the sums of rows read and queries per corpus and period.
+
+        Args:
+            period_secs: Length of the periods, e.g., DAY_SECS or WEEK_SECS.
+            origin_epoch_secs: Start of a period, e.g., MONDAY_EPOCH_SECS for weeks
+                starting on Mondays.
+
+        Returns:
+            UsageColumns with one row per corpus and period holding usage, ordered by
+            corpus ID and period, whose start_time is the start of the period.
+        """
+        if numpy is None:
+            sums = collections.defaultdict(lambda: [0, 0])
+            for corpus_id, start_time, rows_read, query_count in zip(
+                    self.corpus_id, self.start_time, self.rows_read, self.query_count):
+                period = start_time - (start_time - origin_epoch_secs) % period_secs
+                total = sums[(corpus_id, period)]
+                total[0] += rows_read
+                total[1] += query_count
+            result = UsageColumns()
+            for (corpus_id, period), (rows_read, query_count) in sorted(sums.items()):
+                result.append(corpus_id, period, rows_read, query_count)
+            return result
+
+        if not self:
+            return UsageColumns()
+        columns = self.to_numpy()
+        start_time = columns["start_time"]
+        periods = start_time - (start_time - origin_epoch_secs) % period_secs
+        return _group_sums(columns["corpus_id"], periods, columns)
+
+    def totals(self) -> dict[int, tuple[int, int]]:
+        """Returns the total (rows read, query count) of every corpus."""
+        if numpy is None:
+            sums = collections.defaultdict(lambda: [0, 0])
+            for corpus_id, rows_read, query_count in zip(self.corpus_id, self.rows_read,
+                                                         self.query_count):
+                total = sums[corpus_id]
+                total[0] += rows_read
+                total[1] += query_count
+            return {corpus_id: tuple(total) for corpus_id, total in sorted(sums.items())}
+
+        if not self:
+            return {}
+        columns = self.to_numpy()
+        sums = _group_sums(columns["corpus_id"], numpy.zeros_like(columns["corpus_id"]),
+                           columns)
+        return {int(corpus_id): (int(rows_read), int(query_count))
+                for corpus_id, rows_read, query_count
+                in zip(sums.corpus_id, sums.rows_read, sums.query_count)}
+
+    def percentile(self, column: str, percent: float) -> Optional[float]:
+        """Returns a percentile of a column, interpolated linearly, or None if empty.
+
+        Args:
+            column: rows_read or query_count.
+            percent: Percentile between 0 and 100, e.g., 95.
+        """
+        if not self:
+            return None
+        if numpy is not None:
+            return float(numpy.percentile(self.to_numpy()[column], percent))
+        values = sorted(getattr(self, column))
+        position = (len(values) - 1) * percent / 100
+        low, high = math.floor(position), math.ceil(position)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def _group_sums(corpus_ids, periods, columns: dict) -> UsageColumns:
+    """Returns the sums of rows read and queries per (corpus ID, period) with NumPy."""
+    same_corpus = corpus_ids[1:] == corpus_ids[:-1]
+    ordered = numpy.all((corpus_ids[1:] > corpus_ids[:-1]) |
+                        (same_corpus & (periods[1:] >= periods[:-1])))
+    # Columns read from the API or a UsageStore are already ordered, and need no sort.
+    order = slice(None) if ordered else numpy.lexsort((periods, corpus_ids))
+    corpus_ids, periods = corpus_ids[order], periods[order]
+    starts = numpy.flatnonzero(numpy.concatenate((
+        [True], (corpus_ids[1:] != corpus_ids[:-1]) | (periods[1:] != periods[:-1]))))
+    result = UsageColumns()
+    result.corpus_id.frombytes(corpus_ids[starts].tobytes())
+    result.start_time.frombytes(periods[starts].tobytes())
+    for name in ("rows_read", "query_count"):
+        sums = numpy.add.reduceat(columns[name][order], starts)
+        getattr(result, name).frombytes(sums.astype(numpy.int64).tobytes())
+    return result
+
+
+def _require_numpy():
+    """Raises ImportError if NumPy is not installed."""
+    if numpy is None:
+        raise ImportError("Converting usage columns needs numpy: pip3 install numpy")
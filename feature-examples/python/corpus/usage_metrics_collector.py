@@ -0,0 +1,257 @@
+"""Incremental collection of usage metrics into a local append-only store.
+
+collect() splits a date range into windows of a bounded number of intervals, reads the
+windows of every corpus concurrently and appends them to a UsageStore. The store records
+how far each corpus has been collected, so the next run only reads the intervals that
+completed since, instead of downloading the whole range again.
+
+Usage:
+    with usage_metrics_collector.UsageStore("usage.csv") as store:
+        usage_metrics_collector.collect(customer_id, [corpus_id], jwt_token, store,
+                                        start_epoch_secs=1704067200)
+        hourly = store.read(corpus_id)
+"""
+
+import collections
+import logging
+import os
+import time
+from concurrent import futures
+from typing import Iterable, Optional
+
+from corpus import data_objects
+from corpus import read_usage_metrics
+from corpus import usage_columns
+from utils import utils
+from utils import vectara_client
+
+# Intervals read per request: a month of hourly intervals.
+DEFAULT_WINDOW_INTERVALS = 24 * 31
+
+_HEADER_PREFIX = "# vectara usage metrics, interval_secs="
+
+
+def split_window(start_epoch_secs: int, end_epoch_secs: int, interval_secs: int,
+                 window_intervals: int = DEFAULT_WINDOW_INTERVALS) -> list[tuple[int, int]]:
+    """Splits a date range into consecutive windows of at most window_intervals intervals.
+
+    Args:
+        start_epoch_secs: Start of the range. Rounded down to a multiple of interval_secs.
+        end_epoch_secs: End of the range, exclusive.
+        interval_secs: Length of the intervals the metrics are aggregated by.
+        window_intervals: Maximum number of intervals per window.
+
+    Returns:
+        (start, end) pairs covering the range, in order.
+    """
+    start = start_epoch_secs - start_epoch_secs % interval_secs
+    window_secs = interval_secs * window_intervals
+    return [(window_start, min(window_start + window_secs, end_epoch_secs))
+            for window_start in range(start, end_epoch_secs, window_secs)]
+
+
+class UsageStore:
+    """Usage metrics keyed by (corpus ID, interval start), kept in an append-only file.
+
+    Each line of the file is either the usage of one interval of a corpus, or a marker
+    that a corpus has been collected up to a time. A marker is appended after the usage
+    of its window, so a window interrupted by a crash is read again by the next run, and
+    the usage read last for an interval wins when the file is loaded.
+
+    A store holds metrics of one aggregation interval. It is not thread safe.
+    """
+
+    def __init__(self, path: str,
+                 interval_secs: int = read_usage_metrics.DEFAULT_INTERVAL_SECS):
+        """Opens the store at path, creating it if it does not exist.
+
+        Args:
+            path: Path of the file.
+            interval_secs: Length of the intervals the metrics are aggregated by.
+
+        Raises:
+            ValueError: If the file holds metrics of another aggregation interval.
+        """
+        self.interval_secs = interval_secs
+        self._usage = collections.defaultdict(dict)
+        self._collected_until = {}
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        complete = self._load(path) if exists else True
+        self._file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        if not exists:
+            self._file.write(f"{_HEADER_PREFIX}{interval_secs}\n")
+        elif not complete:
+            # Start on a new line after a line cut short by a crash.
+            self._file.write("\n")
+        self._file.flush()
+
+    def _load(self, path: str) -> bool:
+        """Reads an existing file and returns whether its last line is complete.
+
+        A last line cut short by a crash is skipped.
+        """
+        with open(path, encoding="utf-8") as store_file:
+            line = store_file.readline()
+            header = line.rstrip("\n")
+            if header != f"{_HEADER_PREFIX}{self.interval_secs}":
+                raise ValueError(f"{path} does not hold metrics of {self.interval_secs}s "
+                                 f"intervals: {header!r}")
+            for line in store_file:
+                if not line.endswith("\n"):
+                    logging.warning("Skipping incomplete last line of %s: %r", path, line)
+                    break
+                fields = line.rstrip("\n").split(",")
+                try:
+                    if fields[0] == "usage" and len(fields) == 5:
+                        corpus_id, start_time, rows_read, query_count = map(int, fields[1:])
+                        self._usage[corpus_id][start_time] = (rows_read, query_count)
+                    elif fields[0] == "until" and len(fields) == 3:
+                        corpus_id, until = int(fields[1]), int(fields[2])
+                        self._collected_until[corpus_id] = max(
+                            until, self._collected_until.get(corpus_id, until))
+                    else:
+                        raise ValueError(line)
+                except ValueError:
+                    logging.warning("Skipping malformed line of %s: %r", path, line)
+        return line.endswith("\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the file."""
+        self._file.close()
+
+    def collected_until(self, corpus_id: int) -> Optional[int]:
+        """Returns the time up to which a corpus has been collected, or None."""
+        return self._collected_until.get(corpus_id)
+
+    def append(self, corpus_id: int, usage: list[data_objects.QueryUsageData],
+               until: int):
+        """Appends the usage of a window of a corpus, ending at until, and flushes it."""
+        lines = [f"usage,{corpus_id},{data.start_time},{data.rows_read},{data.query_count}\n"
+                 for data in usage]
+        lines.append(f"until,{corpus_id},{until}\n")
+        self._file.writelines(lines)
+        self._file.flush()
+        intervals = self._usage[corpus_id]
+        for data in usage:
+            intervals[data.start_time] = (data.rows_read, data.query_count)
+        self._collected_until[corpus_id] = max(until, self._collected_until.get(corpus_id,
+                                                                                 until))
+
+    def read(self, corpus_id: int,
+             start_epoch_secs: Optional[int] = None,
+             end_epoch_secs: Optional[int] = None) -> list[data_objects.QueryUsageData]:
+        """Returns the stored usage of a corpus within a range, ordered by start time."""
+        return [data_objects.QueryUsageData(rows_read=rows_read, query_count=query_count,
+                                            start_time=start_time)
+                for start_time, (rows_read, query_count)
+                in sorted(self._usage.get(corpus_id, {}).items())
+                if (start_epoch_secs is None or start_time >= start_epoch_secs) and
+                (end_epoch_secs is None or start_time < end_epoch_secs)]
+
+    def read_columns(self,
+                     corpus_ids: Optional[Iterable[int]] = None,
+                     start_epoch_secs: Optional[int] = None,
+                     end_epoch_secs: Optional[int] = None) -> usage_columns.UsageColumns:
+        """Returns the stored usage of corpora within a range as columns.
+
+        Args:
+            corpus_ids: IDs of the corpora to return. Defaults to every stored corpus.
+            start_epoch_secs: Optional start of the range, inclusive.
+            end_epoch_secs: Optional end of the range, exclusive.
+
+        Returns:
+            UsageColumns ordered by corpus ID and start time.
+        """
+        columns = usage_columns.UsageColumns()
+        for corpus_id in sorted(self._usage if corpus_ids is None else corpus_ids):
+            for start_time, (rows_read, query_count) in sorted(
+                    self._usage.get(corpus_id, {}).items()):
+                if ((start_epoch_secs is None or start_time >= start_epoch_secs) and
+                        (end_epoch_secs is None or start_time < end_epoch_secs)):
+                    columns.append(corpus_id, start_time, rows_read, query_count)
+        return columns
+
+
+def collect(
+    customer_id: int,
+    corpus_ids: Iterable[int],
+    jwt_token: utils.Token,
+    store: UsageStore,
+    start_epoch_secs: int,
+    end_epoch_secs: Optional[int] = None,
+    window_intervals: int = DEFAULT_WINDOW_INTERVALS,
+    max_workers: int = 8,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> dict[int, int]:
+    """Reads the usage metrics of corpora that are not in the store yet and appends them.
+
+    Each corpus is read from where the store says its last collection ended, or from
+    start_epoch_secs the first time, so intervals before that point are never read
+    again. Intervals that have not completed yet are not read, since their metrics may
+    still grow. Windows are read concurrently and appended in order.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_ids: IDs of the corpora to collect.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        store: UsageStore receiving the metrics.
+        start_epoch_secs: Start of the range to collect.
+        end_epoch_secs: End of the range to collect. Defaults to the end of the last
+            completed interval.
+        window_intervals: Maximum number of intervals read per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        The number of intervals appended per corpus.
+
+    Raises:
+        CorpusException: If a window could not be read. The windows read before it are
+            stored, so the next run resumes with the failed window.
+        requests.RequestException: If a request failed before getting a response.
+    """
+    interval_secs = store.interval_secs
+    now = int(time.time())
+    completed_until = now - now % interval_secs
+    end = completed_until if end_epoch_secs is None else min(end_epoch_secs, completed_until)
+
+    corpus_ids = list(corpus_ids)
+    windows = []
+    for corpus_id in corpus_ids:
+        begin = max(start_epoch_secs, store.collected_until(corpus_id) or start_epoch_secs)
+        windows.extend((corpus_id, window)
+                       for window in split_window(begin, end, interval_secs, window_intervals))
+
+    appended = dict.fromkeys(corpus_ids, 0)
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+
+        def append_oldest():
+            corpus_id, window_end, future = pending.popleft()
+            usage = future.result()
+            store.append(corpus_id, usage, window_end)
+            appended[corpus_id] += len(usage)
+
+        try:
+            for corpus_id, (window_start, window_end) in windows:
+                future = executor.submit(read_usage_metrics.read_usage_metrics,
+                                         customer_id, corpus_id, jwt_token,
+                                         window_start, window_end, interval_secs,
+                                         client=client)
+                pending.append((corpus_id, window_end, future))
+                if len(pending) >= 2 * max_workers:
+                    append_oldest()
+            while pending:
+                append_oldest()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    return appended
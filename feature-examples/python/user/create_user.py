@@ -1,21 +1,25 @@
 """Example of using the Vectara REST API to create a User."""
 
 import logging
-
-import requests
+from typing import Optional
 
 from user import exceptions
+from utils import utils
+from utils import vectara_client
 
 
 def create_user(
     customer_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> int:
     """Creates a User.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         ID of the created user.
@@ -25,7 +29,7 @@ def create_user(
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # A request can contain multiple users. We are creating only one.
@@ -45,12 +49,11 @@ def create_user(
         ]
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/manage-user",
+    response = vectara_client.resolve(client).post(
+        "/v1/manage-user",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
@@ -1,23 +1,27 @@
 """Example of using the Vectara REST API to delete a User."""
 
 import logging
-
-import requests
+from typing import Optional
 
 from user import exceptions
+from utils import utils
+from utils import vectara_client
 
 
 def delete_user(
     customer_id: int,
     user_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> None:
     """Deletes a User.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         user_id: ID of the user to be deleted.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         None.
@@ -27,7 +31,7 @@ def delete_user(
     """
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
     # A request can contain multiple users. We are deleting only one.
@@ -42,12 +46,11 @@ def delete_user(
         ]
     }
 
-    response = requests.post(
-        "https://api.vectara.io/v1/manage-user",
+    response = vectara_client.resolve(client).post(
+        "/v1/manage-user",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
     )
 
     if response.status_code != 200:
@@ -2,16 +2,21 @@
 
 import dataclasses
 import logging
-
-import requests
+from typing import Iterator, Optional
 
 from user import exceptions
+from utils import pagination
+from utils import slots
+from utils import utils
+from utils import vectara_client
 
 
 @dataclasses.dataclass(frozen=True)
-class UserData:
+class UserData(slots.FrozenSlots):
     """User data such as id, name, comment, status of user etc."""
 
+    __slots__ = ("user_id", "name", "email", "type", "comment", "status")
+
     user_id: int
     name: str
     email: str
@@ -29,9 +34,9 @@ def _users_from_message(message: dict) -> list[UserData]:
                 user_id=user["id"],
                 name=user["handle"],
                 email=user["email"],
-                type=user["type"],
+                type=slots.intern(user["type"]),
                 comment=user["comment"],
-                status=user["userStatus"],
+                status=slots.intern(user["userStatus"]),
             )
         )
     return result
@@ -39,13 +44,20 @@ def _users_from_message(message: dict) -> list[UserData]:
 
 def list_users(
     customer_id: int,
-    jwt_token: str,
+    jwt_token: utils.Token,
+    num_results: int = 10,
+    client: Optional[vectara_client.VectaraClient] = None,
 ) -> list[UserData]:
-    """Retrieves the list of Users.
+    """Retrieves the first page of Users.
+
+    Use iterate_users to enumerate every User.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
-        jwt_token: JWT token to be used for authentication.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        num_results: Maximum number of Users to retrieve.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
 
     Returns:
         list of UserData objects.
@@ -53,19 +65,63 @@ def list_users(
     Raises:
         UserException: In case of any error.
     """
+    users, _ = _list_users_page(customer_id, jwt_token, num_results, None, client)
+    return users
+
+
+def iterate_users(
+    customer_id: int,
+    jwt_token: utils.Token,
+    page_size: int = 100,
+    prefetch: bool = False,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> Iterator[UserData]:
+    """Streams every User, requesting one page at a time.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        page_size: Number of Users requested per page.
+        prefetch: Whether to request the next page while the current one is consumed.
+        client: Optional VectaraClient to send the request with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Yields:
+        UserData objects.
+
+    Raises:
+        UserException: In case of any error.
+    """
+    return pagination.iterate_pages(
+        lambda page_key: _list_users_page(
+            customer_id, jwt_token, page_size, page_key, client),
+        prefetch=prefetch,
+    )
+
+
+def _list_users_page(
+    customer_id: int,
+    jwt_token: utils.Token,
+    num_results: int,
+    page_key: Optional[str],
+    client: Optional[vectara_client.VectaraClient],
+) -> tuple[list[UserData], Optional[str]]:
+    """Helper function to retrieve one page of Users and the key of the next page."""
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": utils.authorization(jwt_token),
     }
 
-    request = {"listUsersType": "LIST_USERS_TYPE__ALL", "numResults": 10}
+    request = {"listUsersType": "LIST_USERS_TYPE__ALL", "numResults": num_results}
+    if page_key:
+        request["pageKey"] = page_key
 
-    response = requests.post(
-        "https://api.vectara.io/v1/list-users",
+    response = vectara_client.resolve(client).post(
+        "/v1/list-users",
         json=request,
         verify=True,
         headers=post_headers,
-        timeout=50,
+        idempotent=True,
     )
 
     if response.status_code != 200:
@@ -80,11 +136,11 @@ def list_users(
     message = response.json()
     if message["status"] is None:
         # The old API does not set the status field in response.
-        return _users_from_message(message)
+        return _users_from_message(message), message.get("pageKey")
 
     status = message["status"]
     if status["code"] == "OK":
-        return _users_from_message(message)
+        return _users_from_message(message), message.get("pageKey")
 
     logging.error("ListUsers failed with status %s", status)
     raise exceptions.UserException(str(status))
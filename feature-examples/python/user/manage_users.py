@@ -0,0 +1,228 @@
+"""Example of creating, disabling and deleting many Users with batched manage-user calls.
+
+A manage-user request holds any number of user actions and its response holds the
+status of each, in order. The functions below pack the users into requests of up to
+batch_size actions, send the requests concurrently and return the status of every user,
+so onboarding 5000 users takes 5000 / batch_size requests instead of 5000.
+
+Usage:
+    results = manage_users.create_users(
+        customer_id,
+        [manage_users.NewUser(handle="jane", email="jane@example.com")],
+        jwt_token)
+    failed = [result for result in results if not result.ok]
+"""
+
+import dataclasses
+import logging
+from typing import Iterable, Optional, Union
+
+import requests
+
+from user import exceptions
+from utils import batching
+from utils import utils
+from utils import vectara_client
+
+DEFAULT_BATCH_SIZE = 100
+
+
+@dataclasses.dataclass(frozen=True)
+class NewUser:
+    """User to be created."""
+
+    handle: str
+    email: str
+    type: str = "USER_TYPE__USER"
+    roles: tuple[str, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True)
+class UserActionResult:
+    """Outcome of the action on one user.
+
+    user is the NewUser or user ID passed in. user_id is the ID of the user, or None
+    if a NewUser was not created. status is the status returned for the user, e.g.,
+    {"code": "OK"}, or {"code": batching.REQUEST_FAILED, ...} if the request
+    holding it failed.
+    """
+
+    user: Union[NewUser, int]
+    user_id: Optional[int]
+    status: dict
+
+    @property
+    def ok(self) -> bool:
+        """Whether the action succeeded."""
+        return self.status.get("code") == "OK"
+
+
+def create_users(
+    customer_id: int,
+    users: Iterable[NewUser],
+    jwt_token: utils.Token,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[UserActionResult]:
+    """Creates Users in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        users: Users to be created.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        batch_size: Maximum number of users per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One UserActionResult per user, in order, holding the ID of the created user.
+    """
+    actions = ((user, {
+        "user": {
+            "handle": user.handle,
+            "email": user.email,
+            "type": user.type,
+            "role": list(user.roles),
+        },
+        "userActionType": "USER_ACTION_TYPE__ADD",
+    }) for user in users)
+    return _manage_users(customer_id, actions, jwt_token, batch_size, max_workers,
+                         idempotent=False, client=client)
+
+
+def disable_users(
+    customer_id: int,
+    user_ids: Iterable[int],
+    jwt_token: utils.Token,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[UserActionResult]:
+    """Disables Users in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        user_ids: IDs of the users to be disabled.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        batch_size: Maximum number of users per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One UserActionResult per user, in order.
+    """
+    actions = ((user_id, {"user": {"id": user_id},
+                          "userActionType": "USER_ACTION_TYPE__DISABLE"})
+               for user_id in user_ids)
+    # Disabling a user again has no effect, so failed requests can be retried.
+    return _manage_users(customer_id, actions, jwt_token, batch_size, max_workers,
+                         idempotent=True, client=client)
+
+
+def delete_users(
+    customer_id: int,
+    user_ids: Iterable[int],
+    jwt_token: utils.Token,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    client: Optional[vectara_client.VectaraClient] = None,
+) -> list[UserActionResult]:
+    """Deletes Users in batches.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        user_ids: IDs of the users to be deleted.
+        jwt_token: JWT token to be used for authentication, or a utils.TokenProvider.
+        batch_size: Maximum number of users per request.
+        max_workers: Maximum number of requests in flight.
+        client: Optional VectaraClient to send the requests with. Defaults to a shared
+            client for https://api.vectara.io.
+
+    Returns:
+        One UserActionResult per user, in order.
+    """
+    actions = ((user_id, {"user": {"id": user_id},
+                          "userActionType": "USER_ACTION_TYPE__DELETE"})
+               for user_id in user_ids)
+    return _manage_users(customer_id, actions, jwt_token, batch_size, max_workers,
+                         idempotent=False, client=client)
+
+
+def _manage_users(
+    customer_id: int,
+    actions: Iterable[tuple[Union[NewUser, int], dict]],
+    jwt_token: utils.Token,
+    batch_size: int,
+    max_workers: int,
+    idempotent: bool,
+    client: Optional[vectara_client.VectaraClient],
+) -> list[UserActionResult]:
+    """Helper function to send (user, userAction) pairs in concurrent batches."""
+    results = batching.send_all(
+        actions, batch_size, max_workers,
+        lambda batch: _send(customer_id, batch, jwt_token, idempotent, client))
+
+    failed = sum(not result.ok for result in results)
+    if failed:
+        logging.warning("ManageUser failed for %d of %d users", failed, len(results))
+    return results
+
+
+def _send(
+    customer_id: int,
+    batch: list[tuple[Union[NewUser, int], dict]],
+    jwt_token: utils.Token,
+    idempotent: bool,
+    client: Optional[vectara_client.VectaraClient],
+) -> list[UserActionResult]:
+    """Helper function to send one manage-user request and map its response to users."""
+    post_headers = {
+        "customer-id": f"{customer_id}",
+        "Authorization": utils.authorization(jwt_token),
+    }
+    request = {"userAction": [action for _, action in batch]}
+
+    try:
+        response = vectara_client.resolve(client).post(
+            "/v1/manage-user",
+            idempotent=idempotent,
+            json=request,
+            verify=True,
+            headers=post_headers,
+        )
+        if response.status_code != 200:
+            logging.error(
+                "ManageUser failed with code %d, reason: %s, text: %s",
+                response.status_code,
+                response.reason,
+                response.text,
+            )
+            raise exceptions.UserException(str(response))
+
+        message = response.json()
+        statuses = message.get("response") or []
+        if len(statuses) != len(batch):
+            logging.error("ManageUser returned %d statuses for %d users: %s",
+                          len(statuses), len(batch), message)
+            raise exceptions.UserException(str(message))
+
+        # A malformed status fails the whole batch rather than the other batches too.
+        results = []
+        for (user, _), user_status in zip(batch, statuses):
+            status = user_status["status"]
+            created = status["code"] == "OK"
+            user_id = user
+            if isinstance(user, NewUser):
+                user_id = user_status["user"]["id"] if created else None
+            results.append(UserActionResult(user=user, user_id=user_id, status=status))
+        return results
+    except (exceptions.UserException, requests.RequestException, ValueError, KeyError,
+            TypeError) as error:
+        status = {"code": batching.REQUEST_FAILED, "statusDetail": str(error)}
+        return [UserActionResult(user=user,
+                                 user_id=None if isinstance(user, NewUser) else user,
+                                 status=status)
+                for user, _ in batch]
@@ -1,6 +1,7 @@
 """Main file for Vectara feature examples related to User Management."""
 
 import argparse
+import csv
 import logging
 import sys
 
@@ -8,7 +9,9 @@ from user import create_user
 from user import delete_user
 from user import disable_user
 from user import list_users
+from user import manage_users
 from utils import utils
+from utils import vectara_client
 
 
 def main() -> None:
@@ -32,6 +35,28 @@ def main() -> None:
     parser.add_argument(
         "--auth-url", required=True, help="The auth url for this customer."
     )
+    parser.add_argument(
+        "--base-url",
+        default=vectara_client.DEFAULT_BASE_URL,
+        help="Base URL of the Vectara REST API, e.g., a local stand-in server.",
+    )
+    parser.add_argument(
+        "--users-file",
+        help="CSV file of handle,email lines of users to create, disable and delete "
+        "in batches.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=manage_users.DEFAULT_BATCH_SIZE,
+        help="Maximum number of users per manage-user request of --users-file.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of manage-user requests of --users-file in flight.",
+    )
 
     args = parser.parse_args()
 
@@ -42,19 +67,48 @@ def main() -> None:
         logging.error("Failed to get JWT token.")
         sys.exit(1)
 
-    users = list_users.list_users(args.customer_id, jwt_token)
+    client = vectara_client.VectaraClient(args.base_url, pool_maxsize=args.max_workers)
+
+    if args.users_file:
+        _manage_users_file(args, jwt_token, client)
+        return
+
+    users = list_users.list_users(args.customer_id, jwt_token, client=client)
     logging.info("ListUsers response: %s", users)
 
-    user_id: int = create_user.create_user(args.customer_id, jwt_token)
+    user_id: int = create_user.create_user(args.customer_id, jwt_token, client=client)
     logging.info("CreateUser created user id: %d", user_id)
 
-    disable_user.disable_user(args.customer_id, user_id, jwt_token)
+    disable_user.disable_user(args.customer_id, user_id, jwt_token, client=client)
     logging.info("DisableUser disabled user id: %d", user_id)
 
-    delete_user.delete_user(args.customer_id, user_id, jwt_token)
+    delete_user.delete_user(args.customer_id, user_id, jwt_token, client=client)
     logging.info("DeleteUser deleted user id: %d", user_id)
 
 
+def _manage_users_file(args: argparse.Namespace, jwt_token: utils.Token,
+                       client: vectara_client.VectaraClient) -> None:
+    """Creates, disables and deletes the users of --users-file in batches."""
+    with open(args.users_file, newline="", encoding="utf-8") as users_file:
+        users = [manage_users.NewUser(handle=handle, email=email)
+                 for handle, email in csv.reader(users_file)]
+
+    created = manage_users.create_users(args.customer_id, users, jwt_token,
+                                        args.batch_size, args.max_workers, client)
+    user_ids = [result.user_id for result in created if result.ok]
+    logging.info("CreateUsers created %d of %d users", len(user_ids), len(users))
+    for result in created:
+        if not result.ok:
+            logging.info("CreateUsers failed for %s: %s", result.user, result.status)
+
+    for name, manage in (("DisableUsers", manage_users.disable_users),
+                         ("DeleteUsers", manage_users.delete_users)):
+        results = manage(args.customer_id, user_ids, jwt_token, args.batch_size,
+                         args.max_workers, client)
+        logging.info("%s succeeded for %d of %d users", name,
+                     sum(result.ok for result in results), len(results))
+
+
 if __name__ == "__main__":
     logging.basicConfig(
         format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO
@@ -0,0 +1,65 @@
+"""Sending many items in batched requests running concurrently.
+
+Admin requests such as manage-user or create-api-key hold any number of items. send_all
+packs the items into batches, sends the batches on a thread pool and returns the result
+of every item, in order.
+
+Usage:
+    results = batching.send_all(user_actions, batch_size=100, max_workers=4,
+                                send=lambda batch: _send(customer_id, batch, client))
+"""
+
+import collections
+import itertools
+from concurrent import futures
+from typing import Callable, Iterable, TypeVar
+
+# Status code of the items of a request that failed as a whole.
+REQUEST_FAILED = "REQUEST_FAILED"
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def send_all(
+    items: Iterable[Item],
+    batch_size: int,
+    max_workers: int,
+    send: Callable[[list[Item]], list[Result]],
+) -> list[Result]:
+    """Sends items in batches of at most batch_size on at most max_workers threads.
+
+    Batches are read from items as requests complete, so that a generator of items is
+    never held in memory as a whole.
+
+    Args:
+        items: Items to be sent.
+        batch_size: Maximum number of items per batch.
+        max_workers: Maximum number of batches in flight.
+        send: Function sending a batch and returning one result per item of the batch.
+
+    Returns:
+        The results of all items, in order.
+
+    Raises:
+        ValueError: If batch_size is not positive.
+        Exception: Any exception raised by send, once the batches before it completed.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive: {batch_size}")
+
+    items = iter(items)
+    results = []
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        try:
+            for batch in iter(lambda: list(itertools.islice(items, batch_size)), []):
+                pending.append(executor.submit(send, batch))
+                if len(pending) >= 2 * max_workers:
+                    results.extend(pending.popleft().result())
+            while pending:
+                results.extend(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+    return results
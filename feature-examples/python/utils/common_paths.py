@@ -0,0 +1,15 @@
+"""Makes the modules shared by the Python examples importable.
+
+The shared modules live in language-examples/python/vectara-common, which is added to
+sys.path instead of being installed as a package. Import this module before any module
+of vectara-common.
+"""
+
+import os
+import sys
+
+COMMON = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                                      "language-examples", "python", "vectara-common"))
+
+if COMMON not in sys.path:
+    sys.path.append(COMMON)
@@ -0,0 +1,83 @@
+"""Metrics and tracing of the REST calls made by the feature examples.
+
+Every call is recorded under its operation, the last segment of the API path with
+underscores, e.g., list_users for /v1/list-users: a latency histogram per status code,
+the sizes of requests and responses, retries and the calls in flight. Metrics are exported
+in the Prometheus text format, and each call becomes an OpenTelemetry span when tracing is
+on and the opentelemetry-api package is installed.
+
+The registry, export and spans are shared with the REST and gRPC examples, see
+vectara_metrics. The metric names of this module start with vectara_api.
+
+Nothing is recorded until enable() is called. Until then an instrumented call only checks
+an attribute before posting its request.
+
+Usage:
+    registry = metrics.enable(tracing=True)
+    list_users.list_users(customer_id, token)
+    print(registry.prometheus_text())
+"""
+
+from typing import Optional
+
+import requests
+
+# pylint: disable=wrong-import-order
+from utils import common_paths  # pylint: disable=unused-import
+import vectara_metrics
+
+LATENCY_BUCKETS_SECS = vectara_metrics.LATENCY_BUCKETS_SECS
+SIZE_BUCKETS_BYTES = vectara_metrics.SIZE_BUCKETS_BYTES
+Histogram = vectara_metrics.Histogram
+Call = vectara_metrics.Call
+
+
+class Registry(vectara_metrics.Registry):
+    """vectara_metrics.Registry whose metric names start with vectara_api."""
+
+    def __init__(self, prefix: str = "vectara_api", **kwargs):
+        super().__init__(prefix, **kwargs)
+
+
+_instrumentation = vectara_metrics.Instrumentation(
+    __name__, Registry, status_attribute="http.status_code", ok_code="200")
+
+enable = _instrumentation.enable
+disable = _instrumentation.disable
+get_registry = _instrumentation.get_registry
+retried = _instrumentation.retried
+start = _instrumentation.start
+serve = _instrumentation.serve
+
+
+def operation_of(url: str) -> str:
+    """Returns the operation of an API URL or path, e.g., list_users for /v1/list-users."""
+    return url.split("?", 1)[0].rsplit("/", 1)[-1].replace("-", "_")
+
+
+def post(operation: str, url: str, session: Optional[requests.Session] = None,
+         **kwargs) -> requests.Response:
+    """Posts a request like requests.post, recording it under operation.
+
+    Args:
+        operation: Name of the operation, e.g., list_users. See operation_of().
+        url: URL to post to.
+        session: Optional requests.Session whose connections are reused.
+        **kwargs: Keyword arguments of requests.post.
+
+    Returns:
+        The response.
+    """
+    call = start(operation)
+    if call is None:
+        return (session or requests).post(url, **kwargs)
+    try:
+        response = (session or requests).post(url, **kwargs)
+    except Exception as error:
+        call.finish(type(error).__name__)
+        raise
+    request_bytes = response.request.headers.get("Content-Length")
+    call.finish(str(response.status_code),
+                int(request_bytes) if request_bytes is not None else None,
+                len(response.content))
+    return response
@@ -0,0 +1,41 @@
+"""Helpers to stream paginated list responses of the Vectara REST API."""
+
+from concurrent import futures
+from typing import Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Fetches the page starting at a page key (None for the first page) and returns its
+# items together with the key of the next page, which is empty after the last page.
+PageFetcher = Callable[[Optional[str]], tuple[list[T], Optional[str]]]
+
+
+def iterate_pages(fetch_page: PageFetcher, prefetch: bool = False) -> Iterator[T]:
+    """Yields the items of every page, following page keys until they run out.
+
+    Args:
+        fetch_page: Function fetching one page, see PageFetcher.
+        prefetch: Whether to request the next page in a background thread while the
+            caller processes the current one.
+
+    Yields:
+        The items of each page in order.
+    """
+    if not prefetch:
+        items, page_key = fetch_page(None)
+        yield from items
+        while page_key:
+            items, page_key = fetch_page(page_key)
+            yield from items
+        return
+
+    executor = futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        next_page = executor.submit(fetch_page, None)
+        while next_page is not None:
+            items, page_key = next_page.result()
+            next_page = executor.submit(fetch_page, page_key) if page_key else None
+            yield from items
+    finally:
+        # A caller that stops early does not wait for a page it will never read.
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,74 @@
+"""Retries for idempotent Vectara REST requests.
+
+post() is a drop-in replacement for requests.post that retries connection errors,
+timeouts and overloaded responses. The examples use it for read-only calls, so their
+return values and exceptions do not change, they only fail less often.
+
+The policy and budget are shared with the REST and gRPC examples, see vectara_retry.
+"""
+
+from typing import Optional
+
+import requests
+
+# pylint: disable=wrong-import-order
+from utils import common_paths  # pylint: disable=unused-import
+from utils import metrics
+import vectara_retry
+
+RetryBudget = vectara_retry.RetryBudget
+RetryPolicy = vectara_retry.RetryPolicy
+
+# HTTP status codes of overloaded or temporarily unavailable servers.
+RETRYABLE_STATUS_CODES = vectara_retry.RETRYABLE_HTTP_STATUS_CODES
+
+# Exceptions raised by requests for failures that happen before a response arrives.
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def post(url: str,
+         policy: Optional[RetryPolicy] = None,
+         session: Optional[requests.Session] = None,
+         **kwargs) -> requests.Response:
+    """Posts an idempotent request, retrying transient failures.
+
+    Connection errors, timeouts and responses with a status in RETRYABLE_STATUS_CODES
+    are retried. A Retry-After header is honored instead of the backoff delay.
+
+    Args:
+        url: URL to post to.
+        policy: RetryPolicy to apply. Defaults to DEFAULT_POLICY.
+        session: Optional requests.Session whose connections are reused.
+        **kwargs: Keyword arguments of requests.post.
+
+    Returns:
+        The response of the last attempt.
+
+    Raises:
+        requests.RequestException: If the last attempt failed before getting a response.
+    """
+    operation = metrics.operation_of(url)
+
+    def attempt():
+        response = metrics.post(operation, url, session=session, **kwargs)
+        return response, response.status_code == 200
+
+    response, _ = vectara_retry.call(attempt,
+                                     policy or DEFAULT_POLICY,
+                                     _is_retryable,
+                                     _retry_after_secs,
+                                     RETRYABLE_EXCEPTIONS,
+                                     on_retry=lambda: metrics.retried(operation))
+    return response
+
+
+def _is_retryable(response: requests.Response) -> bool:
+    """Returns whether a failed response is worth retrying."""
+    return response.status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after_secs(response: requests.Response) -> Optional[float]:
+    """Returns the delay requested by a Retry-After header, or None."""
+    return vectara_retry.retry_after_secs(response.headers.get("Retry-After"))
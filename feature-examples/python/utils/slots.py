@@ -0,0 +1,37 @@
+"""Compact immutable records for large listings.
+
+A frozen dataclass keeps its fields in a per-instance __dict__. Declaring __slots__ keeps
+them in fixed slots instead, which makes each object less than half as large. Frozen
+dataclasses with __slots__ cannot be copied or pickled by default, since both restore the
+fields by assigning them; records deriving from FrozenSlots can.
+
+Usage:
+    @dataclasses.dataclass(frozen=True)
+    class UserData(slots.FrozenSlots):
+        __slots__ = ("user_id", "status")
+        user_id: int
+        status: str
+
+    UserData(user_id=1, status=slots.intern(user["userStatus"]))
+"""
+
+import sys
+from typing import Optional
+
+
+class FrozenSlots:
+    """Base class of frozen dataclasses declaring __slots__, making them picklable."""
+
+    __slots__ = ()
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """Returns a single shared copy of a string repeated in many records, e.g., a status."""
+    return sys.intern(value) if isinstance(value, str) else value
@@ -1,11 +1,13 @@
 """Utility functions for interacting with Vectara over REST."""
 
-from authlib.integrations import requests_client
+# pylint: disable=wrong-import-order
+from utils import common_paths  # pylint: disable=unused-import
+import vectara_auth
 
-
-def get_jwt_token(auth_url: str, app_client_id: str, app_client_secret: str):
-    """Connects to the server and returns a JWT token."""
-    token_endpoint = f"{auth_url}"
-    session = requests_client.OAuth2Session(app_client_id, app_client_secret, scope="")
-    token = session.fetch_token(token_endpoint, grant_type="client_credentials")
-    return token["access_token"]
+# Token caching is shared with the REST and gRPC examples, see vectara_auth.
+REFRESH_MARGIN_SECS = vectara_auth.REFRESH_MARGIN_SECS
+TokenProvider = vectara_auth.TokenProvider
+Token = vectara_auth.Token
+authorization = vectara_auth.authorization
+get_token_provider = vectara_auth.get_token_provider
+get_jwt_token = vectara_auth.get_jwt_token
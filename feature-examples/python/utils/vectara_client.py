@@ -0,0 +1,102 @@
+"""Connection settings and pooled HTTP session shared by the feature examples."""
+
+import threading
+from typing import Optional
+
+import requests
+from requests import adapters
+
+from utils import metrics
+from utils import retry
+
+DEFAULT_BASE_URL = "https://api.vectara.io"
+
+DEFAULT_TIMEOUT_SECS = 50.0
+
+
+class VectaraClient:
+    """Base URL, pooled HTTP session and timeouts used to call the REST API.
+
+    Every call made through one client reuses its keep-alive connections, so a job making
+    thousands of admin calls performs a TLS handshake per pooled connection instead of
+    per call. A client can be shared between threads. Calls are recorded by utils.metrics
+    while it is enabled.
+
+    Usage:
+        with VectaraClient("http://localhost:8080", pool_maxsize=16) as client:
+            corpus = read_corpus.read_corpus(customer_id, corpus_id, token, client=client)
+    """
+
+    def __init__(self,
+                 base_url: str = DEFAULT_BASE_URL,
+                 timeout_secs: float = DEFAULT_TIMEOUT_SECS,
+                 operation_timeouts: Optional[dict] = None,
+                 pool_maxsize: int = 10,
+                 retry_policy: Optional[retry.RetryPolicy] = None):
+        """Creates the client. Connections are opened on first use.
+
+        Args:
+            base_url: Scheme and address of the API, e.g., https://api.vectara.io
+            timeout_secs: Timeout of each request, unless overridden below.
+            operation_timeouts: Timeouts overriding timeout_secs for some API paths,
+                e.g., {"/v1/compute-corpus-size": 120}.
+            pool_maxsize: Maximum number of connections kept open, which should be at
+                least the number of threads sharing the client.
+            retry_policy: RetryPolicy of idempotent requests. Defaults to
+                retry.DEFAULT_POLICY.
+        """
+        self.base_url = base_url.rstrip("/")
+        self._timeout_secs = timeout_secs
+        self._operation_timeouts = dict(operation_timeouts or {})
+        self._retry_policy = retry_policy
+        self.session = requests.Session()
+        adapter = adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def timeout(self, path: str) -> float:
+        """Returns the timeout of requests to an API path."""
+        return self._operation_timeouts.get(path, self._timeout_secs)
+
+    def post(self, path: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        """Posts a request to an API path.
+
+        Args:
+            path: Path of the API, e.g., /v1/read-corpus
+            idempotent: Whether the request can be safely sent again, in which case
+                transient failures are retried.
+            **kwargs: Keyword arguments of requests.post.
+
+        Returns:
+            The response.
+        """
+        kwargs.setdefault("timeout", self.timeout(path))
+        url = f"{self.base_url}{path}"
+        if idempotent:
+            return retry.post(url, policy=self._retry_policy, session=self.session, **kwargs)
+        return metrics.post(metrics.operation_of(path), url, session=self.session, **kwargs)
+
+
+_default_client_lock = threading.Lock()
+_default_client = None
+
+
+def resolve(client: Optional[VectaraClient]) -> VectaraClient:
+    """Returns client, or the shared client for DEFAULT_BASE_URL if it is None."""
+    global _default_client  # pylint: disable=global-statement
+    if client is not None:
+        return client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = VectaraClient()
+        return _default_client
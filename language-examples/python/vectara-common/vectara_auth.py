@@ -0,0 +1,144 @@
+"""Client credentials JWT tokens shared by the REST, gRPC and feature examples."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Union
+
+from authlib.integrations import requests_client
+
+# Tokens are refreshed this many seconds before they expire, or halfway through the
+# lifetime of tokens lasting less than twice as long.
+REFRESH_MARGIN_SECS = 60
+
+# A background refresh never runs sooner than this after the previous fetch, so that
+# tokens with a very short lifetime cannot make the refreshes hammer the auth server.
+MIN_REFRESH_DELAY_SECS = 5
+
+# Lifetime assumed when the auth server does not return expires_in.
+_DEFAULT_EXPIRES_IN_SECS = 3600
+
+# A cached token is not handed out in the last seconds of its lifetime, nor in the
+# second half of the lifetime of short-lived tokens.
+_EXPIRY_SKEW_SECS = 10
+
+
+class TokenProvider:
+    """Caches a client credentials JWT token and refreshes it before it expires.
+
+    The provider is safe to share between threads and asyncio tasks. Concurrent callers
+    that find no valid token wait for a single token request instead of each making one,
+    and a background timer refreshes the token REFRESH_MARGIN_SECS before it expires.
+
+    The examples accept a provider wherever they take a JWT token, and read its current
+    token for every request.
+
+    Usage:
+        provider = vectara_auth.get_token_provider(auth_url, app_client_id, secret)
+        headers = {"Authorization": vectara_auth.authorization(provider)}
+    """
+
+    def __init__(self, auth_url: str, app_client_id: str, app_client_secret: str):
+        self._auth_url = auth_url
+        self._session = requests_client.OAuth2Session(
+            app_client_id, app_client_secret, scope="")
+        self._lock = threading.Lock()
+        # (token, expiry in time.monotonic() seconds), replaced as a whole.
+        self._state = (None, 0.0)
+        self._timer = None
+        self._closed = False
+
+    def get_token(self) -> str:
+        """Returns a valid token, fetching one if none is cached."""
+        token, expires_at = self._state
+        if token and time.monotonic() < expires_at:
+            return token
+
+        with self._lock:
+            # Another caller may have fetched the token while we waited for the lock.
+            token, expires_at = self._state
+            if token and time.monotonic() < expires_at:
+                return token
+            return self._fetch()
+
+    async def get_token_async(self) -> str:
+        """Returns a valid token without blocking the event loop."""
+        token, expires_at = self._state
+        if token and time.monotonic() < expires_at:
+            return token
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_token)
+
+    def close(self):
+        """Stops the background refresh."""
+        with self._lock:
+            self._closed = True
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _fetch(self) -> str:
+        """Requests a new token and schedules its refresh. Must hold self._lock."""
+        token = self._session.fetch_token(self._auth_url, grant_type="client_credentials")
+        expires_in = float(token.get("expires_in") or _DEFAULT_EXPIRES_IN_SECS)
+        self._state = (token["access_token"],
+                       time.monotonic() + max(expires_in - _EXPIRY_SKEW_SECS, expires_in / 2))
+
+        if self._timer:
+            self._timer.cancel()
+        if self._closed:
+            return token["access_token"]
+        refresh_delay = max(expires_in - REFRESH_MARGIN_SECS, expires_in / 2,
+                            MIN_REFRESH_DELAY_SECS)
+        self._timer = threading.Timer(refresh_delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+        return token["access_token"]
+
+    def _refresh(self):
+        """Refreshes the token in the background. On failure, callers fetch on demand."""
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._fetch()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error("Refreshing the JWT token failed: %s", error)
+
+
+# A JWT token, or a TokenProvider handing out the current one.
+Token = Union[str, TokenProvider]
+
+
+def authorization(jwt_token: Token) -> str:
+    """Returns the Authorization header of a token, or of the current token of a provider."""
+    if isinstance(jwt_token, TokenProvider):
+        jwt_token = jwt_token.get_token()
+    return f"Bearer {jwt_token}"
+
+
+async def authorization_async(jwt_token: Token) -> str:
+    """Returns the Authorization header of a token without blocking the event loop."""
+    if isinstance(jwt_token, TokenProvider):
+        jwt_token = await jwt_token.get_token_async()
+    return f"Bearer {jwt_token}"
+
+
+_providers_lock = threading.Lock()
+_providers = {}
+
+
+def get_token_provider(auth_url: str, app_client_id: str, app_client_secret: str):
+    """Returns the shared TokenProvider for an auth URL and app client."""
+    key = (auth_url, app_client_id)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = TokenProvider(auth_url, app_client_id, app_client_secret)
+            _providers[key] = provider
+        return provider
+
+
+def get_jwt_token(auth_url: str, app_client_id: str, app_client_secret: str):
+    """Returns a JWT token, reusing a cached token while it is valid."""
+    return get_token_provider(auth_url, app_client_id, app_client_secret).get_token()
@@ -0,0 +1,217 @@
+"""Deleting large numbers of documents with bounded concurrency and checkpoints.
+
+Shared by rest_bulk_deleter and grpc_bulk_deleter, which only provide the call deleting
+one document. Document IDs are read from a stream, e.g., a file or stdin, and deleted
+concurrently. With a checkpoint file, every deleted ID is recorded so that an
+interrupted run can be started again with the same input and resumes where it stopped.
+"""
+
+import argparse
+import dataclasses
+import logging
+import sys
+import time
+from concurrent import futures
+from typing import Callable, Iterable, Iterator, Optional
+
+# Number of checkpointed IDs buffered before they are flushed to disk.
+_FLUSH_EVERY = 100
+
+
+class Checkpoint:
+    """Append-only file of the IDs of the documents deleted so far.
+
+    IDs buffered when a process is killed are not recorded, so those documents are
+    deleted a second time on resume, which is harmless. A checkpoint must only be used
+    from the thread that opened it.
+    """
+
+    def __init__(self, path: str):
+        """Opens the checkpoint at path, loading the IDs of earlier runs if it exists."""
+        try:
+            with open(path, encoding="utf-8") as lines:
+                self.done = {line.rstrip("\n") for line in lines if line.strip()}
+        except FileNotFoundError:
+            self.done = set()
+        self._file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        self._buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flushes the buffered IDs and closes the file."""
+        self._file.close()
+
+    def record(self, document_id: str):
+        """Records a deleted document."""
+        self.done.add(document_id)
+        self._file.write(document_id + "\n")
+        self._buffered += 1
+        if self._buffered >= _FLUSH_EVERY:
+            self._file.flush()
+            self._buffered = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class DeleteResult:
+    """Outcome of deleting a single document.
+
+    A failed document carries the error of the transport, e.g., the response of the
+    server or the exception raised by the call.
+    """
+    document_id: str
+    ok: bool
+    error: Optional[object] = None
+
+
+@dataclasses.dataclass
+class Summary:
+    """Counts and rate of a bulk deletion."""
+    deleted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed_secs: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Returns the documents deleted per second."""
+        return self.deleted / self.elapsed_secs if self.elapsed_secs else 0.0
+
+
+def bulk_delete(delete: Callable[[str], DeleteResult],
+                document_ids: Iterable[str],
+                max_workers: int = 16,
+                checkpoint: Optional[Checkpoint] = None,
+                summary: Optional[Summary] = None) -> Iterator[DeleteResult]:
+    """Deletes documents keeping up to max_workers deletions outstanding.
+
+    IDs are pulled from the iterable only when a worker is free, so a stream of
+    millions of IDs is never materialized. A failing document is reported and does not
+    stop the run.
+
+    Args:
+        delete: Function deleting one document, called from worker threads. It reports
+            failures in its DeleteResult instead of raising.
+        document_ids: IDs of the documents to delete.
+        max_workers: Maximum number of concurrent deletions.
+        checkpoint: Optional Checkpoint recording deleted IDs. IDs it already holds
+            are skipped.
+        summary: Optional Summary updated as documents are deleted.
+
+    Yields:
+        A DeleteResult per deleted or failed document, in completion order.
+    """
+    summary = summary if summary is not None else Summary()
+    start = time.monotonic() - summary.elapsed_secs
+
+    def record(result: DeleteResult) -> DeleteResult:
+        if result.ok:
+            summary.deleted += 1
+            if checkpoint is not None:
+                checkpoint.record(result.document_id)
+        else:
+            summary.failed += 1
+        summary.elapsed_secs = time.monotonic() - start
+        return result
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = set()
+        try:
+            for document_id in document_ids:
+                if checkpoint is not None and document_id in checkpoint.done:
+                    summary.skipped += 1
+                    continue
+                # Backpressure: wait for a free worker before reading the next ID.
+                while len(in_flight) >= max_workers:
+                    done, in_flight = futures.wait(in_flight,
+                                                   return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield record(future.result())
+                in_flight.add(executor.submit(delete, document_id))
+
+            for future in futures.as_completed(in_flight):
+                yield record(future.result())
+            in_flight = set()
+        finally:
+            # Only reached with deletions outstanding if the caller stopped iterating early.
+            for future in in_flight:
+                future.cancel()
+
+
+def read_ids(path: str) -> Iterator[str]:
+    """Yields the document IDs of a file, one per line, or of stdin if path is -."""
+    lines = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in lines:
+            document_id = line.strip()
+            if document_id:
+                yield document_id
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def main(description: str, indexing_endpoint: str, get_token_provider: Callable,
+         transport_bulk_delete: Callable[..., Iterator[DeleteResult]]):
+    """Runs the command line of a bulk deleter.
+
+    Args:
+        description: Description of the command.
+        indexing_endpoint: Default address of the indexing server.
+        get_token_provider: The get_token_provider function of the transport.
+        transport_bulk_delete: The bulk_delete function of the transport, called with
+            the customer ID, corpus ID, address, token provider, document IDs,
+            max_workers, checkpoint and summary.
+    """
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=description)
+
+    parser.add_argument("--customer-id", type=int, required=True,
+                        help="Unique customer ID in Vectara platform.")
+    parser.add_argument("--corpus-id", type=int, required=True,
+                        help="Corpus ID from which documents will be deleted.")
+    parser.add_argument("--indexing-endpoint", help="The endpoint of indexing server.",
+                        default=indexing_endpoint)
+    parser.add_argument("--app-client-id", required=True,
+                        help="This app client should have enough rights.")
+    parser.add_argument("--app-client-secret", required=True)
+    parser.add_argument("--auth-url", required=True,
+                        help="The authentication URL for this customer.")
+    parser.add_argument("--input", required=True,
+                        help="File with one document ID per line, or - for stdin.")
+    parser.add_argument("--checkpoint",
+                        help="File recording deleted IDs, so that a rerun resumes.")
+    parser.add_argument("--max-workers", type=int, default=16,
+                        help="Maximum number of concurrent delete requests.")
+
+    args = parser.parse_args()
+
+    token_provider = get_token_provider(
+        args.auth_url, args.app_client_id, args.app_client_secret)
+
+    summary = Summary()
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    try:
+        for result in transport_bulk_delete(args.customer_id, args.corpus_id,
+                                            args.indexing_endpoint, token_provider,
+                                            read_ids(args.input), args.max_workers,
+                                            checkpoint, summary):
+            if not result.ok:
+                logging.error("Deleting %s failed: %s", result.document_id, result.error)
+            if (summary.deleted + summary.failed) % 10000 == 0:
+                logging.info("Progress: %s", summary)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    logging.info("Deleted %d documents in %.1f s (%.1f/s), skipped %d already deleted, "
+                 "%d failed.", summary.deleted, summary.elapsed_secs,
+                 summary.rate, summary.skipped, summary.failed)
+    if summary.failed:
+        sys.exit(1)
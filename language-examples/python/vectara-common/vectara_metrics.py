@@ -0,0 +1,303 @@
+"""Metrics and tracing of the calls made by the examples, shared by every transport.
+
+Every call is recorded under its operation: a latency histogram per status code, the
+sizes of requests and responses, retries and the calls in flight. Metrics are exported in
+the Prometheus text format, and each call becomes an OpenTelemetry span when tracing is on
+and the opentelemetry-api package is installed.
+
+rest_metrics, grpc_metrics and the feature examples' utils.metrics each hold an
+Instrumentation with their own metric prefix and span attributes, and hook it into their
+transport. Nothing is recorded until its enable() is called. Until then an instrumented
+call only checks an attribute before sending its request.
+"""
+
+import bisect
+import http.server
+import threading
+import time
+from typing import Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+# Upper bounds of the latency buckets, in seconds.
+LATENCY_BUCKETS_SECS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds of the request and response size buckets, in bytes.
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum. Not thread safe on its own."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Adds a value to the first bucket whose upper bound is at least value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Metrics of the calls made while it is enabled. Safe to share between threads."""
+
+    def __init__(self,
+                 prefix: str = "vectara",
+                 latency_buckets_secs=LATENCY_BUCKETS_SECS,
+                 size_buckets_bytes=SIZE_BUCKETS_BYTES):
+        """Creates an empty registry.
+
+        Args:
+            prefix: Prefix of the exported metric names.
+            latency_buckets_secs: Upper bounds of the latency buckets.
+            size_buckets_bytes: Upper bounds of the request and response size buckets.
+        """
+        self._prefix = prefix
+        self._latency_buckets = tuple(latency_buckets_secs)
+        self._size_buckets = tuple(size_buckets_bytes)
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._request_sizes = {}
+        self._response_sizes = {}
+        self._retries = {}
+        self._in_flight = {}
+
+    def call_started(self, operation: str):
+        """Records a call of operation being sent."""
+        with self._lock:
+            self._in_flight[operation] = self._in_flight.get(operation, 0) + 1
+
+    def call_finished(self, operation: str, code: str, latency_secs: float,
+                      request_bytes: Optional[int] = None,
+                      response_bytes: Optional[int] = None):
+        """Records the outcome of a call previously passed to call_started.
+
+        Args:
+            operation: Name of the operation, e.g., query.
+            code: Status code of the call, e.g., 200 or OK, or the name of the exception
+                raised before a response arrived.
+            latency_secs: Time from sending the request to receiving the response.
+            request_bytes: Optional size of the request.
+            response_bytes: Optional size of the response.
+        """
+        with self._lock:
+            self._in_flight[operation] -= 1
+            key = (operation, code)
+            histogram = self._latencies.get(key)
+            if histogram is None:
+                histogram = self._latencies[key] = Histogram(self._latency_buckets)
+            histogram.observe(latency_secs)
+            if request_bytes is not None:
+                self._size_histogram(self._request_sizes, operation).observe(request_bytes)
+            if response_bytes is not None:
+                self._size_histogram(self._response_sizes, operation).observe(response_bytes)
+
+    def _size_histogram(self, histograms: dict, operation: str) -> Histogram:
+        """Returns the size histogram of operation, creating it on first use."""
+        histogram = histograms.get(operation)
+        if histogram is None:
+            histogram = histograms[operation] = Histogram(self._size_buckets)
+        return histogram
+
+    def retried(self, operation: str):
+        """Records a failed attempt of operation being retried."""
+        with self._lock:
+            self._retries[operation] = self._retries.get(operation, 0) + 1
+
+    def in_flight(self, operation: str) -> int:
+        """Returns the number of calls of operation currently waiting for a response."""
+        with self._lock:
+            return self._in_flight.get(operation, 0)
+
+    def prometheus_text(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        prefix = self._prefix
+        lines = []
+        with self._lock:
+            _histogram_lines(lines, f"{prefix}_request_duration_seconds",
+                             "Latency of the calls per operation and status code.",
+                             {f'operation="{op}",code="{code}"': histogram
+                              for (op, code), histogram in self._latencies.items()})
+            _histogram_lines(lines, f"{prefix}_request_size_bytes",
+                             "Size of the requests per operation.",
+                             {f'operation="{op}"': histogram
+                              for op, histogram in self._request_sizes.items()})
+            _histogram_lines(lines, f"{prefix}_response_size_bytes",
+                             "Size of the responses per operation.",
+                             {f'operation="{op}"': histogram
+                              for op, histogram in self._response_sizes.items()})
+            _value_lines(lines, f"{prefix}_retries_total", "counter",
+                         "Failed attempts retried per operation.", self._retries)
+            _value_lines(lines, f"{prefix}_requests_in_flight", "gauge",
+                         "Calls waiting for a response per operation.", self._in_flight)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(lines: list, name: str, description: str, histograms: dict):
+    """Appends the lines of a histogram metric, given its histograms per label set."""
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _value_lines(lines: list, name: str, metric_type: str, description: str, values: dict):
+    """Appends the lines of a counter or gauge metric, given its values per operation."""
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for operation, value in sorted(values.items()):
+        lines.append(f'{name}{{operation="{operation}"}} {value}')
+
+
+class Instrumentation:
+    """Whether and where the calls of one transport are recorded."""
+
+    def __init__(self, name: str, registry_class=Registry,
+                 status_attribute: str = "status_code", ok_code: str = "OK",
+                 span_attributes: Optional[dict] = None):
+        """Creates a disabled instrumentation.
+
+        Args:
+            name: Name of the tracer, usually the __name__ of the transport module.
+            registry_class: Class of the registry created by enable() by default.
+            status_attribute: Span attribute holding the status code of a call.
+            ok_code: Status code of successful calls. Spans of other calls are errors.
+            span_attributes: Optional attributes set on every span.
+        """
+        self._name = name
+        self._registry_class = registry_class
+        self.status_attribute = status_attribute
+        self.ok_code = ok_code
+        self.span_attributes = span_attributes or {}
+        self.registry = None
+        self.tracer = None
+
+    def enable(self, registry: Optional[Registry] = None, tracing: bool = False) -> Registry:
+        """Starts recording the calls made by the examples.
+
+        Args:
+            registry: Registry receiving the metrics. Defaults to a new registry.
+            tracing: Whether each call also becomes an OpenTelemetry span, exported by
+                the tracer provider configured by the application.
+
+        Returns:
+            The registry receiving the metrics.
+
+        Raises:
+            ImportError: If tracing is requested but opentelemetry-api is not installed.
+        """
+        if tracing and trace is None:
+            raise ImportError("Tracing needs the opentelemetry-api package.")
+        self.tracer = trace.get_tracer(self._name) if tracing else None
+        self.registry = registry or self._registry_class()
+        return self.registry
+
+    def disable(self):
+        """Stops recording calls. Calls in flight are still recorded when they finish."""
+        self.registry = None
+        self.tracer = None
+
+    def get_registry(self) -> Optional[Registry]:
+        """Returns the enabled registry, or None if metrics are disabled."""
+        return self.registry
+
+    def enabled(self) -> bool:
+        """Returns whether metrics are enabled."""
+        return self.registry is not None
+
+    def retried(self, operation: str):
+        """Records a failed attempt of operation being retried, if metrics are enabled."""
+        registry = self.registry
+        if registry is not None:
+            registry.retried(operation)
+
+    def start(self, operation: str) -> Optional["Call"]:
+        """Returns a Call recording operation, or None if metrics are disabled."""
+        registry = self.registry
+        return Call(self, registry, operation) if registry is not None else None
+
+    def serve(self, port: int, host: str = "") -> http.server.ThreadingHTTPServer:
+        """Serves the metrics to Prometheus scrapers from a background thread.
+
+        Args:
+            port: Port to listen on. 0 picks a free port, see server.server_address.
+            host: Address to listen on. Defaults to every interface.
+
+        Returns:
+            The server. Call its shutdown() method to stop it.
+        """
+        server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+        server.instrumentation = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class Call:
+    """A call being recorded, from Instrumentation.start() until finish()."""
+
+    __slots__ = ("_instrumentation", "_registry", "_operation", "_span", "_start")
+
+    def __init__(self, instrumentation: Instrumentation, registry: Registry,
+                 operation: str):
+        self._instrumentation = instrumentation
+        self._registry = registry
+        self._operation = operation
+        registry.call_started(operation)
+        self._span = None
+        tracer = instrumentation.tracer
+        if tracer is not None:
+            self._span = tracer.start_span(f"vectara.{operation}",
+                                           kind=trace.SpanKind.CLIENT)
+        self._start = time.perf_counter()
+
+    def finish(self, code: str,
+               request_bytes: Optional[int] = None,
+               response_bytes: Optional[int] = None):
+        """Records the outcome of the call. See Registry.call_finished."""
+        latency_secs = time.perf_counter() - self._start
+        self._registry.call_finished(self._operation, code, latency_secs,
+                                     request_bytes, response_bytes)
+        if self._span is not None:
+            instrumentation = self._instrumentation
+            for key, value in instrumentation.span_attributes.items():
+                self._span.set_attribute(key, value)
+            self._span.set_attribute("vectara.operation", self._operation)
+            self._span.set_attribute(instrumentation.status_attribute, code)
+            if code != instrumentation.ok_code:
+                self._span.set_status(trace.Status(trace.StatusCode.ERROR))
+            self._span.end()
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the Prometheus text of the enabled registry on every GET."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Writes the metrics, or 503 if metrics are disabled."""
+        registry = self.server.instrumentation.registry
+        if registry is None:
+            self.send_error(503, "Metrics are disabled.")
+            return
+        body = registry.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
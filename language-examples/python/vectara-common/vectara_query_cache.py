@@ -0,0 +1,99 @@
+"""Client-side cache of query results shared by the REST and gRPC examples."""
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Optional
+
+
+class QueryCache:
+    """Size-bounded LRU cache of successful query results with a time to live.
+
+    Entries are keyed by the normalized query request, so the same query text, corpus
+    keys, filters and num_results hit the same entry. Indexing, deleting or resetting
+    through a function given the same cache drops the entries of the affected corpus.
+
+    Cached results are shared between callers and are not copied, so they must not be
+    modified. Share a cache only between callers with the same access to the corpora,
+    or pass the credential of each call to get() and put(): entries are then kept apart
+    per credential, keyed by its SHA-256 hash.
+
+    Subclasses define how the query requests of a transport are keyed.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_secs: float = 60.0):
+        """Creates an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results. The least recently used
+                result is evicted first.
+            ttl_secs: Seconds after which a cached result expires.
+        """
+        self._max_entries = max_entries
+        self._ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        # key -> (expiry in time.monotonic() seconds, corpora of the request, result)
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, request, credential: Optional[str] = None):
+        """Returns the cached result of a query request, or None.
+
+        The result is shared with every other caller of the same query with the same
+        credential, see QueryCache.
+        """
+        key = self._cache_key(request, credential)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, request, result, credential: Optional[str] = None):
+        """Caches the result of a query request, made with credential if given."""
+        key = self._cache_key(request, credential)
+        corpora = self._corpora(request)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_secs, corpora, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_corpus(self, customer_id: int, corpus_id: int):
+        """Drops every cached result that involves the corpus."""
+        corpus = (int(customer_id), int(corpus_id))
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if corpus in entry[1]]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drops every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the number of entries, hits and misses."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _cache_key(self, request, credential: Optional[str]) -> tuple:
+        """Returns the key of the entry of a query request made with credential."""
+        digest = None
+        if credential is not None:
+            digest = hashlib.sha256(credential.encode()).digest()
+        return digest, self._key(request)
+
+    def _key(self, request) -> bytes:
+        """Returns the normalized form of a query request."""
+        raise NotImplementedError
+
+    def _corpora(self, request) -> frozenset:
+        """Returns the (customer_id, corpus_id) pairs a query request reads from."""
+        raise NotImplementedError
@@ -0,0 +1,79 @@
+"""Paging through the results of a query, shared by the REST and gRPC examples.
+
+iterate_hits() requests the results in pages with start and num_results, and fetches
+the next page while the caller works through the current one. The transport decides
+how a page is fetched and parsed, see rest_query_pager and grpc_query_pager.
+"""
+
+from concurrent import futures
+from typing import Callable, Iterator, Optional
+
+
+class QueryPageError(Exception):
+    """Raised when a page of results cannot be fetched.
+
+    Attributes:
+        error: The error returned by the query of the page.
+        start: Position of the first result of the page.
+    """
+
+    def __init__(self, error, start: int):
+        super().__init__(f"Query of the results from {start} failed: {error}")
+        self.error = error
+        self.start = start
+
+
+def iterate_hits(fetch: Callable[[int, int], tuple],
+                 parse: Callable[[object], object],
+                 start: int,
+                 page_size: int,
+                 max_results: Optional[int] = None,
+                 prefetch: bool = True) -> Iterator:
+    """Yields the hits of a query, best first, fetching them one page at a time.
+
+    Args:
+        fetch: Function called with the position of the first result and the number of
+            results of a page, returning (message, True) on success and (error, False)
+            on failure.
+        parse: Function turning a message into a query result with num_hits() and
+            hits() methods.
+        start: Position of the first result.
+        page_size: Number of results requested per call.
+        max_results: Optional maximum number of hits to yield.
+        prefetch: Whether to request the next page while the current one is consumed.
+
+    Yields:
+        The hits of every page, until the results or max_results run out.
+
+    Raises:
+        QueryPageError: If a page could not be fetched.
+    """
+    end = start + max_results if max_results is not None else None
+
+    def page_size_at(position: int) -> int:
+        return page_size if end is None else min(page_size, end - position)
+
+    def fetch_at(position: int):
+        return fetch(position, page_size_at(position))
+
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_at, start) if prefetch else None
+        try:
+            while end is None or start < end:
+                message, ok = pending.result() if prefetch else fetch_at(start)
+                if not ok:
+                    raise QueryPageError(message, start)
+
+                result = parse(message)
+                requested = page_size_at(start)
+                start += requested
+                more = result.num_hits() == requested and (end is None or start < end)
+                if more and prefetch:
+                    pending = executor.submit(fetch_at, start)
+                yield from result.hits()
+                if not more:
+                    return
+        finally:
+            # Only reached with a page outstanding if the caller stopped iterating early.
+            if pending is not None:
+                pending.cancel()
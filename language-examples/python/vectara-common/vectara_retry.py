@@ -0,0 +1,230 @@
+"""Retries and hedged requests shared by the REST, gRPC and feature examples.
+
+The transports differ only in which failures are worth retrying and how a server asks
+for a delay, so call() takes those as arguments. rest_retry, grpc_retry and the feature
+examples' utils.retry wrap it for their own calls.
+"""
+
+import collections
+import email.utils
+import logging
+import random
+import threading
+import time
+from concurrent import futures
+from typing import Callable, Optional
+
+# HTTP status codes of overloaded or temporarily unavailable servers.
+RETRYABLE_HTTP_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class RetryBudget:
+    """Limits retries to a fraction of successful calls.
+
+    Every failed attempt withdraws one token and every success deposits token_ratio
+    tokens. Retries stop while at most half of max_tokens are left, so a struggling
+    server is not flooded with retries from all callers at once.
+    """
+
+    def __init__(self, max_tokens: float = 10.0, token_ratio: float = 0.1):
+        self._max_tokens = max_tokens
+        self._token_ratio = token_ratio
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def on_success(self):
+        """Deposits tokens for a successful call."""
+        with self._lock:
+            self._tokens = min(self._tokens + self._token_ratio, self._max_tokens)
+
+    def on_failure(self) -> bool:
+        """Withdraws a token for a failed attempt and returns whether a retry is allowed."""
+        with self._lock:
+            self._tokens = max(self._tokens - 1, 0.0)
+            return self._tokens > self._max_tokens / 2
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a retry budget."""
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 initial_backoff_secs: float = 0.1,
+                 max_backoff_secs: float = 10.0,
+                 multiplier: float = 2.0,
+                 max_retry_after_secs: float = 60.0,
+                 budget: Optional[RetryBudget] = None):
+        """Creates the policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one.
+            initial_backoff_secs: Upper bound of the delay before the first retry.
+            max_backoff_secs: Upper bound of the delay before any retry.
+            multiplier: Growth of the delay bound after each retry.
+            max_retry_after_secs: A server asking to wait longer than this, through
+                Retry-After or retry pushback, is not retried.
+            budget: RetryBudget shared between the calls using this policy.
+        """
+        self.max_attempts = max_attempts
+        self.initial_backoff_secs = initial_backoff_secs
+        self.max_backoff_secs = max_backoff_secs
+        self.multiplier = multiplier
+        self.max_retry_after_secs = max_retry_after_secs
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def backoff_secs(self, retry: int) -> float:
+        """Returns a random delay before the retry-th retry, counted from 0."""
+        bound = min(self.initial_backoff_secs * self.multiplier ** retry,
+                    self.max_backoff_secs)
+        return random.uniform(0, bound)
+
+
+def call(attempt: Callable[[], tuple],
+         policy: RetryPolicy,
+         is_retryable: Callable[[object], bool],
+         requested_delay_secs: Callable[[object], Optional[float]] = lambda error: None,
+         retryable_exceptions: tuple = (),
+         on_retry: Callable[[], None] = lambda: None):
+    """Calls an idempotent attempt until it succeeds or may not be retried.
+
+    Args:
+        attempt: Function without arguments returning (result, True) on success and
+            (error, False) on failure.
+        policy: RetryPolicy to apply.
+        is_retryable: Returns whether the error of a failed attempt is transient.
+        requested_delay_secs: Returns the delay the server asked for in a retryable
+            error, or None. It is waited instead of the backoff delay.
+        retryable_exceptions: Exceptions raised by attempt that are retried.
+        on_retry: Called before every retry, e.g., to count it.
+
+    Returns:
+        The (result, ok) pair of the last attempt. The exception of the last attempt is
+        raised if it raised one of retryable_exceptions.
+    """
+    for number in range(1, policy.max_attempts + 1):
+        try:
+            result, ok = attempt()
+        except retryable_exceptions as error:
+            logging.warning("Attempt %d failed with exception: %s", number, error)
+            if not _can_retry(policy, number):
+                raise
+            on_retry()
+            time.sleep(policy.backoff_secs(number - 1))
+            continue
+
+        if ok:
+            policy.budget.on_success()
+            return result, ok
+        if not is_retryable(result):
+            return result, ok
+
+        delay = requested_delay_secs(result)
+        if delay is not None and delay > policy.max_retry_after_secs:
+            return result, ok
+        if not _can_retry(policy, number):
+            return result, ok
+        logging.warning("Attempt %d failed with %s, retrying.", number, result)
+        on_retry()
+        time.sleep(delay if delay is not None else policy.backoff_secs(number - 1))
+    return result, ok
+
+
+def _can_retry(policy: RetryPolicy, number: int) -> bool:
+    """Records a failed attempt and returns whether another attempt may follow."""
+    return policy.budget.on_failure() and number < policy.max_attempts
+
+
+def retry_after_secs(value: Optional[str]) -> Optional[float]:
+    """Returns the delay requested by the value of a Retry-After header, or None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class Hedger:
+    """Sends a second copy of a slow idempotent call and returns the first success.
+
+    The copy is sent once the call has been pending longer than the given percentile
+    of recent successful latencies, so roughly (100 - percentile)% of calls are
+    hedged. Until min_samples latencies are known, initial_delay_secs is used.
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 initial_delay_secs: float = 0.5,
+                 window: int = 1000,
+                 min_samples: int = 20,
+                 max_workers: int = 32):
+        """Creates the hedger.
+
+        Args:
+            percentile: Percentile of recent latencies after which a copy is sent.
+            initial_delay_secs: Delay used until min_samples latencies are known.
+            window: Number of recent latencies kept.
+            min_samples: Number of latencies needed before using the percentile.
+            max_workers: Maximum number of calls in flight, including copies.
+        """
+        self._percentile = percentile
+        self._initial_delay_secs = initial_delay_secs
+        self._min_samples = min_samples
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Waits for the calls in flight and stops the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    def delay_secs(self) -> float:
+        """Returns how long a call may take before a copy is sent."""
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return self._initial_delay_secs
+            ordered = sorted(self._latencies)
+        index = min(int(len(ordered) * self._percentile / 100), len(ordered) - 1)
+        return ordered[index]
+
+    def call(self, function, *args, **kwargs):
+        """Calls an idempotent (result, ok) function, hedging it when it is slow.
+
+        Returns:
+            The first successful (result, True) pair of the original call and its copy,
+            or the (error, False) pair of the original call when both fail.
+        """
+        start = time.monotonic()
+        calls = [self._executor.submit(function, *args, **kwargs)]
+        done, _ = futures.wait(calls, timeout=self.delay_secs())
+        if not done:
+            logging.debug("Call still pending after %.3fs, sending a copy.",
+                          time.monotonic() - start)
+            calls.append(self._executor.submit(function, *args, **kwargs))
+
+        pending = set(calls)
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and future.result()[1]:
+                    self._record(time.monotonic() - start)
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+        return calls[0].result()
+
+    def _record(self, latency_secs: float):
+        """Remembers the latency of a successful call."""
+        with self._lock:
+            self._latencies.append(latency_secs)
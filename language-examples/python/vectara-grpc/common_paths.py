@@ -0,0 +1,14 @@
+"""Makes the modules shared by the Python examples importable.
+
+The examples are plain scripts that import their siblings by module name, so the
+vectara-common directory is added to sys.path instead of being installed as a package.
+Import this module before any module of vectara-common.
+"""
+
+import os
+import sys
+
+COMMON = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "vectara-common"))
+
+if COMMON not in sys.path:
+    sys.path.append(COMMON)
@@ -4,15 +4,20 @@ import argparse
 import logging
 import struct
 import sys
+from typing import Optional
 
 import grpc
 
-import services_pb2_grpc
+import grpc_basic_operations
+import grpc_channels
+import grpc_query_cache
 import serving_pb2
 import status_pb2
 
 
-def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, query: str):
+def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, query: str,
+          cache: Optional[grpc_query_cache.QueryCache] = None,
+          options: Optional[grpc_basic_operations.QueryOptions] = None):
     """Queries the data.
 
     Args:
@@ -20,19 +25,27 @@ def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, qu
         corpus_id: ID of the corpus to which data needs to be indexed.
         query_address: Address of the querying server. e.g., serving.vectara.io
         api_key: A valid API key with query access on the corpus.
+        query: Query to be made to the corpus.
+        cache: Optional QueryCache. A cached response is returned without calling the
+            server, and successful responses are added to the cache. Entries are kept
+            per API key, so a cache can be shared between keys.
+        options: Optional QueryOptions with the start, number of results, metadata
+            filter and reranker of the query. Defaults to the first 10 results.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
     """
-    request = serving_pb2.QueryRequest(query=query, num_results=10)
-    request.corpus_key.append(serving_pb2.CorpusKey(customer_id=customer_id, corpus_id=corpus_id))
-
     batch_request = serving_pb2.BatchQueryRequest()
-    batch_request.query.append(request)
+    batch_request.query.append(grpc_basic_operations.query_request(
+        customer_id, corpus_id, query, options or grpc_basic_operations.DEFAULT_QUERY_OPTIONS))
+
+    if cache is not None:
+        cached = cache.get(batch_request, credential=api_key)
+        if cached is not None:
+            return cached, True
 
     try:
-        query_stub = services_pb2_grpc.QueryServiceStub(
-            grpc.secure_channel(query_address, grpc.ssl_channel_credentials()))
+        query_stub = grpc_channels.query_stub(query_address)
         packed_customer_id = struct.pack(">q", customer_id)
         response = query_stub.Query(batch_request,
                                     metadata=[("customer-id-bin", packed_customer_id),
@@ -48,6 +61,8 @@ def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, qu
                 if status.code != status_pb2.StatusCode.OK:
                     return status, False
 
+        if cache is not None:
+            cache.put(batch_request, response, credential=api_key)
         return response, True
     except grpc.RpcError as rpc_error:
         logging.error("Query failed with exception: %s", rpc_error)
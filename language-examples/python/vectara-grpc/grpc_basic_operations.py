@@ -1,19 +1,20 @@
 """This is an example of calling Vectara API via python using gRPC as communication protocol."""
 
 import argparse
-import json
+import dataclasses
 import logging
 import struct
 import sys
+from typing import Optional
 
-from authlib.integrations import requests_client
 import grpc
 
 import admin_pb2
 import common_pb2
-import indexing_pb2
-import services_pb2
-import services_pb2_grpc
+import grpc_channels
+import grpc_document_builder
+import grpc_query_cache
+import grpc_util
 import serving_pb2
 import status_pb2
 
@@ -37,95 +38,89 @@ INDEXING_DATA = [
     },
 ]
 
-def _get_jwt_token(auth_url: str, app_client_id: str, app_client_secret: str):
-    """Connects to the server and returns a JWT token."""
-    token_endpoint = f"{auth_url}"
-    session = requests_client.OAuth2Session(
-        app_client_id, app_client_secret, scope="")
-    token = session.fetch_token(token_endpoint, grant_type="client_credentials")
-    return token["access_token"]
-
-
-def generate_index_data():
-    """Generates some example indexing data."""
-    documents = []
+def generate_index_requests(customer_id: int, corpus_id: int):
+    """Yields a request indexing some example data, one document at a time."""
     for i, book in enumerate(INDEXING_DATA):
-        document = indexing_pb2.Document()
-        document.document_id = f"doc-id-example-{i}"
-        document.title = book["title"]
-        document.metadata_json = json.dumps(
-            {
+        builder = grpc_document_builder.DocumentBuilder(
+            customer_id, corpus_id, f"doc-id-example-{i}",
+            title=book["title"],
+            metadata={
                 "book-name": book["title"],
                 "collection": book["genre"],
                 "author": book["author"]
-            }
-        )
-        section = indexing_pb2.Section()
-        section.text = book["excerpt"]
-        document.section.extend([section])
-        documents.append(document)
-    return documents
+            })
+        builder.add_section(book["excerpt"])
+        yield builder.request
+
+
+def generate_index_data():
+    """Generates some example indexing data."""
+    return [index_req.document for index_req in generate_index_requests(0, 0)]
 
 
-def index(customer_id: int, corpus_id: int, idx_address: str, jwt_token: str):
+def index(customer_id: int, corpus_id: int, idx_address: str, jwt_token: grpc_util.Token,
+          cache: Optional[grpc_query_cache.QueryCache] = None):
     """Indexes data to the corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         idx_address: Address of the indexing server. e.g., indexing.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
+        cache: Optional QueryCache whose results for the corpus are dropped once any
+            document was indexed, even if a later document fails.
 
     Returns:
         (None, True) in case of success and returns (error, False) in case of failure.
     """
     logging.info("Indexing data into the corpus.")
-    documents = generate_index_data()
-    for document in documents:
-        index_req = services_pb2.IndexDocumentRequest()
-        index_req.customer_id = customer_id
-        index_req.corpus_id = corpus_id
-        index_req.document.MergeFrom(document)
-
-        try:
-            index_stub = services_pb2_grpc.IndexServiceStub(
-                grpc.secure_channel(idx_address, grpc.ssl_channel_credentials()))
-
-            # The Vectara API expects the customer_id as a 64-bit
-            # binary encoded value in the metadata of all gRPC calls.
-            packed_customer_id = struct.pack(">q", int(customer_id))
-            response = index_stub.Index(index_req,
-                                        credentials=grpc.access_token_call_credentials(jwt_token),
-                                        metadata=[("customer-id-bin", packed_customer_id)])
-            if response.status.code not in (status_pb2.StatusCode.OK,
-                                            status_pb2.StatusCode.ALREADY_EXISTS):
-                logging.error("Index document failed: %s", response.status)
-                return response.status, False
-
-            logging.info("Index document successful: %s", response)
-        except grpc.RpcError as rpc_error:
-            logging.error("Index document failed: %s", rpc_error)
-            return rpc_error, False
+    index_stub = grpc_channels.index_stub(idx_address)
+    # The Vectara API expects the customer_id as a 64-bit
+    # binary encoded value in the metadata of all gRPC calls.
+    packed_customer_id = struct.pack(">q", int(customer_id))
+    call_credentials = grpc_util.call_credentials(jwt_token)
+    written = 0
+    try:
+        for index_req in generate_index_requests(customer_id, corpus_id):
+            try:
+                response = index_stub.Index(index_req,
+                                            credentials=call_credentials,
+                                            metadata=[("customer-id-bin", packed_customer_id)])
+                if response.status.code not in (status_pb2.StatusCode.OK,
+                                                status_pb2.StatusCode.ALREADY_EXISTS):
+                    logging.error("Index document failed: %s", response.status)
+                    return response.status, False
+
+                written += 1
+                logging.info("Index document successful: %s", response)
+            except grpc.RpcError as rpc_error:
+                logging.error("Index document failed: %s", rpc_error)
+                return rpc_error, False
+    finally:
+        if cache is not None and written:
+            cache.invalidate_corpus(customer_id, corpus_id)
     return None, True
 
 
-def delete(customer_id: int, corpus_id: int, idx_address: str, jwt_token: str, doc_id: str):
+def delete(customer_id: int, corpus_id: int, idx_address: str,
+           jwt_token: grpc_util.Token, doc_id: str,
+           cache: Optional[grpc_query_cache.QueryCache] = None):
     """Deletes a document from the corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         idx_address: Address of the indexing server. e.g., indexing.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
         doc_id: corpus-level unique id of document to be deleted.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
 
     Returns:
         (None, True) in case of success and returns (error, False) in case of failure.
     """
     logging.info("Deleting document from the corpus.")
     try:
-        index_stub = services_pb2_grpc.IndexServiceStub(
-            grpc.secure_channel(idx_address, grpc.ssl_channel_credentials()))
+        index_stub = grpc_channels.index_stub(idx_address)
 
         delete_req = common_pb2.DeleteDocumentRequest()
         delete_req.customer_id = customer_id
@@ -134,40 +129,83 @@ def delete(customer_id: int, corpus_id: int, idx_address: str, jwt_token: str, d
 
         packed_customer_id = struct.pack(">q", customer_id)
         response = index_stub.Delete(delete_req,
-                                     credentials=grpc.access_token_call_credentials(jwt_token),
+                                     credentials=grpc_util.call_credentials(jwt_token),
                                      metadata=[("customer-id-bin", packed_customer_id)])
         logging.info("Delete document successful: %s", response)
+        if cache is not None:
+            cache.invalidate_corpus(customer_id, corpus_id)
         return None, True
     except grpc.RpcError as rpc_error:
         logging.error("Delete document failed: %s", rpc_error)
         return rpc_error, False
 
 
-def query(customer_id: int, corpus_id: int, query_address: str, jwt_token: str, query: str):
+@dataclasses.dataclass(frozen=True)
+class QueryOptions:
+    """Paging, filtering and reranking of a query.
+
+    Attributes:
+        start: Position of the first result to return, to page through results.
+        num_results: Maximum number of results to return.
+        metadata_filter: Optional filter on document and part metadata, e.g.,
+            "doc.year > 2020 and part.lang = 'eng'".
+        reranker_id: Optional ID of the reranker applied to the results.
+    """
+    start: int = 0
+    num_results: int = 10
+    metadata_filter: Optional[str] = None
+    reranker_id: Optional[int] = None
+
+
+DEFAULT_QUERY_OPTIONS = QueryOptions()
+
+
+def query_request(customer_id: int, corpus_id: int, query: str,
+                  options: QueryOptions = DEFAULT_QUERY_OPTIONS) -> serving_pb2.QueryRequest:
+    """Returns a single query of a batch query request."""
+    request = serving_pb2.QueryRequest(query=query, start=options.start,
+                                       num_results=options.num_results)
+    request.corpus_key.add(customer_id=customer_id, corpus_id=corpus_id,
+                           metadata_filter=options.metadata_filter or "")
+    if options.reranker_id is not None:
+        request.reranking_config.reranker_id = options.reranker_id
+    return request
+
+
+def query(customer_id: int, corpus_id: int, query_address: str,
+          jwt_token: grpc_util.Token, query: str,
+          cache: Optional[grpc_query_cache.QueryCache] = None,
+          options: Optional[QueryOptions] = None):
     """Queries the data.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         query_address: Address of the querying server. e.g., serving.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
         query: Query to be made to the corpus.
+        cache: Optional QueryCache. A cached response is returned without calling the
+            server, and successful responses are added to the cache.
+        options: Optional QueryOptions with the start, number of results, metadata
+            filter and reranker of the query. Defaults to the first 10 results.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
     """
-    request = serving_pb2.QueryRequest(query=query, num_results=10)
-    request.corpus_key.append(serving_pb2.CorpusKey(customer_id=customer_id, corpus_id=corpus_id))
-
     batch_request = serving_pb2.BatchQueryRequest()
-    batch_request.query.append(request)
+    batch_request.query.append(query_request(customer_id, corpus_id, query,
+                                             options or DEFAULT_QUERY_OPTIONS))
+
+    if cache is not None:
+        cached = cache.get(batch_request)
+        if cached is not None:
+            return cached, True
 
     try:
-        query_stub = services_pb2_grpc.QueryServiceStub(
-            grpc.secure_channel(query_address, grpc.ssl_channel_credentials()))
+        query_stub = grpc_channels.query_stub(query_address)
         packed_customer_id = struct.pack(">q", customer_id)
         response = query_stub.Query(batch_request,
-                                    credentials=grpc.access_token_call_credentials(jwt_token),
+                                    credentials=grpc_util.call_credentials(jwt_token),
                                     metadata=[("customer-id-bin", packed_customer_id)])
         if (response.status and
             any(status.code != status_pb2.StatusCode.OK
@@ -180,20 +218,24 @@ def query(customer_id: int, corpus_id: int, query_address: str, jwt_token: str,
                 if status.code != status_pb2.StatusCode.OK:
                     return status, False
 
-        logging.info("Query succeeded with response: %s", response)
+        # Formatting every result as text is costly, so the response is only logged
+        # in full when debugging.
+        logging.debug("Query succeeded with response: %s", response)
+        if cache is not None:
+            cache.put(batch_request, response)
         return response, True
     except grpc.RpcError as rpc_error:
         logging.error("Query failed with exception: %s", rpc_error)
         return rpc_error, False
 
 
-def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
+def create_corpus(customer_id: int, admin_address: str, jwt_token: grpc_util.Token):
     """Creates a corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         admin_address: Address of the admin server. e.g., admin.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
 
     Returns:
         (corpus_id, True) in case of success and returns (error, False) in case of failure.
@@ -206,13 +248,12 @@ def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
     create_corpus_request.corpus.CopyFrom(corpus)
 
     try:
-        admin_stub = services_pb2_grpc.AdminServiceStub(
-            grpc.secure_channel(admin_address, grpc.ssl_channel_credentials()))
+        admin_stub = grpc_channels.admin_stub(admin_address)
         packed_customer_id = struct.pack(">q", customer_id)
 
         response = admin_stub.CreateCorpus(
             create_corpus_request,
-            credentials=grpc.access_token_call_credentials(jwt_token),
+            credentials=grpc_util.call_credentials(jwt_token),
             metadata=[("customer-id-bin", packed_customer_id)])
 
         if response.status.code != status_pb2.StatusCode.OK:
@@ -226,14 +267,17 @@ def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
         return rpc_error, False
 
 
-def delete_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_token: str):
+def delete_corpus(customer_id: int, corpus_id: int, admin_address: str,
+                  jwt_token: grpc_util.Token,
+                  cache: Optional[grpc_query_cache.QueryCache] = None):
     """Deletes a corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: The ID of the corpus to be deleted.
         admin_address: Address of the admin server. e.g., admin.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
 
     Returns:
         (None, True) in case of success and returns (error, False) in case of failure.
@@ -245,13 +289,12 @@ def delete_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_toke
     logging.info("Deleting corpus %d in customer account %d.", corpus_id, customer_id)
 
     try:
-        admin_stub = services_pb2_grpc.AdminServiceStub(
-            grpc.secure_channel(admin_address, grpc.ssl_channel_credentials()))
+        admin_stub = grpc_channels.admin_stub(admin_address)
         packed_customer_id = struct.pack(">q", customer_id)
 
         response = admin_stub.DeleteCorpus(
             delete_corpus_request,
-            credentials=grpc.access_token_call_credentials(jwt_token),
+            credentials=grpc_util.call_credentials(jwt_token),
             metadata=[("customer-id-bin", packed_customer_id)])
 
         if response.status.code != status_pb2.StatusCode.OK:
@@ -259,6 +302,8 @@ def delete_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_toke
             return response.status, False
 
         logging.info("Corpus %d deleted successfully.", corpus_id)
+        if cache is not None:
+            cache.invalidate_corpus(customer_id, corpus_id)
         return None, True
     except grpc.RpcError as rpc_error:
         logging.error("Corpus deletion failed: %s", rpc_error)
@@ -291,7 +336,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args:
-        token = _get_jwt_token(args.auth_url, args.app_client_id, args.app_client_secret)
+        token = grpc_util.get_jwt_token(args.auth_url, args.app_client_id, args.app_client_secret)
 
         if token:
             response, status = index(args.customer_id,
@@ -0,0 +1,99 @@
+"""Deleting large numbers of documents over gRPC with bounded concurrency.
+
+Document IDs are read from a stream, e.g., a file or stdin, and deleted concurrently
+over a pooled connection. With a checkpoint file, every deleted ID is recorded so
+that an interrupted run can be started again with the same input and resumes where it
+stopped. The run itself is shared with the REST examples in vectara_bulk_delete.
+
+Usage:
+    python3 grpc_bulk_deleter.py ... --input ids.txt --checkpoint ids.done
+    cat ids.txt | python3 grpc_bulk_deleter.py ... --input - --checkpoint ids.done
+"""
+
+import struct
+from typing import Iterable, Iterator, Optional
+
+import grpc
+
+import common_paths  # pylint: disable=unused-import
+import common_pb2
+import grpc_channels
+import grpc_query_cache
+import grpc_retry
+import grpc_util
+import vectara_bulk_delete
+
+Checkpoint = vectara_bulk_delete.Checkpoint
+DeleteResult = vectara_bulk_delete.DeleteResult
+Summary = vectara_bulk_delete.Summary
+read_ids = vectara_bulk_delete.read_ids
+
+
+def bulk_delete(customer_id: int,
+                corpus_id: int,
+                idx_address: str,
+                jwt_token: grpc_util.Token,
+                document_ids: Iterable[str],
+                max_workers: int = 16,
+                checkpoint: Optional[Checkpoint] = None,
+                summary: Optional[Summary] = None,
+                cache: Optional[grpc_query_cache.QueryCache] = None,
+                timeout: Optional[float] = None,
+                policy: Optional[grpc_retry.RetryPolicy] = None) -> Iterator[DeleteResult]:
+    """Deletes documents keeping up to max_workers requests outstanding.
+
+    IDs are pulled from the iterable only when a worker is free, so a stream of
+    millions of IDs is never materialized. A failing document is reported and does not
+    stop the run. Deletion is idempotent, so transient failures are retried. All
+    requests share the pooled channel of grpc_channels.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus from which documents will be deleted.
+        idx_address: Address of the indexing server. e.g., indexing.vectara.io
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider so that a long run
+            outlives the lifetime of a single token.
+        document_ids: IDs of the documents to delete.
+        max_workers: Maximum number of concurrent requests.
+        checkpoint: Optional Checkpoint recording deleted IDs. IDs it already holds
+            are skipped.
+        summary: Optional Summary updated as documents are deleted.
+        cache: Optional QueryCache whose results for the corpus are dropped at the end.
+        timeout: Optional deadline in seconds for each request.
+        policy: RetryPolicy of each request. Defaults to grpc_retry.DEFAULT_POLICY.
+
+    Yields:
+        A DeleteResult per deleted or failed document, in completion order. A failed
+        document carries the grpc.RpcError raised by the call.
+    """
+    summary = summary if summary is not None else Summary()
+    index_stub = grpc_channels.index_stub(idx_address)
+    call_credentials = grpc_util.call_credentials(jwt_token)
+    metadata = [("customer-id-bin", struct.pack(">q", customer_id))]
+
+    def delete_once(document_id: str):
+        request = common_pb2.DeleteDocumentRequest(customer_id=customer_id,
+                                                   corpus_id=corpus_id,
+                                                   document_id=document_id)
+        try:
+            index_stub.Delete(request, timeout=timeout, credentials=call_credentials,
+                              metadata=metadata)
+        except grpc.RpcError as rpc_error:
+            return rpc_error, False
+        return None, True
+
+    def delete(document_id: str) -> DeleteResult:
+        error, ok = grpc_retry.call(delete_once, document_id, policy=policy)
+        return DeleteResult(document_id, ok, error)
+
+    try:
+        yield from vectara_bulk_delete.bulk_delete(delete, document_ids, max_workers,
+                                                   checkpoint, summary)
+    finally:
+        if cache is not None and summary.deleted:
+            cache.invalidate_corpus(customer_id, corpus_id)
+
+
+if __name__ == "__main__":
+    vectara_bulk_delete.main("Vectara gRPC bulk deletion example", "indexing.vectara.io",
+                             grpc_util.get_token_provider, bulk_delete)
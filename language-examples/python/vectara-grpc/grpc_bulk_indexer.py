@@ -0,0 +1,184 @@
+"""Bulk indexing of documents into Vectara over gRPC with bounded concurrency."""
+
+import argparse
+import dataclasses
+import json
+import logging
+import queue
+import struct
+import sys
+from typing import Iterable, Iterator, Optional, Union
+
+import grpc
+
+import grpc_channels
+import grpc_document_builder
+import grpc_util
+import indexing_pb2
+import services_pb2
+import status_pb2
+
+OK = "OK"
+ALREADY_EXISTS = "ALREADY_EXISTS"
+FAILED = "FAILED"
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexResult:
+    """Outcome of indexing a single document.
+
+    outcome is one of OK, ALREADY_EXISTS or FAILED. A failed document carries either the
+    status returned by the server, or the grpc.RpcError raised by the call, or the
+    grpc.FutureCancelledError of a call cancelled before it completed.
+    """
+    document_id: str
+    outcome: str
+    status: Optional[status_pb2.Status] = None
+    error: Optional[Exception] = None
+
+
+def _to_result(document_id: str, future: grpc.Future) -> IndexResult:
+    """Converts a completed Index call into an IndexResult."""
+    try:
+        response = future.result()
+    except (grpc.RpcError, grpc.FutureCancelledError) as error:
+        return IndexResult(document_id, FAILED, error=error)
+
+    if response.status.code == status_pb2.StatusCode.OK:
+        return IndexResult(document_id, OK, status=response.status)
+    if response.status.code == status_pb2.StatusCode.ALREADY_EXISTS:
+        return IndexResult(document_id, ALREADY_EXISTS, status=response.status)
+    return IndexResult(document_id, FAILED, status=response.status)
+
+
+def bulk_index(customer_id: int,
+               corpus_id: int,
+               idx_address: str,
+               jwt_token: grpc_util.Token,
+               documents: Iterable[Union[indexing_pb2.Document,
+                                         services_pb2.IndexDocumentRequest]],
+               max_in_flight: int = 32,
+               timeout: Optional[float] = None) -> Iterator[IndexResult]:
+    """Indexes documents keeping up to max_in_flight requests outstanding.
+
+    Documents are pulled from the iterable only when a request slot is free, so a
+    generator over millions of documents is never materialized. A failing document is
+    reported and does not stop the run.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to which data needs to be indexed.
+        idx_address: Address of the indexing server. e.g., indexing.vectara.io
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider so that a long run
+            outlives the lifetime of a single token.
+        documents: Documents to be indexed, or requests built in place by
+            grpc_document_builder.DocumentBuilder, which are sent without a copy.
+        max_in_flight: Maximum number of concurrent Index requests.
+        timeout: Optional deadline in seconds for each Index request.
+
+    Yields:
+        An IndexResult per document, in completion order.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+
+    index_stub = grpc_channels.index_stub(idx_address)
+    call_credentials = grpc_util.call_credentials(jwt_token)
+    metadata = [("customer-id-bin", struct.pack(">q", customer_id))]
+    completed = queue.Queue()
+    in_flight = {}
+
+    def on_done(future, document_id):
+        completed.put((document_id, future))
+
+    def take_completed(block: bool) -> IndexResult:
+        document_id, future = completed.get(block=block)
+        del in_flight[future]
+        return _to_result(document_id, future)
+
+    try:
+        for document in documents:
+            # Backpressure: wait for a free slot before reading the next document.
+            while len(in_flight) >= max_in_flight:
+                yield take_completed(block=True)
+
+            index_req = grpc_document_builder.as_index_request(customer_id, corpus_id,
+                                                               document)
+            document_id = index_req.document.document_id
+            future = index_stub.Index.future(index_req,
+                                             timeout=timeout,
+                                             credentials=call_credentials,
+                                             metadata=metadata)
+            in_flight[future] = document_id
+            future.add_done_callback(
+                lambda f, document_id=document_id: on_done(f, document_id))
+
+            while not completed.empty():
+                yield take_completed(block=False)
+
+        while in_flight:
+            yield take_completed(block=True)
+    finally:
+        # Only reached with requests outstanding if the caller stopped iterating early.
+        for future in list(in_flight):
+            future.cancel()
+
+
+def _read_requests(path: str, customer_id: int = 0,
+                   corpus_id: int = 0) -> Iterator[services_pb2.IndexDocumentRequest]:
+    """Yields a request per document of a JSON lines file, built in place.
+
+    Each line holds document_id, title, an optional metadata object and a list of
+    section texts, e.g. {"document_id": "1", "title": "T", "sections": ["text"]}.
+    """
+    with open(path, encoding="utf-8") as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            builder = grpc_document_builder.DocumentBuilder(
+                customer_id, corpus_id, record["document_id"],
+                title=record.get("title", ""),
+                metadata=json.dumps(record.get("metadata", {})))
+            builder.add_sections(record.get("sections", []))
+            yield builder.request
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Vectara gRPC bulk indexing example")
+
+    parser.add_argument("--customer-id", type=int, required=True,
+                        help="Unique customer ID in Vectara platform.")
+    parser.add_argument("--corpus-id", type=int, required=True,
+                        help="Corpus ID to which data will be indexed.")
+    parser.add_argument("--indexing-endpoint", help="The endpoint of indexing server.",
+                        default="indexing.vectara.io")
+    parser.add_argument("--app-client-id", required=True,
+                        help="This app client should have enough rights.")
+    parser.add_argument("--app-client-secret", required=True)
+    parser.add_argument("--auth-url", required=True,
+                        help="The authentication URL for this customer.")
+    parser.add_argument("--input", required=True,
+                        help="JSON lines file with one document per line.")
+    parser.add_argument("--max-in-flight", type=int, default=32,
+                        help="Maximum number of concurrent index requests.")
+
+    args = parser.parse_args()
+
+    token_provider = grpc_util.get_token_provider(
+        args.auth_url, args.app_client_id, args.app_client_secret)
+
+    counts = {OK: 0, ALREADY_EXISTS: 0, FAILED: 0}
+    for result in bulk_index(args.customer_id, args.corpus_id, args.indexing_endpoint,
+                             token_provider, _read_requests(args.input), args.max_in_flight):
+        counts[result.outcome] += 1
+        if result.outcome == FAILED:
+            logging.error("Indexing %s failed: %s", result.document_id,
+                          result.error or result.status)
+
+    logging.info("Bulk indexing finished: %s", counts)
+    if counts[FAILED]:
+        sys.exit(1)
@@ -0,0 +1,101 @@
+"""Shared gRPC channels and stubs for calling the Vectara API.
+
+Opening a channel costs a full TLS + HTTP/2 handshake, so a channel is created once per
+endpoint and reused by every call made from the process. Channels are closed on exit.
+"""
+
+import atexit
+import threading
+
+import grpc
+
+import grpc_metrics
+import services_pb2_grpc
+
+# Keep idle connections open through proxies and load balancers, and allow large
+# documents and result sets to pass without hitting the default 4MB message limit.
+# gRPC servers reject pings more frequent than every 5 minutes on connections without
+# calls by default, answering with GOAWAY too_many_pings, so idle channels ping no more
+# often than that.
+CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", 300000),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", 64 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+)
+
+_lock = threading.Lock()
+_channels = {}
+_stubs = {}
+
+
+def get_channel(address: str, credentials: grpc.ChannelCredentials = None) -> grpc.Channel:
+    """Returns the shared channel for an endpoint, creating it on first use.
+
+    While grpc_metrics is enabled, the returned channel records its calls. It shares its
+    connections with the plain channel of the same endpoint.
+
+    Args:
+        address: Address of the server. e.g., indexing.vectara.io
+        credentials: Channel credentials used when the channel is first created.
+            Defaults to SSL credentials.
+
+    Returns:
+        A grpc.Channel shared by every caller using the same address.
+    """
+    instrumented = grpc_metrics.enabled()
+    with _lock:
+        channel = _channels.get((address, instrumented))
+        if channel is None:
+            channel = _channels.get((address, False))
+            if channel is None:
+                channel = grpc.secure_channel(address,
+                                              credentials or grpc.ssl_channel_credentials(),
+                                              options=CHANNEL_OPTIONS)
+                _channels[(address, False)] = channel
+            if instrumented:
+                channel = grpc.intercept_channel(channel, grpc_metrics.Interceptor())
+                _channels[(address, True)] = channel
+        return channel
+
+
+def _get_stub(stub_class, address: str):
+    """Returns a cached stub of the given class bound to the shared channel of address."""
+    key = (stub_class, address, grpc_metrics.enabled())
+    with _lock:
+        stub = _stubs.get(key)
+    if stub is None:
+        channel = get_channel(address)
+        with _lock:
+            stub = _stubs.setdefault(key, stub_class(channel))
+    return stub
+
+
+def index_stub(address: str) -> services_pb2_grpc.IndexServiceStub:
+    """Returns the shared IndexService stub for an indexing endpoint."""
+    return _get_stub(services_pb2_grpc.IndexServiceStub, address)
+
+
+def query_stub(address: str) -> services_pb2_grpc.QueryServiceStub:
+    """Returns the shared QueryService stub for a serving endpoint."""
+    return _get_stub(services_pb2_grpc.QueryServiceStub, address)
+
+
+def admin_stub(address: str) -> services_pb2_grpc.AdminServiceStub:
+    """Returns the shared AdminService stub for an admin endpoint."""
+    return _get_stub(services_pb2_grpc.AdminServiceStub, address)
+
+
+def close_all():
+    """Closes every shared channel. Later calls transparently open new channels."""
+    with _lock:
+        channels = list(_channels.values())
+        _channels.clear()
+        _stubs.clear()
+    for channel in channels:
+        channel.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,122 @@
+"""Building IndexDocumentRequests in place, without intermediate copies.
+
+Building a Document and then setting it on a request, with MergeFrom or the document=
+argument of the constructor, copies the whole document, text included, a second time.
+DocumentBuilder writes every field straight into the document of the request that is
+sent, and takes sections from any iterable, so a document with thousands of sections
+is built in one pass and never exists twice.
+
+Usage:
+    builder = grpc_document_builder.DocumentBuilder(customer_id, corpus_id, "doc-1",
+                                                    title="A title",
+                                                    metadata={"author": "Someone"})
+    builder.add_sections(paragraph for paragraph in text.split("\\n\\n"))
+    response = index_stub.Index(builder.request, ...)
+"""
+
+import json
+from typing import Iterable, Optional, Union
+
+import indexing_pb2
+import services_pb2
+
+# Metadata given as a dict is serialized to JSON, a str is used as is.
+Metadata = Union[dict, str]
+
+# A section given as its text, or as a dict with a "text" and optionally a "title",
+# "metadata" and nested "sections".
+SectionData = Union[str, dict]
+
+
+def _metadata_json(metadata: Metadata) -> str:
+    """Returns metadata as a JSON string."""
+    return metadata if isinstance(metadata, str) else json.dumps(metadata)
+
+
+def _fill_section(section: indexing_pb2.Section, data: SectionData):
+    """Writes a section and its nested sections in place."""
+    if isinstance(data, str):
+        section.text = data
+        return
+    section.text = data.get("text", "")
+    if data.get("title"):
+        section.title = data["title"]
+    if data.get("metadata"):
+        section.metadata_json = _metadata_json(data["metadata"])
+    for nested in data.get("sections", ()):
+        _fill_section(section.section.add(), nested)
+
+
+class DocumentBuilder:
+    """Builds the document of an IndexDocumentRequest in place.
+
+    The builder does not keep the sections it is given, so building from a generator
+    holds a single section in Python objects at a time.
+    """
+
+    def __init__(self,
+                 customer_id: int,
+                 corpus_id: int,
+                 document_id: str,
+                 title: str = "",
+                 metadata: Optional[Metadata] = None,
+                 description: str = ""):
+        """Starts the request of a document.
+
+        Args:
+            customer_id: Unique customer ID in vectara platform.
+            corpus_id: ID of the corpus to which data needs to be indexed.
+            document_id: ID of the document, unique within the corpus.
+            title: Optional title of the document.
+            metadata: Optional metadata of the document, as a dict or a JSON string.
+            description: Optional description of the document.
+        """
+        self.request = services_pb2.IndexDocumentRequest(customer_id=customer_id,
+                                                         corpus_id=corpus_id)
+        # A reference into the request: writing to it writes to the request.
+        self._document = self.request.document
+        self._document.document_id = document_id
+        if title:
+            self._document.title = title
+        if description:
+            self._document.description = description
+        if metadata:
+            self._document.metadata_json = _metadata_json(metadata)
+
+    @property
+    def document(self) -> indexing_pb2.Document:
+        """Returns the document of the request, which is not a copy."""
+        return self._document
+
+    def add_section(self, text: str, title: str = "",
+                    metadata: Optional[Metadata] = None) -> indexing_pb2.Section:
+        """Appends a section and returns it, e.g., to add nested sections to it."""
+        section = self._document.section.add(text=text)
+        if title:
+            section.title = title
+        if metadata:
+            section.metadata_json = _metadata_json(metadata)
+        return section
+
+    def add_sections(self, sections: Iterable[SectionData]) -> "DocumentBuilder":
+        """Appends every section of an iterable, consuming it lazily."""
+        add = self._document.section.add
+        for data in sections:
+            _fill_section(add(), data)
+        return self
+
+
+def as_index_request(customer_id: int, corpus_id: int,
+                     item: Union[indexing_pb2.Document, services_pb2.IndexDocumentRequest],
+                     ) -> services_pb2.IndexDocumentRequest:
+    """Returns the request indexing a document or a prebuilt request.
+
+    A request, e.g., DocumentBuilder.request, is returned as is after setting its
+    customer and corpus IDs. A Document is copied into a new request.
+    """
+    if isinstance(item, services_pb2.IndexDocumentRequest):
+        item.customer_id = customer_id
+        item.corpus_id = corpus_id
+        return item
+    return services_pb2.IndexDocumentRequest(customer_id=customer_id, corpus_id=corpus_id,
+                                             document=item)
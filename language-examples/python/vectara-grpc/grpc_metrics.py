@@ -0,0 +1,87 @@
+"""Metrics and tracing of the gRPC calls made by the examples.
+
+Every call is recorded under its operation, the snake_case name of the RPC method, e.g.,
+query or create_corpus: a latency histogram per status code, the sizes of requests and
+responses, retries and the calls in flight. Metrics are exported in the Prometheus text
+format, and each call becomes an OpenTelemetry span when tracing is on and the
+opentelemetry-api package is installed.
+
+The registry, export and spans are shared with the other examples in vectara_metrics.
+The metric names of this module start with vectara_grpc.
+
+Calls are recorded by an interceptor on the channels of grpc_channels. Nothing is recorded
+until enable() is called, and until then stubs are bound to channels without the
+interceptor, so disabled metrics cost nothing per call. Only calls made through stubs
+fetched from grpc_channels after enable() are recorded, so enable metrics before creating
+long-lived objects such as a grpc_query_batcher.QueryBatcher. Likewise, stubs fetched
+before disable() keep recording their calls.
+
+Usage:
+    registry = grpc_metrics.enable(tracing=True)
+    grpc_basic_operations.query(customer_id, corpus_id, address, token, "q")
+    print(registry.prometheus_text())
+"""
+
+import re
+from typing import Optional
+
+import grpc
+
+import common_paths  # pylint: disable=unused-import
+import vectara_metrics
+
+LATENCY_BUCKETS_SECS = vectara_metrics.LATENCY_BUCKETS_SECS
+SIZE_BUCKETS_BYTES = vectara_metrics.SIZE_BUCKETS_BYTES
+Histogram = vectara_metrics.Histogram
+Call = vectara_metrics.Call
+
+
+class Registry(vectara_metrics.Registry):
+    """vectara_metrics.Registry whose metric names start with vectara_grpc."""
+
+    def __init__(self, prefix: str = "vectara_grpc", **kwargs):
+        super().__init__(prefix, **kwargs)
+
+
+_instrumentation = vectara_metrics.Instrumentation(
+    __name__, Registry, status_attribute="rpc.grpc.status_code", ok_code="OK",
+    span_attributes={"rpc.system": "grpc"})
+
+enable = _instrumentation.enable
+disable = _instrumentation.disable
+get_registry = _instrumentation.get_registry
+enabled = _instrumentation.enabled
+retried = _instrumentation.retried
+start = _instrumentation.start
+serve = _instrumentation.serve
+
+_operations = {}
+
+
+def _operation(method: str) -> str:
+    """Returns the operation of a full method name, e.g., query for /.../Query."""
+    operation = _operations.get(method)
+    if operation is None:
+        name = method.rsplit("/", 1)[-1]
+        operation = _operations[method] = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    return operation
+
+
+def _response_size(future) -> Optional[int]:
+    """Returns the size of the response of a successful call."""
+    return future.result().ByteSize() if future.code() == grpc.StatusCode.OK else None
+
+
+class Interceptor(grpc.UnaryUnaryClientInterceptor):
+    """Records the unary calls made through a channel, blocking or not."""
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        call = start(_operation(client_call_details.method))
+        if call is None:
+            return continuation(client_call_details, request)
+        request_bytes = request.ByteSize()
+        outcome = continuation(client_call_details, request)
+        outcome.add_done_callback(
+            lambda future: call.finish(future.code().name, request_bytes,
+                                       _response_size(future)))
+        return outcome
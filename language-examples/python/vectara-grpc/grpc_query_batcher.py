@@ -0,0 +1,205 @@
+"""Micro-batching of individual queries into BatchQueryRequests over gRPC."""
+
+import logging
+import queue
+import struct
+import threading
+import time
+from concurrent import futures
+from typing import Optional
+
+import grpc
+
+import grpc_basic_operations
+import grpc_channels
+import grpc_util
+import serving_pb2
+import status_pb2
+
+
+class QueryBatcher:
+    """Collects queries from many callers and sends them as one BatchQueryRequest.
+
+    A batch is sent when it holds max_batch_size queries or max_delay_secs after its first
+    query arrived, whichever comes first. At most max_concurrent_batches batches are in
+    flight; while they all are, new queries wait and join larger batches. Each caller
+    gets a future that resolves to the same (result, ok) pair returned by
+    grpc_basic_operations.query, where result is the caller's own ResponseSet.
+
+    Usage:
+        with QueryBatcher(customer_id, "serving.vectara.io", token) as batcher:
+            response_set, ok = batcher.query(corpus_id, "What is the answer?")
+    """
+
+    def __init__(self,
+                 customer_id: int,
+                 query_address: str,
+                 jwt_token: grpc_util.Token,
+                 max_batch_size: int = 32,
+                 max_delay_secs: float = 0.005,
+                 max_concurrent_batches: int = 4):
+        """Creates the batcher and starts its collector thread.
+
+        Args:
+            customer_id: Unique customer ID in vectara platform.
+            query_address: Address of the querying server. e.g., serving.vectara.io
+            jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
+            max_batch_size: Maximum number of queries in one BatchQueryRequest.
+            max_delay_secs: Maximum time a query waits for others to join its batch.
+            max_concurrent_batches: Maximum number of batch requests in flight.
+        """
+        self._customer_id = customer_id
+        self._stub = grpc_channels.query_stub(query_address)
+        self._credentials = grpc_util.call_credentials(jwt_token)
+        self._metadata = [("customer-id-bin", struct.pack(">q", customer_id))]
+        self._max_batch_size = max_batch_size
+        self._max_delay_secs = max_delay_secs
+        self._in_flight = threading.BoundedSemaphore(max_concurrent_batches)
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, request: serving_pb2.QueryRequest) -> futures.Future:
+        """Queues a query and returns a future of its (result, ok) pair."""
+        future = futures.Future()
+        # Checked and queued under the lock, so that no query is queued after the
+        # sentinel of close(), where the collector would never see it.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("QueryBatcher is closed.")
+            self._pending.put((request, future))
+        return future
+
+    def query(self, corpus_id: int, query: str, num_results: int = 10,
+              options: Optional[grpc_basic_operations.QueryOptions] = None):
+        """Queries a corpus through the batcher and waits for the result.
+
+        Args:
+            corpus_id: ID of the corpus to query.
+            query: Query to be made to the corpus.
+            num_results: Maximum number of results, if options is not given.
+            options: Optional QueryOptions, see grpc_basic_operations.query.
+
+        Returns:
+            (response_set, True) in case of success and returns (error, False) in case of
+            failure.
+        """
+        options = options or grpc_basic_operations.QueryOptions(num_results=num_results)
+        return self.submit(grpc_basic_operations.query_request(
+            self._customer_id, corpus_id, query, options)).result()
+
+    def close(self):
+        """Sends the queries already submitted and stops the collector."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(None)
+        self._collector.join()
+
+    def _collect(self):
+        """Groups pending queries into batches until close() is called."""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._max_delay_secs
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._send(batch)
+                    return
+                batch.append(item)
+            self._send(batch)
+
+    def _send(self, batch):
+        """Sends one batch without waiting for its response.
+
+        Blocks while max_concurrent_batches batches are in flight. Futures cancelled by
+        their callers are dropped. If the call cannot be started,
+        e.g., because the channel is closed, the batch fails and the collector goes on.
+        """
+        batch = [(request, future) for request, future in batch
+                 if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        batch_futures = [future for _, future in batch]
+        batch_request = serving_pb2.BatchQueryRequest()
+        batch_request.query.extend(request for request, _ in batch)
+        self._in_flight.acquire()
+        try:
+            call = self._stub.Query.future(batch_request,
+                                           credentials=self._credentials,
+                                           metadata=self._metadata)
+        except Exception as error:  # pylint: disable=broad-except
+            self._in_flight.release()
+            logging.error("Query failed with exception: %s", error)
+            _set_results(batch_futures, (error, False))
+            return
+        call.add_done_callback(lambda call: self._finished(batch_futures, call))
+
+    def _finished(self, batch_futures, call):
+        """Frees the slot of a completed batch call and resolves its futures."""
+        self._in_flight.release()
+        _complete(batch_futures, call)
+
+
+def _complete(batch_futures, call):
+    """Resolves the future of each query of a completed batch call.
+
+    Every future gets a result, even if the call was cancelled or its response is
+    malformed, so that no caller waits forever.
+    """
+    try:
+        _split(batch_futures, call)
+    except Exception as error:  # pylint: disable=broad-except
+        logging.error("Query failed with exception: %s", error)
+        _set_results([future for future in batch_futures if not future.done()],
+                     (error, False))
+
+
+def _split(batch_futures, call):
+    """Splits the response of a batch call between the futures of its queries."""
+    try:
+        response = call.result()
+    except (grpc.RpcError, grpc.FutureCancelledError) as error:
+        logging.error("Query failed with exception: %s", error)
+        _set_results(batch_futures, (error, False))
+        return
+
+    if (response.status and
+        any(status.code != status_pb2.StatusCode.OK for status in response.status)):
+        logging.error("Query failed with response: %s", response.status)
+        _set_results(batch_futures, (response.status, False))
+        return
+
+    if len(response.response_set) != len(batch_futures):
+        logging.error("Query returned %d response sets for %d queries.",
+                      len(response.response_set), len(batch_futures))
+
+    for i, future in enumerate(batch_futures):
+        if i >= len(response.response_set):
+            future.set_result((response, False))
+            continue
+        response_set = response.response_set[i]
+        failed = [status for status in response_set.status
+                  if status.code != status_pb2.StatusCode.OK]
+        future.set_result((failed[0], False) if failed else (response_set, True))
+
+
+def _set_results(batch_futures, result):
+    """Resolves every future of a batch with the same result."""
+    for future in batch_futures:
+        future.set_result(result)
@@ -0,0 +1,21 @@
+"""Client-side cache of query results for the gRPC examples."""
+
+import common_paths  # pylint: disable=unused-import
+import serving_pb2
+import vectara_query_cache
+
+
+class QueryCache(vectara_query_cache.QueryCache):
+    """vectara_query_cache.QueryCache of gRPC BatchQueryRequests.
+
+    Cached results are the response messages returned to every caller of the same
+    query. They are shared, not copied, and must not be modified.
+    """
+
+    def _key(self, request: serving_pb2.BatchQueryRequest) -> bytes:
+        return request.SerializeToString(deterministic=True)
+
+    def _corpora(self, request: serving_pb2.BatchQueryRequest) -> frozenset:
+        return frozenset((key.customer_id, key.corpus_id)
+                         for query in request.query
+                         for key in query.corpus_key)
@@ -0,0 +1,62 @@
+"""Streaming the results of a query page by page over gRPC.
+
+iterate_hits() pages through deep result sets with start and num_results instead of
+asking for every result in one giant response. While the caller works through a page,
+the next one is already being fetched, so an export does not wait for each page in turn.
+The paging itself is shared with the REST examples in vectara_query_pager.
+
+Usage:
+    for hit in grpc_query_pager.iterate_hits(customer_id, corpus_id, address, token,
+                                             "query", page_size=100, max_results=20000):
+        export(hit.document_id, hit.score, hit.text)
+"""
+
+import dataclasses
+from typing import Iterator, Optional
+
+import common_paths  # pylint: disable=unused-import
+import grpc_basic_operations
+import grpc_query_result
+import grpc_util
+import vectara_query_pager
+
+QueryPageError = vectara_query_pager.QueryPageError
+
+
+def iterate_hits(customer_id: int, corpus_id: int, query_address: str,
+                 jwt_token: grpc_util.Token,
+                 query: str,
+                 page_size: int = 100,
+                 max_results: Optional[int] = None,
+                 options: Optional[grpc_basic_operations.QueryOptions] = None,
+                 prefetch: bool = True) -> Iterator[grpc_query_result.Hit]:
+    """Yields the hits of a query, best first, fetching them one page at a time.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to query.
+        query_address: Address of the querying server. e.g., serving.vectara.io
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
+        query: Query to be made to the corpus.
+        page_size: Number of results requested per call.
+        max_results: Optional maximum number of hits to yield.
+        options: Optional QueryOptions with the metadata filter, reranker and first
+            position of the query. Its num_results is replaced by page_size.
+        prefetch: Whether to request the next page while the current one is consumed.
+
+    Yields:
+        A grpc_query_result.Hit per result, until the results or max_results run out.
+
+    Raises:
+        QueryPageError: If a page could not be fetched.
+    """
+    options = options or grpc_basic_operations.DEFAULT_QUERY_OPTIONS
+
+    def fetch(start: int, num_results: int):
+        page_options = dataclasses.replace(options, start=start, num_results=num_results)
+        return grpc_basic_operations.query(customer_id, corpus_id, query_address, jwt_token,
+                                           query, options=page_options)
+
+    return vectara_query_pager.iterate_hits(fetch, grpc_query_result.QueryResult,
+                                            options.start, page_size, max_results,
+                                            prefetch)
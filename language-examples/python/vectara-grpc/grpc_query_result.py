@@ -0,0 +1,99 @@
+"""Lightweight view over the BatchQueryResponse returned by grpc_basic_operations.query.
+
+Protobuf messages already decode fields into Python objects only when they are read.
+The view keeps it that way: hits are created one at a time while iterating, and the
+metadata of a hit or its document is turned into a dict only when it is read.
+
+Usage:
+    response, ok = grpc_basic_operations.query(customer_id, corpus_id, address, token,
+                                               "query")
+    for hit in grpc_query_result.QueryResult(response).hits():
+        print(hit.score, hit.document_id, hit.text)
+"""
+
+from typing import Iterator, Optional
+
+import serving_pb2
+
+
+def _to_dict(attributes) -> dict:
+    """Returns repeated Attribute messages as a dict."""
+    return {attribute.name: attribute.value for attribute in attributes}
+
+
+class Hit:
+    """A single result of a query."""
+
+    __slots__ = ("_response", "_documents", "_metadata")
+
+    def __init__(self, response: serving_pb2.Response, documents):
+        self._response = response
+        self._documents = documents
+        self._metadata = None
+
+    @property
+    def text(self) -> str:
+        """Returns the matching text."""
+        return self._response.text
+
+    @property
+    def score(self) -> float:
+        """Returns the relevance score."""
+        return self._response.score
+
+    @property
+    def document_id(self) -> Optional[str]:
+        """Returns the ID of the document the text belongs to."""
+        document = self._document()
+        return document.id if document is not None else None
+
+    @property
+    def metadata(self) -> dict:
+        """Returns the metadata of the matching text, converted on first access."""
+        if self._metadata is None:
+            self._metadata = _to_dict(self._response.metadata)
+        return self._metadata
+
+    @property
+    def document_metadata(self) -> dict:
+        """Returns the metadata of the document the text belongs to."""
+        document = self._document()
+        return _to_dict(document.metadata) if document is not None else {}
+
+    def _document(self):
+        """Returns the document of the response set referenced by the hit."""
+        index = self._response.document_index
+        if index >= len(self._documents):
+            return None
+        return self._documents[index]
+
+    def __repr__(self) -> str:
+        return f"Hit(document_id={self.document_id!r}, score={self.score!r})"
+
+
+class QueryResult:
+    """View over a query response holding one response set per query of the batch."""
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: serving_pb2.BatchQueryResponse):
+        self.response = response
+
+    def __len__(self) -> int:
+        """Returns the number of response sets."""
+        return len(self.response.response_set)
+
+    def hits(self, query_index: int = 0) -> Iterator[Hit]:
+        """Yields the hits of a query of the batch, best first."""
+        response_set = self.response.response_set[query_index]
+        documents = response_set.document
+        for response in response_set.response:
+            yield Hit(response, documents)
+
+    def num_hits(self, query_index: int = 0) -> int:
+        """Returns the number of hits of a query of the batch."""
+        return len(self.response.response_set[query_index].response)
+
+    def __repr__(self) -> str:
+        counts = [self.num_hits(i) for i in range(len(self))]
+        return f"QueryResult(hits={counts})"
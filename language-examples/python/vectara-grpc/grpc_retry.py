@@ -0,0 +1,79 @@
+"""Retries and hedged requests for idempotent gRPC example calls.
+
+The helpers wrap functions returning (result, ok) pairs, such as
+grpc_basic_operations.query, and return the same pair, so callers do not change. Only
+wrap idempotent calls: query and reads are safe, while indexing or creating a corpus may
+apply twice.
+
+The policy, budget and hedging are shared with the other examples in
+vectara_retry; this module decides which RPC errors are retried.
+
+Usage:
+    policy = grpc_retry.RetryPolicy(max_attempts=4)
+    response, ok = grpc_retry.call(grpc_basic_operations.query, customer_id, corpus_id,
+                                   address, token, "q", policy=policy)
+
+    hedger = grpc_retry.Hedger()
+    response, ok = hedger.call(grpc_basic_operations.query, customer_id, corpus_id,
+                               address, token, "q")
+"""
+
+from typing import Optional
+
+import grpc
+
+import common_paths  # pylint: disable=unused-import
+import grpc_metrics
+import vectara_retry
+
+RetryBudget = vectara_retry.RetryBudget
+RetryPolicy = vectara_retry.RetryPolicy
+Hedger = vectara_retry.Hedger
+
+# Status codes of overloaded or temporarily unavailable servers.
+RETRYABLE_STATUS_CODES = frozenset({grpc.StatusCode.UNAVAILABLE,
+                                    grpc.StatusCode.RESOURCE_EXHAUSTED})
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def call(function, *args, policy: Optional[RetryPolicy] = None, **kwargs):
+    """Calls an idempotent (result, ok) function, retrying transient failures.
+
+    RPC errors with a code in RETRYABLE_STATUS_CODES are retried. A delay requested
+    through grpc-retry-pushback-ms trailing metadata is honored instead of the backoff.
+
+    Args:
+        function: Function returning (result, True) on success and (error, False) on
+            failure, e.g., grpc_basic_operations.query.
+        *args: Positional arguments of function.
+        policy: RetryPolicy to apply. Defaults to DEFAULT_POLICY.
+        **kwargs: Keyword arguments of function.
+
+    Returns:
+        The (result, ok) pair of the last attempt.
+    """
+    operation = getattr(function, "__name__", "call")
+    return vectara_retry.call(lambda: function(*args, **kwargs),
+                              policy or DEFAULT_POLICY,
+                              _is_retryable,
+                              _pushback_secs,
+                              on_retry=lambda: grpc_metrics.retried(operation))
+
+
+def _is_retryable(result) -> bool:
+    """Returns whether a failed result is an RPC error worth retrying."""
+    # Errors raised by a call also implement grpc.Call, which carries the status code.
+    return (isinstance(result, grpc.RpcError) and isinstance(result, grpc.Call) and
+            result.code() in RETRYABLE_STATUS_CODES)
+
+
+def _pushback_secs(rpc_error: grpc.Call) -> Optional[float]:
+    """Returns the delay requested by grpc-retry-pushback-ms trailing metadata, or None."""
+    for key, value in rpc_error.trailing_metadata() or ():
+        if key == "grpc-retry-pushback-ms":
+            try:
+                return max(int(value), 0) / 1000
+            except ValueError:
+                return None
+    return None
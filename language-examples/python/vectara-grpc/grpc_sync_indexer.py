@@ -0,0 +1,301 @@
+"""Incremental sync of a document source into a corpus over gRPC.
+
+Indexing the whole source on every run relies on the server answering ALREADY_EXISTS,
+so every unchanged document is still sent and rejected. sync() keeps a local manifest
+of the content hash of each indexed document instead, and only sends requests for the
+documents that were added, changed or removed since the previous run:
+
+* added: indexed.
+* changed: deleted and indexed again, since indexing an existing document ID does not
+  replace it.
+* removed: deleted, once the whole source has been read.
+
+The manifest is a SQLite file, so it scales to millions of documents without being
+loaded in memory. It is only updated for requests that succeeded, so failed documents
+are retried by the next run.
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import logging
+import sqlite3
+import struct
+import sys
+from concurrent import futures
+from typing import Iterable, Iterator, Optional, Union
+
+import grpc
+
+import common_pb2
+import grpc_bulk_indexer
+import grpc_channels
+import grpc_document_builder
+import grpc_util
+import indexing_pb2
+import services_pb2
+import status_pb2
+
+ADDED = "ADDED"
+CHANGED = "CHANGED"
+REMOVED = "REMOVED"
+
+# Number of manifest updates written per SQLite transaction.
+_COMMIT_EVERY = 1000
+
+
+def content_hash(document: indexing_pb2.Document) -> bytes:
+    """Returns a hash of the title, metadata, sections and other fields of a document.
+
+    Deterministic serialization makes equal documents serialize, and hash, equally.
+    """
+    return hashlib.sha256(document.SerializeToString(deterministic=True)).digest()
+
+
+class Manifest:
+    """On-disk map of document ID to the content hash last indexed for it.
+
+    Each row also records the run that last saw the document in the source, which
+    tells the documents removed from the source apart without keeping every ID of a
+    run in memory. A manifest must only be used from the thread that opened it.
+    """
+
+    def __init__(self, path: str):
+        """Opens the manifest at path, creating it if it does not exist."""
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                document_id TEXT PRIMARY KEY,
+                hash BLOB NOT NULL,
+                run INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (run INTEGER PRIMARY KEY);
+        """)
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Commits pending updates and closes the file."""
+        self._connection.commit()
+        self._connection.close()
+
+    def start_run(self) -> int:
+        """Returns the number of a new run."""
+        cursor = self._connection.execute("INSERT INTO runs DEFAULT VALUES")
+        self._connection.commit()
+        return cursor.lastrowid
+
+    def get(self, document_id: str) -> Optional[bytes]:
+        """Returns the hash last indexed for a document, or None if it was not indexed."""
+        row = self._connection.execute(
+            "SELECT hash FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, document_id: str, digest: bytes, run: int):
+        """Records that a document was indexed with a hash in a run."""
+        self._execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?)",
+                      (document_id, digest, run))
+
+    def touch(self, document_id: str, run: int):
+        """Records that a document was seen in a run without changing its hash."""
+        self._execute("UPDATE documents SET run = ? WHERE document_id = ?",
+                      (run, document_id))
+
+    def remove(self, document_id: str):
+        """Forgets a document deleted from the corpus."""
+        self._execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+
+    def unseen(self, run: int) -> list[str]:
+        """Returns the IDs of the documents that a run did not see."""
+        self._connection.commit()
+        return [row[0] for row in self._connection.execute(
+            "SELECT document_id FROM documents WHERE run < ?", (run,))]
+
+    def _execute(self, statement: str, parameters: tuple):
+        """Executes an update, committing every _COMMIT_EVERY updates."""
+        self._connection.execute(statement, parameters)
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self._connection.commit()
+            self._pending = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class SyncResult:
+    """Outcome of syncing a single added, changed or removed document.
+
+    A failed document carries either the status returned by the server or the
+    grpc.RpcError raised by the call.
+    """
+    document_id: str
+    change: str
+    ok: bool
+    status: Optional[status_pb2.Status] = None
+    error: Optional[grpc.RpcError] = None
+
+
+def sync(customer_id: int,
+         corpus_id: int,
+         idx_address: str,
+         jwt_token: grpc_util.Token,
+         documents: Iterable[Union[indexing_pb2.Document,
+                                   services_pb2.IndexDocumentRequest]],
+         manifest: Manifest,
+         max_workers: int = 16,
+         delete_removed: bool = True,
+         timeout: Optional[float] = None) -> Iterator[SyncResult]:
+    """Brings the corpus in line with documents, sending only the differences.
+
+    Documents are pulled from the iterable only when a worker is free, so a generator
+    over millions of documents is never materialized. Removed documents are only
+    deleted once the iterable is exhausted, so a source failing halfway deletes nothing.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to which data needs to be indexed.
+        idx_address: Address of the indexing server. e.g., indexing.vectara.io
+        jwt_token: A valid Auth token, or a grpc_util.TokenProvider.
+        documents: Every document of the source, each document ID at most once. Requests
+            built in place by grpc_document_builder.DocumentBuilder are sent without
+            a copy.
+        manifest: Manifest of the previous runs syncing this corpus.
+        max_workers: Maximum number of concurrent requests.
+        delete_removed: Whether to delete the documents missing from documents.
+        timeout: Optional deadline in seconds for each request.
+
+    Yields:
+        A SyncResult per added, changed or removed document, in completion order.
+        Unchanged documents are not reported.
+    """
+    index_stub = grpc_channels.index_stub(idx_address)
+    call_credentials = grpc_util.call_credentials(jwt_token)
+    metadata = [("customer-id-bin", struct.pack(">q", customer_id))]
+
+    def delete(document_id: str):
+        request = common_pb2.DeleteDocumentRequest(customer_id=customer_id,
+                                                   corpus_id=corpus_id,
+                                                   document_id=document_id)
+        index_stub.Delete(request, timeout=timeout, credentials=call_credentials,
+                          metadata=metadata)
+
+    def apply(change: str, document_id: str,
+              request: Optional[services_pb2.IndexDocumentRequest]) -> SyncResult:
+        try:
+            if change in (CHANGED, REMOVED):
+                delete(document_id)
+            if change == REMOVED:
+                return SyncResult(document_id, change, True)
+            response = index_stub.Index(request, timeout=timeout,
+                                        credentials=call_credentials, metadata=metadata)
+        except grpc.RpcError as rpc_error:
+            return SyncResult(document_id, change, False, error=rpc_error)
+        ok = response.status.code in (status_pb2.StatusCode.OK,
+                                      status_pb2.StatusCode.ALREADY_EXISTS)
+        return SyncResult(document_id, change, ok, status=response.status)
+
+    def record(result: SyncResult, digest: Optional[bytes]) -> SyncResult:
+        if result.ok and result.change == REMOVED:
+            manifest.remove(result.document_id)
+        elif result.ok:
+            manifest.put(result.document_id, digest, run)
+        return result
+
+    run = manifest.start_run()
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+
+        def take_completed() -> Iterator[SyncResult]:
+            done, _ = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                yield record(future.result(), in_flight.pop(future))
+
+        try:
+            for item in documents:
+                document = item.document if isinstance(
+                    item, services_pb2.IndexDocumentRequest) else item
+                digest = content_hash(document)
+                previous = manifest.get(document.document_id)
+                if previous == digest:
+                    manifest.touch(document.document_id, run)
+                    continue
+                if previous is not None:
+                    # Keeps the document from being seen as removed if this run fails.
+                    manifest.touch(document.document_id, run)
+
+                # Backpressure: wait for a free worker before reading the next document.
+                while len(in_flight) >= max_workers:
+                    yield from take_completed()
+                change = ADDED if previous is None else CHANGED
+                request = grpc_document_builder.as_index_request(customer_id, corpus_id,
+                                                                 item)
+                future = executor.submit(apply, change, document.document_id, request)
+                in_flight[future] = digest
+
+            if delete_removed:
+                for document_id in manifest.unseen(run):
+                    while len(in_flight) >= max_workers:
+                        yield from take_completed()
+                    in_flight[executor.submit(apply, REMOVED, document_id, None)] = None
+
+            while in_flight:
+                yield from take_completed()
+        finally:
+            # Only reached with requests outstanding if the caller stopped iterating early.
+            for future in in_flight:
+                future.cancel()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Vectara gRPC incremental sync example")
+
+    parser.add_argument("--customer-id", type=int, required=True,
+                        help="Unique customer ID in Vectara platform.")
+    parser.add_argument("--corpus-id", type=int, required=True,
+                        help="Corpus ID to which data will be indexed.")
+    parser.add_argument("--indexing-endpoint", help="The endpoint of indexing server.",
+                        default="indexing.vectara.io")
+    parser.add_argument("--app-client-id", required=True,
+                        help="This app client should have enough rights.")
+    parser.add_argument("--app-client-secret", required=True)
+    parser.add_argument("--auth-url", required=True,
+                        help="The authentication URL for this customer.")
+    parser.add_argument("--input", required=True,
+                        help="JSON lines file with every document of the source, "
+                             "see grpc_bulk_indexer.py.")
+    parser.add_argument("--manifest", required=True,
+                        help="Manifest file kept between runs, created if missing.")
+    parser.add_argument("--max-workers", type=int, default=16,
+                        help="Maximum number of concurrent requests.")
+    parser.add_argument("--keep-removed", action="store_true",
+                        help="Do not delete documents missing from the input.")
+
+    args = parser.parse_args()
+
+    token_provider = grpc_util.get_token_provider(
+        args.auth_url, args.app_client_id, args.app_client_secret)
+
+    counts = {ADDED: 0, CHANGED: 0, REMOVED: 0}
+    failures = 0
+    # pylint: disable=protected-access
+    with Manifest(args.manifest) as sync_manifest:
+        for result in sync(args.customer_id, args.corpus_id, args.indexing_endpoint,
+                           token_provider, grpc_bulk_indexer._read_requests(args.input),
+                           sync_manifest, args.max_workers, not args.keep_removed):
+            if result.ok:
+                counts[result.change] += 1
+            else:
+                failures += 1
+                logging.error("Syncing %s (%s) failed: %s", result.document_id,
+                              result.change, result.error or result.status)
+
+    logging.info("Sync finished: %s, %d failed", counts, failures)
+    if failures:
+        sys.exit(1)
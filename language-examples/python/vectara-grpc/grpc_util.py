@@ -0,0 +1,36 @@
+"""Utility functions for interacting with Vectara over gRPC."""
+
+import grpc
+
+import common_paths  # pylint: disable=unused-import
+import vectara_auth
+
+# Token caching is shared with the REST and feature examples, see vectara_auth.
+REFRESH_MARGIN_SECS = vectara_auth.REFRESH_MARGIN_SECS
+TokenProvider = vectara_auth.TokenProvider
+Token = vectara_auth.Token
+get_token_provider = vectara_auth.get_token_provider
+get_jwt_token = vectara_auth.get_jwt_token
+
+
+class _TokenAuthMetadataPlugin(grpc.AuthMetadataPlugin):
+    """Adds the bearer token of a TokenProvider to the metadata of each call."""
+
+    def __init__(self, provider: TokenProvider):
+        self._provider = provider
+
+    def __call__(self, context, callback):
+        try:
+            callback((("authorization", f"Bearer {self._provider.get_token()}"),), None)
+        except Exception as error:  # pylint: disable=broad-except
+            callback((), error)
+
+
+def call_credentials(jwt_token: Token) -> grpc.CallCredentials:
+    """Returns call credentials for a token, or for a TokenProvider for long-running work.
+
+    A TokenProvider keeps calls authenticated past the lifetime of a single token.
+    """
+    if isinstance(jwt_token, TokenProvider):
+        return grpc.metadata_call_credentials(_TokenAuthMetadataPlugin(jwt_token))
+    return grpc.access_token_call_credentials(jwt_token)
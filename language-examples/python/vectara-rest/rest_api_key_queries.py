@@ -1,28 +1,52 @@
 """An example of calling the Vectara API via Python using HTTP/REST."""
 
 import argparse
-import json
 import logging
 import sys
+from typing import Optional
 
 import requests
 
+import rest_json
+import rest_metrics
+import rest_query
+import rest_query_cache
+import rest_util
 
-def _get_query_json(customer_id: int, corpus_id: int, query_value: str):
+
+def _get_query_request(customer_id: int, corpus_id: int, query_value: str,
+                       options: rest_query.QueryOptions = rest_query.DEFAULT_QUERY_OPTIONS):
+    """Returns a query request."""
+    # pylint: disable=protected-access
+    return rest_query._get_query_request(customer_id, corpus_id, query_value, options)
+
+
+def _get_query_json(customer_id: int, corpus_id: int, query_value: str,
+                    options: rest_query.QueryOptions = rest_query.DEFAULT_QUERY_OPTIONS):
     """Returns a query JSON."""
-    query = {
-        "query": [
-            {
-                "query": query_value,
-                "num_results": 10,
-                "corpus_key": [{"customer_id": customer_id, "corpus_id": corpus_id}],
-            },
-        ],
-    }
-    return json.dumps(query)
+    # pylint: disable=protected-access
+    return rest_query._get_query_json(customer_id, corpus_id, query_value, options)
 
 
-def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, query: str):
+def _parse_response(message: dict):
+    """Returns (message, True) if every status in a query response is OK, else (error, False)."""
+    if (message["status"] and
+        any(status["code"] != "OK" for status in message["status"])):
+        logging.error("Query failed with status: %s", message["status"])
+        return message["status"], False
+
+    for response_set in message["responseSet"]:
+        for status in response_set["status"]:
+            if status["code"] != "OK":
+                return status, False
+
+    return message, True
+
+
+def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, query: str,
+          cache: Optional[rest_query_cache.QueryCache] = None,
+          options: Optional[rest_query.QueryOptions] = None,
+          session: Optional[requests.Session] = None):
     """Queries the data.
 
     Args:
@@ -30,20 +54,37 @@ def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, qu
         corpus_id: ID of the corpus to which data needs to be indexed.
         query_address: Address of the querying server. e.g., api.vectara.io
         api_key: A valid API key with query access on the corpus.
+        query: Query to be made to the corpus.
+        cache: Optional QueryCache. A cached result is returned without calling the
+            server, and successful results are added to the cache. Entries are kept
+            per API key, so a cache can be shared between keys.
+        options: Optional QueryOptions with the start, number of results, metadata
+            filter and reranker of the query. Defaults to the first 10 results.
+        session: Optional requests.Session whose connections are reused.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
     """
+    options = options or rest_query.DEFAULT_QUERY_OPTIONS
+    request = None
+    if cache is not None:
+        request = _get_query_request(customer_id, corpus_id, query, options)
+        cached = cache.get(request, credential=api_key)
+        if cached is not None:
+            return cached, True
+
     post_headers = {
         "customer-id": f"{customer_id}",
         "x-api-key": api_key
     }
 
-    response = requests.post(
-        f"https://{query_address}/v1/query",
-        data=_get_query_json(customer_id, corpus_id, query),
+    response = rest_metrics.post(
+        "query",
+        rest_util.get_url(query_address, "/v1/query"),
+        data=_get_query_json(customer_id, corpus_id, query, options),
         verify=True,
-        headers=post_headers)
+        headers=post_headers,
+        session=session)
 
     if response.status_code != 200:
         logging.error("Query failed with code %d, reason %s, text %s",
@@ -52,18 +93,10 @@ def query(customer_id: int, corpus_id: int, query_address: str, api_key: str, qu
                        response.text)
         return response, False
 
-    message = response.json()
-    if (message["status"] and
-        any(status["code"] != "OK" for status in message["status"])):
-        logging.error("Query failed with status: %s", message["status"])
-        return message["status"], False
-
-    for response_set in message["responseSet"]:
-        for status in response_set["status"]:
-            if status["code"] != "OK":
-                return status, False
-
-    return message, True
+    message, status = _parse_response(rest_json.loads(response.content))
+    if status and cache is not None:
+        cache.put(request, message, credential=api_key)
+    return message, status
 
 
 if __name__ == "__main__":
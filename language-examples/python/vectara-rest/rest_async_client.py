@@ -0,0 +1,204 @@
+"""Asynchronous counterparts of the REST examples sharing one pooled HTTP client.
+
+Every call made through an AsyncRestClient reuses keep-alive connections from a single
+aiohttp.ClientSession, so one process can drive hundreds of concurrent requests without a
+new TCP + TLS handshake per call.
+
+Usage:
+    async with AsyncRestClient(max_connections=200) as client:
+        response, status = await client.query(customer_id, corpus_id, address, token, "q")
+
+token can also be a rest_util.TokenProvider, whose token is refreshed off the event loop.
+"""
+
+import logging
+from typing import Optional
+
+import aiohttp
+
+# Request builders and response checks are shared with the synchronous examples.
+# pylint: disable=protected-access
+import rest_create_corpus
+import rest_delete_corpus
+import rest_delete_document
+import rest_index_document
+import rest_json
+import rest_metrics
+import rest_query
+import rest_reset_corpus
+import rest_upload_file
+import rest_util
+
+
+class AsyncRestClient:
+    """Async Vectara REST client backed by a shared connection pool."""
+
+    def __init__(self,
+                 max_connections: int = 100,
+                 max_connections_per_host: int = 0,
+                 keepalive_timeout: float = 30.0,
+                 timeout: float = 50.0):
+        """Creates the client. Connections are opened lazily on first use.
+
+        Args:
+            max_connections: Maximum number of concurrent connections across all hosts.
+            max_connections_per_host: Maximum number of concurrent connections to a single
+                host. 0 means no limit other than max_connections.
+            keepalive_timeout: Seconds after which an idle connection is closed.
+            timeout: Timeout in seconds for each request.
+        """
+        self._max_connections = max_connections
+        self._max_connections_per_host = max_connections_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session, creating it inside the running event loop."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_connections,
+                                             limit_per_host=self._max_connections_per_host,
+                                             keepalive_timeout=self._keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._session
+
+    async def _post(self, operation: str, url: str, headers: dict, data):
+        """Posts a request and returns (message, True) on HTTP 200, else (response, False).
+
+        message is the decoded JSON body of the response. The call is recorded under
+        operation when rest_metrics is enabled.
+        """
+        call = rest_metrics.start(operation)
+        request_bytes = len(data) if isinstance(data, bytes) else None
+        try:
+            async with self._get_session().post(url, headers=headers, data=data) as response:
+                body = await response.read()
+        except Exception as error:
+            if call is not None:
+                call.finish(type(error).__name__, request_bytes)
+            raise
+        if call is not None:
+            call.finish(str(response.status), request_bytes, len(body))
+
+        if response.status != 200:
+            logging.error("%s failed with code %d, reason %s, text %s",
+                          operation,
+                          response.status,
+                          response.reason,
+                          body.decode(errors="replace"))
+            return response, False
+        return rest_json.loads(body), True
+
+    async def query(self, customer_id: int, corpus_id: int, query_address: str,
+                    jwt_token: rest_util.Token, query: str,
+                    options: Optional[rest_query.QueryOptions] = None):
+        """Queries the data. See rest_query.query."""
+        message, ok = await self._post(
+            "query",
+            rest_util.get_url(query_address, "/v1/query"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_query._get_query_json(customer_id, corpus_id, query,
+                                       options or rest_query.DEFAULT_QUERY_OPTIONS))
+        if not ok:
+            return message, False
+        return rest_query._parse_response(message)
+
+    async def index_document(self, customer_id: int, corpus_id: int, idx_address: str,
+                             jwt_token: rest_util.Token):
+        """Indexes content to the corpus. See rest_index_document.index_document."""
+        message, ok = await self._post(
+            "index_document",
+            rest_util.get_url(idx_address, "/v1/index"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_index_document._get_index_request_json(customer_id, corpus_id))
+        if not ok:
+            return message, False
+        return rest_index_document._parse_response(message)
+
+    async def upload_file(self, customer_id: int, corpus_id: int, idx_address: str,
+                          jwt_token: rest_util.Token):
+        """Uploads a file to the corpus. See rest_upload_file.upload_file."""
+        message, ok = await self._post(
+            "upload_file",
+            rest_util.get_url(idx_address, f"/v1/upload?c={customer_id}&o={corpus_id}"),
+            {"Authorization": await rest_util.authorization_async(jwt_token)},
+            _upload_form(rest_upload_file._get_upload_file_json()))
+        if not ok:
+            return message, False
+        return rest_upload_file._parse_response(message)
+
+    async def delete_document(self, customer_id: int, corpus_id: int, idx_address: str,
+                              jwt_token: rest_util.Token, doc_id: str):
+        """Deletes document from the corpus. See rest_delete_document.delete_document."""
+        message, ok = await self._post(
+            "delete_document",
+            rest_util.get_url(idx_address, "/v1/delete-doc"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_delete_document._get_delete_request_json(customer_id, corpus_id, doc_id))
+        return message, ok
+
+    async def create_corpus(self, customer_id: int, admin_address: str,
+                            jwt_token: rest_util.Token):
+        """Creates a corpus. See rest_create_corpus.create_corpus."""
+        message, ok = await self._post(
+            "create_corpus",
+            rest_util.get_url(admin_address, "/v1/create-corpus"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_create_corpus._get_create_corpus_json())
+        if not ok:
+            return message, False
+        return rest_create_corpus._parse_response(message)
+
+    async def delete_corpus(self, customer_id: int, corpus_id: int, admin_address: str,
+                            jwt_token: rest_util.Token):
+        """Deletes a corpus. See rest_delete_corpus.delete_corpus."""
+        message, ok = await self._post(
+            "delete_corpus",
+            rest_util.get_url(admin_address, "/v1/delete-corpus"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_delete_corpus._get_delete_corpus_json(customer_id, corpus_id))
+        if not ok:
+            return message, False
+        return rest_delete_corpus._parse_response(message)
+
+    async def reset_corpus(self, customer_id: int, corpus_id: int, admin_address: str,
+                           jwt_token: rest_util.Token):
+        """Resets a corpus. See rest_reset_corpus.reset_corpus."""
+        message, ok = await self._post(
+            "reset_corpus",
+            rest_util.get_url(admin_address, "/v1/reset-corpus"),
+            await _auth_headers(customer_id, jwt_token),
+            rest_reset_corpus._get_reset_corpus_json(customer_id, corpus_id))
+        if not ok:
+            return message, False
+        return rest_reset_corpus._parse_response(message)
+
+
+async def _auth_headers(customer_id: int, jwt_token: rest_util.Token) -> dict:
+    """Returns the headers expected by the JWT authenticated endpoints.
+
+    The token of a TokenProvider is fetched without blocking the event loop.
+    """
+    return {
+        "customer-id": f"{customer_id}",
+        "Authorization": await rest_util.authorization_async(jwt_token)
+    }
+
+
+def _upload_form(content: str) -> aiohttp.FormData:
+    """Returns a multipart form holding content as the uploaded JSON file."""
+    form = aiohttp.FormData()
+    form.add_field("file", content, filename="test.json", content_type="application/json")
+    return form
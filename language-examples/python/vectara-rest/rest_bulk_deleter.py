@@ -0,0 +1,91 @@
+"""Deleting large numbers of documents over REST with bounded concurrency.
+
+Document IDs are read from a stream, e.g., a file or stdin, and deleted concurrently
+over a pooled connection. With a checkpoint file, every deleted ID is recorded so
+that an interrupted run can be started again with the same input and resumes where it
+stopped. The run itself is shared with the gRPC examples in vectara_bulk_delete.
+
+Usage:
+    python3 rest_bulk_deleter.py ... --input ids.txt --checkpoint ids.done
+    cat ids.txt | python3 rest_bulk_deleter.py ... --input - --checkpoint ids.done
+"""
+
+from typing import Iterable, Iterator, Optional
+
+import requests
+from requests import adapters
+
+import common_paths  # pylint: disable=unused-import
+import rest_delete_document
+import rest_query_cache
+import rest_retry
+import rest_util
+import vectara_bulk_delete
+
+Checkpoint = vectara_bulk_delete.Checkpoint
+DeleteResult = vectara_bulk_delete.DeleteResult
+Summary = vectara_bulk_delete.Summary
+read_ids = vectara_bulk_delete.read_ids
+
+
+def bulk_delete(customer_id: int,
+                corpus_id: int,
+                idx_address: str,
+                jwt_token: rest_util.Token,
+                document_ids: Iterable[str],
+                max_workers: int = 16,
+                checkpoint: Optional[Checkpoint] = None,
+                summary: Optional[Summary] = None,
+                cache: Optional[rest_query_cache.QueryCache] = None,
+                policy: Optional[rest_retry.RetryPolicy] = None) -> Iterator[DeleteResult]:
+    """Deletes documents keeping up to max_workers requests outstanding.
+
+    IDs are pulled from the iterable only when a worker is free, so a stream of
+    millions of IDs is never materialized. A failing document is reported and does not
+    stop the run. Deletion is idempotent, so transient failures are retried.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus from which documents will be deleted.
+        idx_address: Address of the indexing server. e.g., api.vectara.io
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider so that a long run
+            outlives the lifetime of a single token.
+        document_ids: IDs of the documents to delete.
+        max_workers: Maximum number of concurrent requests.
+        checkpoint: Optional Checkpoint recording deleted IDs. IDs it already holds
+            are skipped.
+        summary: Optional Summary updated as documents are deleted.
+        cache: Optional QueryCache whose results for the corpus are dropped at the end.
+        policy: RetryPolicy of each request. Defaults to rest_retry.DEFAULT_POLICY.
+
+    Yields:
+        A DeleteResult per deleted or failed document, in completion order. A failed
+        document carries the response of the server or the exception raised.
+    """
+    summary = summary if summary is not None else Summary()
+
+    with requests.Session() as session:
+        adapter = adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        def delete(document_id: str) -> DeleteResult:
+            try:
+                response, ok = rest_retry.call(rest_delete_document.delete_document,
+                                               customer_id, corpus_id, idx_address, jwt_token,
+                                               document_id, session=session, policy=policy)
+            except requests.RequestException as error:
+                return DeleteResult(document_id, False, error)
+            return DeleteResult(document_id, ok, None if ok else response)
+
+        try:
+            yield from vectara_bulk_delete.bulk_delete(delete, document_ids, max_workers,
+                                                       checkpoint, summary)
+        finally:
+            if cache is not None and summary.deleted:
+                cache.invalidate_corpus(customer_id, corpus_id)
+
+
+if __name__ == "__main__":
+    vectara_bulk_delete.main("Vectara REST bulk deletion example", "api.vectara.io",
+                             rest_util.get_token_provider, bulk_delete)
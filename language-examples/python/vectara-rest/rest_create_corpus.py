@@ -1,9 +1,11 @@
 """Simple example of using the Vectara REST API for creating a corpus.
 """
 
-import json
 import logging
-import requests
+
+import rest_json
+import rest_metrics
+import rest_util
 
 def _get_create_corpus_json():
     """ Returns a create corpus json. """
@@ -11,14 +13,22 @@ def _get_create_corpus_json():
     corpus["name"] = "Vectara Test Corpus(Python)"
     corpus["description"] = "An example corpus generated via REST API from Python code."
 
-    return json.dumps({"corpus":corpus})
+    return rest_json.dumps({"corpus":corpus})
+
+def _parse_response(message: dict):
+    """Returns (message, True) if the status is OK, else (status, False)."""
+    if message["status"] and message["status"]["code"] != "OK":
+        logging.error("Create Corpus failed with status: %s", message["status"])
+        return message["status"], False
+
+    return message, True
 
-def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
+def create_corpus(customer_id: int, admin_address: str, jwt_token: rest_util.Token):
     """Create a corpus.
     Args:
         customer_id: Unique customer ID in vectara platform.
         admin_address: Address of the admin server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
@@ -26,10 +36,11 @@ def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
 
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}"
+        "Authorization": rest_util.authorization(jwt_token)
     }
-    response = requests.post(
-        f"https://{admin_address}/v1/create-corpus",
+    response = rest_metrics.post(
+        "create_corpus",
+        rest_util.get_url(admin_address, "/v1/create-corpus"),
         data=_get_create_corpus_json(),
         verify=True,
         headers=post_headers)
@@ -41,9 +52,4 @@ def create_corpus(customer_id: int, admin_address: str, jwt_token: str):
                        response.text)
         return response, False
 
-    message = response.json()
-    if message["status"] and message["status"]["code"] != "OK":
-        logging.error("Create Corpus failed with status: %s", message["status"])
-        return message["status"], False
-
-    return message, True
+    return _parse_response(response.json())
@@ -1,9 +1,15 @@
 """Simple example of using the Vectara REST API for deleting a document."""
 
-import json
 import logging
+from typing import Optional
+
 import requests
 
+import rest_json
+import rest_metrics
+import rest_query_cache
+import rest_util
+
 def _get_delete_request_json(customer_id: int, corpus_id: int, doc_id: str):
     """Returns a JSON delete request."""
     request = {
@@ -11,35 +17,41 @@ def _get_delete_request_json(customer_id: int, corpus_id: int, doc_id: str):
         "corpus_id": corpus_id,
         "document_id": doc_id,
     }
-    return json.dumps(request)
+    return rest_json.dumps(request)
 
 def delete_document(
         customer_id: int,
         corpus_id: int,
         idx_address: str,
-        jwt_token: str,
-        doc_id: str):
+        jwt_token: rest_util.Token,
+        doc_id: str,
+        cache: Optional[rest_query_cache.QueryCache] = None,
+        session: Optional[requests.Session] = None):
     """Deletes document from the corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus from which document willb e deleted.
         idx_address: Address of the indexing server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
         doc_id: Id of the document to be deleted.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
+        session: Optional requests.Session whose connections are reused.
 
     Returns:
         (response, True) in case of success and returns (response, False) in case of failure.
     """
     post_headers = {
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": rest_util.authorization(jwt_token),
         "customer-id": f"{customer_id}"
     }
-    response = requests.post(
-        f"https://{idx_address}/v1/delete-doc",
+    response = rest_metrics.post(
+        "delete_document",
+        rest_util.get_url(idx_address, "/v1/delete-doc"),
         data=_get_delete_request_json(customer_id, corpus_id, doc_id),
         verify=True,
-        headers=post_headers)
+        headers=post_headers,
+        session=session)
 
     if response.status_code != 200:
         logging.error("REST delete document failed with code %d, reason %s, text %s",
@@ -48,4 +60,6 @@ def delete_document(
                        response.text)
         return response, False
 
+    if cache is not None:
+        cache.invalidate_corpus(customer_id, corpus_id)
     return response.json(), True
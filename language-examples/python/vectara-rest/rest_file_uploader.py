@@ -0,0 +1,212 @@
+"""Uploading files and directory trees to a corpus without loading them in memory.
+
+rest_upload_file.upload_file builds the whole payload in memory. The functions below
+stream the multipart body straight from disk in fixed size chunks instead, so memory
+use does not grow with the size of the files.
+
+Usage:
+    response, ok = rest_file_uploader.upload_file(customer_id, corpus_id, address,
+                                                  token, "report.pdf")
+
+    for path, response, ok in rest_file_uploader.upload_directory(
+            customer_id, corpus_id, address, token, "exports/", max_workers=4):
+        ...
+"""
+
+import logging
+import mimetypes
+import os
+import pathlib
+import uuid
+from concurrent import futures
+from typing import Callable, Iterator, Optional
+
+import requests
+
+# Response parsing is shared with the in-memory example.
+# pylint: disable=protected-access
+import rest_metrics
+import rest_query_cache
+import rest_upload_file
+import rest_util
+
+# Size of the blocks read from disk.
+CHUNK_SIZE = 1024 * 1024
+
+# Called with the path of a file, the bytes of it sent so far and its total size.
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class _MultipartFileBody:
+    """A multipart/form-data body holding one file, read from disk as it is sent.
+
+    The body has a known length, so it is sent with a Content-Length header rather
+    than chunked transfer encoding. It is iterable but has no read() method on purpose:
+    http.client and urllib3 pull file-like bodies in blocks of 8 to 16 KB, while the
+    blocks yielded by an iterable are sent as they are, chunk_size bytes at a time.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None):
+        self._path = path
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self.boundary = uuid.uuid4().hex
+        filename = os.path.basename(path).replace('"', "%22")
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self._head = (f"--{self.boundary}\r\n"
+                      f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                      f"Content-Type: {content_type}\r\n\r\n").encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file_size = os.path.getsize(path)
+        self._chunks = None
+
+    @property
+    def content_type(self) -> str:
+        """Returns the Content-Type header of the body."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._chunks = self._generate_chunks()
+        return self._chunks
+
+    def _generate_chunks(self) -> Iterator[bytes]:
+        """Yields the head, the file in blocks of chunk_size bytes and the tail."""
+        yield self._head
+        sent = 0
+        with open(self._path, "rb") as file:
+            while sent < self._file_size:
+                chunk = file.read(min(self._chunk_size, self._file_size - sent))
+                if not chunk:
+                    # The file shrank while being sent. Fail instead of sending a short body.
+                    raise IOError(f"{self._path} is shorter than when the upload started.")
+                sent += len(chunk)
+                if self._progress:
+                    self._progress(self._path, sent, self._file_size)
+                yield chunk
+        yield self._tail
+
+    def close(self):
+        """Closes the file, also when the body was not sent to the end."""
+        if self._chunks is not None:
+            self._chunks.close()
+            self._chunks = None
+
+
+def upload_file(customer_id: int, corpus_id: int, idx_address: str,
+                jwt_token: rest_util.Token,
+                path: str,
+                progress: Optional[ProgressCallback] = None,
+                chunk_size: int = CHUNK_SIZE,
+                session: Optional[requests.Session] = None,
+                cache: Optional[rest_query_cache.QueryCache] = None):
+    """Uploads a file from disk to the corpus, streaming it in chunks.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to which data needs to be indexed.
+        idx_address: Address of the indexing server. e.g., api.vectara.io
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        path: Path of the file to upload.
+        progress: Optional callback called with (path, bytes sent, file size) after each
+            chunk of the file is read for sending.
+        chunk_size: Size of the blocks read from disk and written to the connection, and
+            so the granularity of progress.
+        session: Optional requests.Session whose connections are reused.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
+
+    Returns:
+        (response, True) in case of success and returns (error, False) in case of failure.
+    """
+    body = _MultipartFileBody(path, chunk_size, progress)
+    post_headers = {
+        "Authorization": rest_util.authorization(jwt_token),
+        "Content-Type": body.content_type,
+    }
+    try:
+        response = rest_metrics.post(
+            "upload_file",
+            rest_util.get_url(idx_address, f"/v1/upload?c={customer_id}&o={corpus_id}"),
+            data=body,
+            verify=True,
+            headers=post_headers,
+            session=session)
+    finally:
+        body.close()
+
+    if response.status_code != 200:
+        logging.error("REST upload of %s failed with code %d, reason %s, text %s",
+                      path,
+                      response.status_code,
+                      response.reason,
+                      response.text)
+        return response, False
+
+    message, status = rest_upload_file._parse_response(response.json())
+    if status and cache is not None:
+        cache.invalidate_corpus(customer_id, corpus_id)
+    return message, status
+
+
+def upload_directory(customer_id: int, corpus_id: int, idx_address: str,
+                     jwt_token: rest_util.Token,
+                     directory: str,
+                     pattern: str = "*",
+                     max_workers: int = 4,
+                     progress: Optional[ProgressCallback] = None,
+                     chunk_size: int = CHUNK_SIZE,
+                     cache: Optional[rest_query_cache.QueryCache] = None,
+                     ) -> Iterator[tuple[str, object, bool]]:
+    """Uploads every file of a directory tree, at most max_workers at a time.
+
+    Files are discovered lazily and submitted as uploads complete, so trees with many
+    files do not queue them all up front.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to which data needs to be indexed.
+        idx_address: Address of the indexing server. e.g., api.vectara.io
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        directory: Root of the tree to upload.
+        pattern: Glob pattern of the file names to upload, e.g., "*.pdf".
+        max_workers: Maximum number of concurrent uploads.
+        progress: Optional callback, see upload_file.
+        chunk_size: Size of the blocks read from disk.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
+
+    Yields:
+        (path, response, True) for each uploaded file and (path, error, False) for each
+        failed one, in completion order.
+    """
+    paths = (str(path) for path in pathlib.Path(directory).rglob(pattern) if path.is_file())
+    with requests.Session() as session, \
+            futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        in_flight = {}
+        for path in paths:
+            if len(in_flight) >= max_workers:
+                done, _ = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    yield _upload_result(in_flight.pop(future), future)
+            future = executor.submit(upload_file, customer_id, corpus_id, idx_address,
+                                     jwt_token, path, progress, chunk_size, session, cache)
+            in_flight[future] = path
+
+        for future in futures.as_completed(in_flight):
+            yield _upload_result(in_flight[future], future)
+
+
+def _upload_result(path: str, future: futures.Future):
+    """Returns the (path, result, ok) tuple of a finished upload."""
+    try:
+        result, ok = future.result()
+    except (requests.RequestException, OSError) as error:
+        logging.error("REST upload of %s failed with exception: %s", path, error)
+        return path, error, False
+    return path, result, ok
@@ -1,8 +1,12 @@
 """Simple example of using the Vectara REST API for indexing."""
 
-import json
 import logging
-import requests
+from typing import Optional
+
+import rest_json
+import rest_metrics
+import rest_query_cache
+import rest_util
 
 
 def _get_index_request_json(customer_id: int, corpus_id: int):
@@ -11,7 +15,7 @@ def _get_index_request_json(customer_id: int, corpus_id: int):
         # Note that the document ID must be unique for a given corpus.
         "document_id": "doc-id-2",
         "title": "Another example Title",
-        "metadata_json": json.dumps(
+        "metadata_json": rest_json.metadata_json(
             {
                 "book-name": "Another example title",
                 "collection": "Mathematics",
@@ -30,27 +34,40 @@ def _get_index_request_json(customer_id: int, corpus_id: int):
         "document": document,
     }
 
-    return json.dumps(request)
+    return rest_json.dumps(request)
+
 
+def _parse_response(message: dict):
+    """Returns (message, True) if the document was indexed, else (status, False)."""
+    if message["status"] and message["status"]["code"] not in ("OK", "ALREADY_EXISTS"):
+        logging.error("REST upload failed with status: %s", message["status"])
+        return message["status"], False
+
+    return message, True
 
-def index_document(customer_id: int, corpus_id: int, idx_address: str, jwt_token: str):
+
+def index_document(customer_id: int, corpus_id: int, idx_address: str,
+                   jwt_token: rest_util.Token,
+                   cache: Optional[rest_query_cache.QueryCache] = None):
     """Indexes content to the corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         idx_address: Address of the indexing server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
     """
     post_headers = {
-        "Authorization": f"Bearer {jwt_token}",
+        "Authorization": rest_util.authorization(jwt_token),
         "customer-id": f"{customer_id}"
     }
-    response = requests.post(
-        f"https://{idx_address}/v1/index",
+    response = rest_metrics.post(
+        "index_document",
+        rest_util.get_url(idx_address, "/v1/index"),
         data=_get_index_request_json(customer_id, corpus_id),
         verify=True,
         headers=post_headers)
@@ -62,9 +79,7 @@ def index_document(customer_id: int, corpus_id: int, idx_address: str, jwt_token
                        response.text)
         return response, False
 
-    message = response.json()
-    if message["status"] and message["status"]["code"] not in ("OK", "ALREADY_EXISTS"):
-        logging.error("REST upload failed with status: %s", message["status"])
-        return message["status"], False
-
-    return message, True
+    message, status = _parse_response(response.json())
+    if status and cache is not None:
+        cache.invalidate_corpus(customer_id, corpus_id)
+    return message, status
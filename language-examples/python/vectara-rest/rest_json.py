@@ -0,0 +1,120 @@
+"""JSON encoding of REST request bodies and decoding of responses.
+
+dumps() and loads() use orjson when it is installed (pip3 install orjson), which is
+several times faster than the json module, and fall back to json otherwise. Both
+produce compact UTF-8 bytes, so the bodies sent do not depend on the encoder.
+
+metadata_json fields are JSON strings embedded in the request JSON, so their content is
+encoded twice by design of the API. metadata_json() encodes the metadata itself once
+with the fast encoder, and QueryTemplate keeps the encoded parts of query requests that
+only depend on the corpus, so that only the query text is encoded per request.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON = "json"
+ORJSON = "orjson"
+
+
+def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+    """Encodes obj with the json module."""
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys,
+                      separators=(",", ":")).encode()
+
+
+def _orjson_dumps(obj, sort_keys: bool = False) -> bytes:
+    """Encodes obj with orjson."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+
+_ENCODERS = {JSON: _json_dumps, ORJSON: _orjson_dumps}
+
+_dumps = _orjson_dumps if orjson is not None else _json_dumps
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def encoder() -> str:
+    """Returns the name of the encoder in use, JSON or ORJSON."""
+    return ORJSON if _dumps is _orjson_dumps else JSON
+
+
+def use(name: str):
+    """Selects the encoder, e.g., JSON to compare it with ORJSON.
+
+    Raises:
+        ValueError: If the encoder is unknown or not installed.
+    """
+    global _dumps, _loads  # pylint: disable=global-statement
+    if name not in _ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {name}")
+    if name == ORJSON and orjson is None:
+        raise ValueError("orjson is not installed.")
+    _dumps = _ENCODERS[name]
+    _loads = orjson.loads if name == ORJSON else json.loads
+
+
+def dumps(obj, sort_keys: bool = False) -> bytes:
+    """Returns obj encoded as compact UTF-8 JSON."""
+    return _dumps(obj, sort_keys)
+
+
+def loads(data):
+    """Returns the value of a JSON document given as bytes or str."""
+    return _loads(data)
+
+
+def metadata_json(metadata: dict) -> str:
+    """Returns the value of a metadata_json field."""
+    return _dumps(metadata).decode()
+
+
+class QueryTemplate:
+    """Encoded query requests, minus the query text, per corpus and query options.
+
+    A query request differs between calls with the same key, e.g., the same corpus
+    and options, only by its query text, so the bytes before and after the text are
+    encoded once per key and kept for the maxsize most recently used keys.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._parts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, key: Hashable, query_value: str,
+               fields: Callable[[], dict]) -> bytes:
+        """Returns the encoded request {"query": [query]} of a single query.
+
+        Args:
+            key: Hashable value identifying every field of the query but its text.
+            query_value: Text of the query.
+            fields: Returns the fields of the query other than its text, called the
+                first time a key is seen, e.g., {"num_results": 10, "corpus_key": [...]}.
+        """
+        with self._lock:
+            parts = self._parts.get(key)
+            if parts is not None:
+                self._parts.move_to_end(key)
+        if parts is None:
+            rest = _dumps(fields())
+            # {"query":[{"query":<text>,<fields>}]}
+            parts = (b'{"query":[{"query":',
+                     (b"," + rest[1:] if len(rest) > 2 else b"}") + b"]}")
+            with self._lock:
+                self._parts[key] = parts
+                if len(self._parts) > self._maxsize:
+                    self._parts.popitem(last=False)
+        prefix, suffix = parts
+        return prefix + _dumps(query_value) + suffix
+
+
+# Shared by the examples.
+QUERY_TEMPLATE = QueryTemplate()
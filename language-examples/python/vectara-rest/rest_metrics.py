@@ -0,0 +1,76 @@
+"""Metrics and tracing of the REST calls made by the examples.
+
+Every call is recorded under its operation, e.g., query or delete_document: a latency
+histogram per status code, the sizes of requests and responses, retries and the calls in
+flight. Metrics are exported in the Prometheus text format, and each call becomes an
+OpenTelemetry span when tracing is on and the opentelemetry-api package is installed.
+
+The registry, export and spans are shared with the other examples in vectara_metrics;
+this module records the calls made with requests, as metrics prefixed with vectara_rest.
+
+Nothing is recorded until enable() is called. Until then an instrumented call only checks
+an attribute before posting its request.
+
+Usage:
+    registry = rest_metrics.enable(tracing=True)
+    rest_query.query(customer_id, corpus_id, address, token, "q")
+    print(registry.prometheus_text())
+"""
+
+from typing import Optional
+
+import requests
+
+import common_paths  # pylint: disable=unused-import
+import vectara_metrics
+
+LATENCY_BUCKETS_SECS = vectara_metrics.LATENCY_BUCKETS_SECS
+SIZE_BUCKETS_BYTES = vectara_metrics.SIZE_BUCKETS_BYTES
+Histogram = vectara_metrics.Histogram
+Call = vectara_metrics.Call
+
+
+class Registry(vectara_metrics.Registry):
+    """vectara_metrics.Registry whose metric names start with vectara_rest."""
+
+    def __init__(self, prefix: str = "vectara_rest", **kwargs):
+        super().__init__(prefix, **kwargs)
+
+
+_instrumentation = vectara_metrics.Instrumentation(
+    __name__, Registry, status_attribute="http.status_code", ok_code="200")
+
+enable = _instrumentation.enable
+disable = _instrumentation.disable
+get_registry = _instrumentation.get_registry
+retried = _instrumentation.retried
+start = _instrumentation.start
+serve = _instrumentation.serve
+
+
+def post(operation: str, url: str, session: Optional[requests.Session] = None,
+         **kwargs) -> requests.Response:
+    """Posts a request like requests.post, recording it under operation.
+
+    Args:
+        operation: Name of the operation, e.g., query.
+        url: URL to post to.
+        session: Optional requests.Session whose connections are reused.
+        **kwargs: Keyword arguments of requests.post.
+
+    Returns:
+        The response.
+    """
+    call = start(operation)
+    if call is None:
+        return (session or requests).post(url, **kwargs)
+    try:
+        response = (session or requests).post(url, **kwargs)
+    except Exception as error:
+        call.finish(type(error).__name__)
+        raise
+    request_bytes = response.request.headers.get("Content-Length")
+    call.finish(str(response.status_code),
+                int(request_bytes) if request_bytes is not None else None,
+                len(response.content))
+    return response
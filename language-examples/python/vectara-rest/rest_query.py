@@ -1,47 +1,132 @@
 """Simple example of using the Vectara REST API for searching a corpus."""
 
-import json
+import dataclasses
 import logging
+from typing import Optional
+
 import requests
 
+import rest_json
+import rest_metrics
+import rest_query_cache
+import rest_util
 
-def _get_query_json(customer_id: int, corpus_id: int, query_value: str):
-    """Returns a query JSON."""
-    query = {
-        "query": [
-            {
-                "query": query_value,
-                "num_results": 10,
-                "corpus_key": [{"customer_id": customer_id, "corpus_id": corpus_id}],
-            },
-        ],
+
+@dataclasses.dataclass(frozen=True)
+class QueryOptions:
+    """Paging, filtering and reranking of a query.
+
+    Attributes:
+        start: Position of the first result to return, to page through results.
+        num_results: Maximum number of results to return.
+        metadata_filter: Optional filter on document and part metadata, e.g.,
+            "doc.year > 2020 and part.lang = 'eng'".
+        reranker_id: Optional ID of the reranker applied to the results.
+    """
+    start: int = 0
+    num_results: int = 10
+    metadata_filter: Optional[str] = None
+    reranker_id: Optional[int] = None
+
+
+DEFAULT_QUERY_OPTIONS = QueryOptions()
+
+
+def _get_query_fields(customer_id: int, corpus_id: int, options: QueryOptions):
+    """Returns the fields of a single query other than its text."""
+    corpus_key = {"customer_id": customer_id, "corpus_id": corpus_id}
+    if options.metadata_filter:
+        corpus_key["metadata_filter"] = options.metadata_filter
+    fields = {}
+    if options.start:
+        fields["start"] = options.start
+    fields["num_results"] = options.num_results
+    fields["corpus_key"] = [corpus_key]
+    if options.reranker_id is not None:
+        fields["reranking_config"] = {"reranker_id": options.reranker_id}
+    return fields
+
+
+def _get_query(customer_id: int, corpus_id: int, query_value: str,
+               options: QueryOptions = DEFAULT_QUERY_OPTIONS):
+    """Returns a single query of a batch query request."""
+    return {"query": query_value, **_get_query_fields(customer_id, corpus_id, options)}
+
+
+def _get_query_request(customer_id: int, corpus_id: int, query_value: str,
+                       options: QueryOptions = DEFAULT_QUERY_OPTIONS):
+    """Returns a query request."""
+    return {
+        "query": [_get_query(customer_id, corpus_id, query_value, options)],
     }
-    return json.dumps(query)
 
 
-def query(customer_id: int, corpus_id: int, query_address: str, jwt_token: str, query: str):
+def _get_query_json(customer_id: int, corpus_id: int, query_value: str,
+                    options: QueryOptions = DEFAULT_QUERY_OPTIONS):
+    """Returns a query JSON."""
+    return rest_json.QUERY_TEMPLATE.encode(
+        (customer_id, corpus_id, options), query_value,
+        lambda: _get_query_fields(customer_id, corpus_id, options))
+
+
+def _parse_response(message: dict):
+    """Returns (message, True) if every status in a query response is OK, else (error, False)."""
+    if (message["status"] and
+        any(status["code"] != "OK" for status in message["status"])):
+        logging.error("Query failed with status: %s", message["status"])
+        return message["status"], False
+
+    for response_set in message["responseSet"]:
+        for status in response_set["status"]:
+            if status["code"] != "OK":
+                return status, False
+
+    return message, True
+
+
+def query(customer_id: int, corpus_id: int, query_address: str, jwt_token: rest_util.Token,
+          query: str,
+          cache: Optional[rest_query_cache.QueryCache] = None,
+          options: Optional[QueryOptions] = None,
+          session: Optional[requests.Session] = None):
     """Queries the data.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         query_address: Address of the querying server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        query: Query to be made to the corpus.
+        cache: Optional QueryCache. A cached result is returned without calling the
+            server, and successful results are added to the cache.
+        options: Optional QueryOptions with the start, number of results, metadata
+            filter and reranker of the query. Defaults to the first 10 results.
+        session: Optional requests.Session whose connections are reused.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
 
     """
+    options = options or DEFAULT_QUERY_OPTIONS
+    request = None
+    if cache is not None:
+        request = _get_query_request(customer_id, corpus_id, query, options)
+        cached = cache.get(request)
+        if cached is not None:
+            return cached, True
+
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}"
+        "Authorization": rest_util.authorization(jwt_token)
     }
 
-    response = requests.post(
-        f"https://{query_address}/v1/query",
-        data=_get_query_json(customer_id, corpus_id, query),
+    response = rest_metrics.post(
+        "query",
+        rest_util.get_url(query_address, "/v1/query"),
+        data=_get_query_json(customer_id, corpus_id, query, options),
         verify=True,
-        headers=post_headers)
+        headers=post_headers,
+        session=session)
 
     if response.status_code != 200:
         logging.error("Query failed with code %d, reason %s, text %s",
@@ -50,15 +135,7 @@ def query(customer_id: int, corpus_id: int, query_address: str, jwt_token: str,
                        response.text)
         return response, False
 
-    message = response.json()
-    if (message["status"] and
-        any(status["code"] != "OK" for status in message["status"])):
-        logging.error("Query failed with status: %s", message["status"])
-        return message["status"], False
-
-    for response_set in message["responseSet"]:
-        for status in response_set["status"]:
-            if status["code"] != "OK":
-                return status, False
-
-    return message, True
+    message, status = _parse_response(rest_json.loads(response.content))
+    if status and cache is not None:
+        cache.put(request, message)
+    return message, status
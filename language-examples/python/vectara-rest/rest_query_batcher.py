@@ -0,0 +1,201 @@
+"""Micro-batching of individual queries into one /v1/query request."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Optional
+
+import requests
+
+import rest_json
+import rest_metrics
+import rest_query
+import rest_util
+
+
+class QueryBatcher:
+    """Collects queries from many callers and sends them as one batch query request.
+
+    A batch is sent when it holds max_batch_size queries or max_delay_secs after its first
+    query arrived, whichever comes first. Each caller gets a future that resolves to the
+    same (result, ok) pair returned by rest_query.query, where result is the caller's own
+    entry of responseSet.
+
+    Usage:
+        with QueryBatcher(customer_id, "api.vectara.io", token) as batcher:
+            response_set, ok = batcher.query(corpus_id, "What is the answer?")
+    """
+
+    def __init__(self,
+                 customer_id: int,
+                 query_address: str,
+                 jwt_token: rest_util.Token,
+                 max_batch_size: int = 32,
+                 max_delay_secs: float = 0.005,
+                 max_concurrent_batches: int = 4):
+        """Creates the batcher and starts its collector thread.
+
+        Args:
+            customer_id: Unique customer ID in vectara platform.
+            query_address: Address of the querying server. e.g., api.vectara.io
+            jwt_token: A valid Auth token, or a rest_util.TokenProvider whose current
+                token is sent with each batch.
+            max_batch_size: Maximum number of queries in one request.
+            max_delay_secs: Maximum time a query waits for others to join its batch.
+            max_concurrent_batches: Maximum number of batch requests in flight.
+        """
+        self._customer_id = customer_id
+        self._url = rest_util.get_url(query_address, "/v1/query")
+        self._jwt_token = jwt_token
+        self._max_batch_size = max_batch_size
+        self._max_delay_secs = max_delay_secs
+        self._session = requests.Session()
+        self._senders = futures.ThreadPoolExecutor(max_workers=max_concurrent_batches)
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, query: dict) -> futures.Future:
+        """Queues a query and returns a future of its (result, ok) pair.
+
+        Args:
+            query: One entry of the "query" list of a query request.
+        """
+        future = futures.Future()
+        # Checked and queued under the lock, so that no query is queued after the
+        # sentinel of close(), where the collector would never see it.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("QueryBatcher is closed.")
+            self._pending.put((query, future))
+        return future
+
+    def query(self, corpus_id: int, query: str,
+              options: Optional[rest_query.QueryOptions] = None):
+        """Queries a corpus through the batcher and waits for the result.
+
+        Args:
+            corpus_id: ID of the corpus to query.
+            query: Query to be made to the corpus.
+            options: Optional QueryOptions, see rest_query.query.
+
+        Returns:
+            (response_set, True) in case of success and returns (error, False) in case of
+            failure.
+        """
+        # pylint: disable=protected-access
+        return self.submit(rest_query._get_query(
+            self._customer_id, corpus_id, query,
+            options or rest_query.DEFAULT_QUERY_OPTIONS)).result()
+
+    def close(self):
+        """Sends the queries already submitted, waits for them and releases connections."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(None)
+        self._collector.join()
+        self._senders.shutdown(wait=True)
+        self._session.close()
+
+    def _collect(self):
+        """Groups pending queries into batches until close() is called."""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._max_delay_secs
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._senders.submit(self._send, batch)
+                    return
+                batch.append(item)
+            self._senders.submit(self._send, batch)
+
+    def _send(self, batch):
+        """Sends one batch and resolves the future of each of its queries.
+
+        Futures cancelled by their callers are dropped. Every other future gets a result,
+        even if the response is malformed, so that no caller waits forever.
+        """
+        batch = [(query, future) for query, future in batch
+                 if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            self._send_batch(batch)
+        except Exception as error:  # pylint: disable=broad-except
+            logging.error("Query failed with exception: %s", error)
+            _set_results([future for _, future in batch if not future.done()],
+                         (error, False))
+
+    def _send_batch(self, batch):
+        """Sends one batch and splits the response between the futures of its queries."""
+        batch_futures = [future for _, future in batch]
+        try:
+            body = rest_json.dumps({"query": [query for query, _ in batch]})
+            headers = {
+                "customer-id": f"{self._customer_id}",
+                "Authorization": rest_util.authorization(self._jwt_token)
+            }
+            response = rest_metrics.post("query_batch",
+                                         self._url,
+                                         session=self._session,
+                                         data=body,
+                                         verify=True,
+                                         headers=headers,
+                                         timeout=50)
+        except requests.RequestException as error:
+            logging.error("Query failed with exception: %s", error)
+            _set_results(batch_futures, (error, False))
+            return
+
+        if response.status_code != 200:
+            logging.error("Query failed with code %d, reason %s, text %s",
+                          response.status_code,
+                          response.reason,
+                          response.text)
+            _set_results(batch_futures, (response, False))
+            return
+
+        message = rest_json.loads(response.content)
+        if (message["status"] and
+            any(status["code"] != "OK" for status in message["status"])):
+            logging.error("Query failed with status: %s", message["status"])
+            _set_results(batch_futures, (message["status"], False))
+            return
+
+        response_sets = message["responseSet"]
+        if len(response_sets) != len(batch_futures):
+            logging.error("Query returned %d response sets for %d queries.",
+                          len(response_sets), len(batch_futures))
+
+        for i, future in enumerate(batch_futures):
+            if i >= len(response_sets):
+                future.set_result((message, False))
+                continue
+            failed = [status for status in response_sets[i]["status"]
+                      if status["code"] != "OK"]
+            future.set_result((failed[0], False) if failed else (response_sets[i], True))
+
+
+def _set_results(batch_futures, result):
+    """Resolves every future of a batch with the same result."""
+    for future in batch_futures:
+        future.set_result(result)
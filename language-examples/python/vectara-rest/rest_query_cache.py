@@ -0,0 +1,21 @@
+"""Client-side cache of query results for the REST examples."""
+
+import common_paths  # pylint: disable=unused-import
+import rest_json
+import vectara_query_cache
+
+
+class QueryCache(vectara_query_cache.QueryCache):
+    """vectara_query_cache.QueryCache of REST query requests.
+
+    Cached results are the parsed response sets returned to every caller of the same
+    query. They are shared, not copied, and must not be modified.
+    """
+
+    def _key(self, request: dict) -> bytes:
+        return rest_json.dumps(request, sort_keys=True)
+
+    def _corpora(self, request: dict) -> frozenset:
+        return frozenset((int(key["customer_id"]), int(key["corpus_id"]))
+                         for query in request["query"]
+                         for key in query["corpus_key"])
@@ -0,0 +1,71 @@
+"""Streaming the results of a query page by page over REST.
+
+iterate_hits() pages through deep result sets with start and num_results instead of
+asking for every result in one giant response. While the caller works through a page,
+the next one is already being fetched, so an export does not wait for each page in turn.
+The paging itself is shared with the gRPC examples in vectara_query_pager.
+
+Usage:
+    for hit in rest_query_pager.iterate_hits(customer_id, corpus_id, address, token,
+                                             "query", page_size=100, max_results=20000):
+        export(hit.document_id, hit.score, hit.text)
+"""
+
+import dataclasses
+from typing import Iterator, Optional
+
+import requests
+from requests import adapters
+
+import common_paths  # pylint: disable=unused-import
+import rest_query
+import rest_query_result
+import rest_util
+import vectara_query_pager
+
+QueryPageError = vectara_query_pager.QueryPageError
+
+
+def iterate_hits(customer_id: int, corpus_id: int, query_address: str,
+                 jwt_token: rest_util.Token,
+                 query: str,
+                 page_size: int = 100,
+                 max_results: Optional[int] = None,
+                 options: Optional[rest_query.QueryOptions] = None,
+                 prefetch: bool = True) -> Iterator[rest_query_result.Hit]:
+    """Yields the hits of a query, best first, fetching them one page at a time.
+
+    Args:
+        customer_id: Unique customer ID in vectara platform.
+        corpus_id: ID of the corpus to query.
+        query_address: Address of the querying server. e.g., api.vectara.io
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        query: Query to be made to the corpus.
+        page_size: Number of results requested per call.
+        max_results: Optional maximum number of hits to yield.
+        options: Optional QueryOptions with the metadata filter, reranker and first
+            position of the query. Its num_results is replaced by page_size.
+        prefetch: Whether to request the next page while the current one is consumed.
+
+    Yields:
+        A rest_query_result.Hit per result, until the results or max_results run out.
+
+    Raises:
+        QueryPageError: If a page could not be fetched.
+    """
+    options = options or rest_query.DEFAULT_QUERY_OPTIONS
+
+    with requests.Session() as session:
+        adapter = adapters.HTTPAdapter(pool_maxsize=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        def fetch(start: int, num_results: int):
+            page_options = dataclasses.replace(options, start=start,
+                                               num_results=num_results)
+            return rest_query.query(customer_id, corpus_id, query_address, jwt_token,
+                                    query, options=page_options, session=session)
+
+        yield from vectara_query_pager.iterate_hits(fetch, rest_query_result.QueryResult,
+                                                    options.start, page_size,
+                                                    max_results, prefetch)
@@ -0,0 +1,97 @@
+"""Lightweight view over the message returned by rest_query.query.
+
+The view does not copy or convert the message up front. Hits are created one at a
+time while iterating, and the metadata of a hit or its document is turned into a dict
+only when it is read, so a caller reading the top few of hundreds of results does not
+pay for the rest.
+
+Usage:
+    message, ok = rest_query.query(customer_id, corpus_id, address, token, "query")
+    for hit in rest_query_result.QueryResult(message).hits():
+        print(hit.score, hit.document_id, hit.text)
+"""
+
+from typing import Iterator, Optional
+
+
+def _to_dict(attributes: list) -> dict:
+    """Returns a list of {"name", "value"} attributes as a dict."""
+    return {attribute["name"]: attribute["value"] for attribute in attributes}
+
+
+class Hit:
+    """A single result of a query."""
+
+    __slots__ = ("_response", "_documents", "_metadata")
+
+    def __init__(self, response: dict, documents: list):
+        self._response = response
+        self._documents = documents
+        self._metadata = None
+
+    @property
+    def text(self) -> str:
+        """Returns the matching text."""
+        return self._response.get("text", "")
+
+    @property
+    def score(self) -> float:
+        """Returns the relevance score."""
+        return self._response.get("score", 0.0)
+
+    @property
+    def document_id(self) -> Optional[str]:
+        """Returns the ID of the document the text belongs to."""
+        document = self._document()
+        return document.get("id") if document is not None else None
+
+    @property
+    def metadata(self) -> dict:
+        """Returns the metadata of the matching text, converted on first access."""
+        if self._metadata is None:
+            self._metadata = _to_dict(self._response.get("metadata", []))
+        return self._metadata
+
+    @property
+    def document_metadata(self) -> dict:
+        """Returns the metadata of the document the text belongs to."""
+        document = self._document()
+        return _to_dict(document.get("metadata", [])) if document is not None else {}
+
+    def _document(self) -> Optional[dict]:
+        """Returns the document of the response set referenced by the hit."""
+        index = self._response.get("documentIndex")
+        if index is None or index >= len(self._documents):
+            return None
+        return self._documents[index]
+
+    def __repr__(self) -> str:
+        return f"Hit(document_id={self.document_id!r}, score={self.score!r})"
+
+
+class QueryResult:
+    """View over a query response holding one response set per query of the batch."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: dict):
+        self.message = message
+
+    def __len__(self) -> int:
+        """Returns the number of response sets."""
+        return len(self.message.get("responseSet", []))
+
+    def hits(self, query_index: int = 0) -> Iterator[Hit]:
+        """Yields the hits of a query of the batch, best first."""
+        response_set = self.message["responseSet"][query_index]
+        documents = response_set.get("document", [])
+        for response in response_set.get("response", []):
+            yield Hit(response, documents)
+
+    def num_hits(self, query_index: int = 0) -> int:
+        """Returns the number of hits of a query of the batch."""
+        return len(self.message["responseSet"][query_index].get("response", []))
+
+    def __repr__(self) -> str:
+        counts = [self.num_hits(i) for i in range(len(self))]
+        return f"QueryResult(hits={counts})"
@@ -1,9 +1,13 @@
 """Simple example of using the Vectara REST API for resetting a corpus.
 """
 
-import json
 import logging
-import requests
+from typing import Optional
+
+import rest_json
+import rest_metrics
+import rest_query_cache
+import rest_util
 
 def _get_reset_corpus_json(customer_id: int, corpus_id: int):
     """ Returns a reset corpus json. """
@@ -12,15 +16,26 @@ def _get_reset_corpus_json(customer_id: int, corpus_id: int):
         "corpus_id": corpus_id,
     }
 
-    return json.dumps(corpus)
+    return rest_json.dumps(corpus)
+
+def _parse_response(message: dict):
+    """Returns (message, True) if the status is OK, else (status, False)."""
+    if message["status"] and message["status"]["code"] != "OK":
+        logging.error("Reset Corpus failed with status: %s", message["status"])
+        return message["status"], False
+
+    return message, True
 
-def reset_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_token: str):
+def reset_corpus(customer_id: int, corpus_id: int, admin_address: str,
+                 jwt_token: rest_util.Token,
+                 cache: Optional[rest_query_cache.QueryCache] = None):
     """Reset a corpus.
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: Corpus ID in vectara platform.
         admin_address: Address of the admin server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
@@ -28,10 +43,11 @@ def reset_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_token
 
     post_headers = {
         "customer-id": f"{customer_id}",
-        "Authorization": f"Bearer {jwt_token}"
+        "Authorization": rest_util.authorization(jwt_token)
     }
-    response = requests.post(
-        f"https://{admin_address}/v1/reset-corpus",
+    response = rest_metrics.post(
+        "reset_corpus",
+        rest_util.get_url(admin_address, "/v1/reset-corpus"),
         data=_get_reset_corpus_json(customer_id, corpus_id),
         verify=True,
         headers=post_headers)
@@ -43,9 +59,7 @@ def reset_corpus(customer_id: int, corpus_id: int, admin_address: str, jwt_token
                        response.text)
         return response, False
 
-    message = response.json()
-    if message["status"] and message["status"]["code"] != "OK":
-        logging.error("Delete Corpus failed with status: %s", message.status)
-        return message.status, False
-
-    return message, True
+    message, status = _parse_response(response.json())
+    if status and cache is not None:
+        cache.invalidate_corpus(customer_id, corpus_id)
+    return message, status
@@ -0,0 +1,75 @@
+"""Retries and hedged requests for idempotent REST example calls.
+
+The helpers wrap functions returning (result, ok) pairs, such as rest_query.query, and
+return the same pair, so callers do not change. Only wrap idempotent calls: query and
+reads are safe, while indexing or creating a corpus may apply twice.
+
+The policy, budget and hedging are shared with the other examples in
+vectara_retry; this module decides which REST failures are retried.
+
+Usage:
+    policy = rest_retry.RetryPolicy(max_attempts=4)
+    response, ok = rest_retry.call(rest_query.query, customer_id, corpus_id,
+                                   address, token, "q", policy=policy)
+
+    hedger = rest_retry.Hedger()
+    response, ok = hedger.call(rest_query.query, customer_id, corpus_id,
+                               address, token, "q")
+"""
+
+from typing import Optional
+
+import requests
+
+import common_paths  # pylint: disable=unused-import
+import rest_metrics
+import vectara_retry
+
+RetryBudget = vectara_retry.RetryBudget
+RetryPolicy = vectara_retry.RetryPolicy
+Hedger = vectara_retry.Hedger
+
+# HTTP status codes of overloaded or temporarily unavailable servers.
+RETRYABLE_STATUS_CODES = vectara_retry.RETRYABLE_HTTP_STATUS_CODES
+
+# Exceptions raised by requests for failures that happen before a response arrives.
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def call(function, *args, policy: Optional[RetryPolicy] = None, **kwargs):
+    """Calls an idempotent (result, ok) function, retrying transient failures.
+
+    Connection errors, timeouts and responses with a status in RETRYABLE_STATUS_CODES
+    are retried. A Retry-After header is honored instead of the backoff delay.
+
+    Args:
+        function: Function returning (result, True) on success and (error, False) on
+            failure, e.g., rest_query.query.
+        *args: Positional arguments of function.
+        policy: RetryPolicy to apply. Defaults to DEFAULT_POLICY.
+        **kwargs: Keyword arguments of function.
+
+    Returns:
+        The (result, ok) pair of the last attempt. The exception of the last attempt is
+        raised if it failed before getting a response.
+    """
+    operation = getattr(function, "__name__", "call")
+    return vectara_retry.call(lambda: function(*args, **kwargs),
+                              policy or DEFAULT_POLICY,
+                              _is_retryable,
+                              _retry_after_secs,
+                              RETRYABLE_EXCEPTIONS,
+                              on_retry=lambda: rest_metrics.retried(operation))
+
+
+def _is_retryable(result) -> bool:
+    """Returns whether a failed result is a response worth retrying."""
+    return (isinstance(result, requests.Response) and
+            result.status_code in RETRYABLE_STATUS_CODES)
+
+
+def _retry_after_secs(response: requests.Response) -> Optional[float]:
+    """Returns the delay requested by a Retry-After header, or None."""
+    return vectara_retry.retry_after_secs(response.headers.get("Retry-After"))
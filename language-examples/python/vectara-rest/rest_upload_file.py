@@ -1,8 +1,12 @@
 """Simple example of using the Vectara REST API for uploading files."""
 
-import json
 import logging
-import requests
+from typing import Optional
+
+import rest_json
+import rest_metrics
+import rest_query_cache
+import rest_util
 
 
 def _get_upload_file_json():
@@ -11,7 +15,7 @@ def _get_upload_file_json():
         # Note that the document ID must be unique for a given corpus.
         "document_id": "doc-id-1",
         "title": "An example Title",
-        "metadata_json": json.dumps(
+        "metadata_json": rest_json.metadata_json(
             {
                 "book-name": "An example title",
                 "collection": "Philosophy",
@@ -23,26 +27,41 @@ def _get_upload_file_json():
         ],
     }
 
-    return json.dumps(document)
+    return rest_json.dumps(document)
+
+
+def _parse_response(message: dict):
+    """Returns (response, True) if the file was indexed, else (status, False)."""
+    message = message["response"]
+    # An empty status indicates success.
+    if message["status"] and message["status"]["code"] not in ("OK", "ALREADY_EXISTS"):
+        logging.error("REST upload failed with status: %s", message["status"])
+        return message["status"], False
 
+    return message, True
 
-def upload_file(customer_id: int, corpus_id: int, idx_address: str, jwt_token: str):
+
+def upload_file(customer_id: int, corpus_id: int, idx_address: str,
+                jwt_token: rest_util.Token,
+                cache: Optional[rest_query_cache.QueryCache] = None):
     """Uploads a file to the corpus.
 
     Args:
         customer_id: Unique customer ID in vectara platform.
         corpus_id: ID of the corpus to which data needs to be indexed.
         idx_address: Address of the indexing server. e.g., api.vectara.io
-        jwt_token: A valid Auth token.
+        jwt_token: A valid Auth token, or a rest_util.TokenProvider.
+        cache: Optional QueryCache whose results for the corpus are dropped on success.
 
     Returns:
         (response, True) in case of success and returns (error, False) in case of failure.
     """
     post_headers = {
-        "Authorization": f"Bearer {jwt_token}"
+        "Authorization": rest_util.authorization(jwt_token)
     }
-    response = requests.post(
-        f"https://{idx_address}/v1/upload?c={customer_id}&o={corpus_id}",
+    response = rest_metrics.post(
+        "upload_file",
+        rest_util.get_url(idx_address, f"/v1/upload?c={customer_id}&o={corpus_id}"),
         files={"file": ("test.json", _get_upload_file_json(), "application/json")},
         verify=True,
         headers=post_headers)
@@ -54,10 +73,7 @@ def upload_file(customer_id: int, corpus_id: int, idx_address: str, jwt_token: s
                        response.text)
         return response, False
 
-    message = response.json()["response"]
-    # An empty status indicates success.
-    if message["status"] and message["status"]["code"] not in ("OK", "ALREADY_EXISTS"):
-        logging.error("REST upload failed with status: %s", message["status"])
-        return message["status"], False
-
-    return message, True
+    message, status = _parse_response(response.json())
+    if status and cache is not None:
+        cache.invalidate_corpus(customer_id, corpus_id)
+    return message, status
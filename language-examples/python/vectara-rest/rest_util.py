@@ -1,12 +1,29 @@
 """Utility functions for interacting with Vectara over REST."""
 
-from authlib.integrations import requests_client
+import common_paths  # pylint: disable=unused-import
+import vectara_auth
 
+# Token caching is shared with the gRPC and feature examples, see vectara_auth.
+REFRESH_MARGIN_SECS = vectara_auth.REFRESH_MARGIN_SECS
+TokenProvider = vectara_auth.TokenProvider
+Token = vectara_auth.Token
+authorization = vectara_auth.authorization
+authorization_async = vectara_auth.authorization_async
+get_token_provider = vectara_auth.get_token_provider
+get_jwt_token = vectara_auth.get_jwt_token
 
-def get_jwt_token(auth_url: str, app_client_id: str, app_client_secret: str):
-    """Connects to the server and returns a JWT token."""
-    token_endpoint = f"{auth_url}"
-    session = requests_client.OAuth2Session(
-        app_client_id, app_client_secret, scope="")
-    token = session.fetch_token(token_endpoint, grant_type="client_credentials")
-    return token["access_token"]
+
+def get_url(address: str, path: str) -> str:
+    """Returns the URL of an API path on a server.
+
+    Args:
+        address: Address of the server. e.g., api.vectara.io. HTTPS is used unless the
+            address starts with a scheme, e.g., http://localhost:8080 for a local server.
+        path: Path of the API. e.g., /v1/query
+
+    Returns:
+        The full URL.
+    """
+    if address.startswith(("http://", "https://")):
+        return f"{address.rstrip('/')}{path}"
+    return f"https://{address}{path}"